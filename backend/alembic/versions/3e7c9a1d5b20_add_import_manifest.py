@@ -0,0 +1,34 @@
+"""add import manifest
+
+Revision ID: 3e7c9a1d5b20
+Revises: 8d3b6f2e4a17
+Create Date: 2026-10-17 16:21:05.734912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3e7c9a1d5b20'
+down_revision: Union[str, None] = '8d3b6f2e4a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('import_manifest',
+    sa.Column('source', sa.String(length=64), nullable=False),
+    sa.Column('file_hash', sa.String(length=64), nullable=False),
+    sa.Column('record_hashes', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('imported_at', sa.DateTime(timezone=True), server_default=sa.text("timezone('utc', now())"), nullable=False),
+    sa.PrimaryKeyConstraint('source')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('import_manifest')
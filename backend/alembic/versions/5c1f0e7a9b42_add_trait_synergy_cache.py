@@ -0,0 +1,40 @@
+"""add trait synergy cache
+
+Revision ID: 5c1f0e7a9b42
+Revises: 12e80416704e
+Create Date: 2026-10-17 09:12:44.318215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1f0e7a9b42'
+down_revision: Union[str, None] = '12e80416704e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('trait_synergy_cache',
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('monster_id', sa.Integer(), nullable=False),
+    sa.Column('trait_id', sa.Integer(), nullable=False),
+    sa.Column('move_ids', sa.String(length=64), nullable=False),
+    sa.Column('preferred_attack_style', sa.String(length=16), nullable=False),
+    sa.Column('template_hash', sa.String(length=16), nullable=False),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text("timezone('utc', now())"), nullable=False),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
+    op.create_index('ix_trait_synergy_cache_monster_id', 'trait_synergy_cache', ['monster_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_trait_synergy_cache_monster_id', table_name='trait_synergy_cache')
+    op.drop_table('trait_synergy_cache')
@@ -0,0 +1,30 @@
+"""add team list indexes
+
+Revision ID: 8d3b6f2e4a17
+Revises: 5c1f0e7a9b42
+Create Date: 2026-10-17 14:03:27.506113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3b6f2e4a17'
+down_revision: Union[str, None] = '5c1f0e7a9b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_teams_updated_at_id', 'teams', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_user_monsters_team_id', 'user_monsters', ['team_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_monsters_team_id', table_name='user_monsters')
+    op.drop_index('ix_teams_updated_at_id', table_name='teams')
@@ -0,0 +1,462 @@
+from fastapi import HTTPException
+from typing import List
+from decimal import Decimal, ROUND_HALF_UP
+from backend import models, schemas
+from backend.trait_synergy import TraitSynergyRequest
+from backend.timing import span
+from collections import Counter
+import re
+
+# === TOP-LEVEL HELPER FUNCTIONS ===
+# Compute effective stats with base, talent, and personality multipliers
+def round_half_up(n):
+    return int(Decimal(n).to_integral_value(rounding=ROUND_HALF_UP))
+
+def compute_effective_stats(monster, personality, talent):
+    # HP formula: hp = [1.7 × (base_stats + hp_talent × 6) + 70 − 2.55 × hp_talent] × (1 + hp_personality_modifier) + 100
+    base_hp = monster.base_hp
+    hp_talent = talent.hp_boost
+    hp = (1.7 * (base_hp + hp_talent * 6) + 70 - 2.55 * hp_talent)
+    hp = hp * (1 + personality.hp_mod_pct)
+    hp = int(round_half_up(hp + 100))  # int() for safety
+
+    # other stats = round_half_up(1.1 × (base_stats + talent × 6) + 10) × (1 + personality_modifier) + 50
+    def other_stat(attr, personality_attr, talent_attr):
+        base = getattr(monster, attr)
+        pers = getattr(personality, personality_attr)
+        tal = getattr(talent, talent_attr)
+        val = 1.1 * (base + tal * 6) + 10
+        val = round_half_up(val) * (1 + pers)
+        val = int(round_half_up(val + 50))
+        return val
+
+    return schemas.EffectiveStats(
+        hp=hp,
+        phy_atk=other_stat("base_phy_atk", "phy_atk_mod_pct", "phy_atk_boost"),
+        mag_atk=other_stat("base_mag_atk", "mag_atk_mod_pct", "mag_atk_boost"),
+        phy_def=other_stat("base_phy_def", "phy_def_mod_pct", "phy_def_boost"),
+        mag_def=other_stat("base_mag_def", "mag_def_mod_pct", "mag_def_boost"),
+        spd=other_stat("base_spd", "spd_mod_pct", "spd_boost"),
+    )
+    
+# Compute energy profile for moves, including average cost, zero-cost moves, and energy restore moves
+def compute_energy_profile(moves):
+    # moves: list of 4 move SQLAlchemy objects, each with .energy_cost
+    costs = [getattr(m, "energy_cost", None) for m in moves if m is not None]
+    costs = [c for c in costs if c is not None]
+
+    avg_cost = sum(costs) / len(costs) if costs else 0.0
+    zero_cost_moves = [m.id for m in moves if m and getattr(m, "energy_cost", None) == 0]
+    has_zero_cost = len(zero_cost_moves) > 0
+
+    # Energy restore pattern
+    energy_patterns = [
+        r"gain[s]? \w+ energy",
+        r"restore[s]? \w+ energy",
+        r"steal[s]? \w+ energy",
+        r"gain[s]? energy",
+        r"restore[s]? energy"
+    ]
+    combined_pattern = re.compile("|".join(energy_patterns), flags=re.IGNORECASE)
+
+    energy_restore_moves = [
+        m.id for m in moves
+        if m and hasattr(m, "description") and m.description and combined_pattern.search(m.description)
+    ]
+    has_energy_restore = len(energy_restore_moves) > 0
+
+    return schemas.EnergyProfile(
+        avg_energy_cost=round(avg_cost, 2),
+        has_zero_cost_move=has_zero_cost,
+        has_energy_restore_move=has_energy_restore,
+        zero_cost_moves=zero_cost_moves,
+        energy_restore_moves=energy_restore_moves
+    )
+
+# Compute counter coverage for moves with attack/defense/status counters
+def compute_counter_coverage(moves):
+    # moves: list of 4 move SQLAlchemy objects, each with .move_category and .has_counter
+    has_attack_counter_status = False
+    has_defense_counter_attack = False
+    has_status_counter_defense = False
+    counter_move_ids = []
+
+    for m in moves:
+        if not m or not getattr(m, "has_counter", False):
+            continue
+        counter_move_ids.append(m.id)
+        cat = getattr(m, "move_category", None)
+        if cat in [models.MoveCategory.PHY_ATTACK, models.MoveCategory.MAG_ATTACK]:
+            has_attack_counter_status = True
+        elif cat == models.MoveCategory.DEFENSE:
+            has_defense_counter_attack = True
+        elif cat == models.MoveCategory.STATUS:
+            has_status_counter_defense = True
+        
+    return schemas.CounterCoverage(
+        has_attack_counter_status=has_attack_counter_status,
+        has_defense_counter_attack=has_defense_counter_attack,
+        has_status_counter_defense=has_status_counter_defense,
+        total_counter_moves=len(counter_move_ids),
+        counter_move_ids=counter_move_ids
+    )
+    
+# Count and record defense/status moves
+def compute_defense_status_move(moves):
+    defense_status_move_ids = []
+    for m in moves:
+        if m.move_category in [models.MoveCategory.DEFENSE, models.MoveCategory.STATUS]:
+            defense_status_move_ids.append(m.id)
+    return schemas.DefenseStatusMove(
+        defense_status_move_count=len(defense_status_move_ids),
+        defense_status_move=defense_status_move_ids,
+    )
+    
+# Compute team-level analysis
+def compute_type_coverage(user_monsters, move_db_map, monster_db_map, type_chart):
+    # Offense from every selected move type, defense from each monster's (main, sub) typing
+    move_type_ids = set()
+    defender_types = []
+    for um in user_monsters:
+        for move_id in [um.move1_id, um.move2_id, um.move3_id, um.move4_id]:
+            move_type_ids.add(move_db_map[move_id].move_type_id)
+        base_monster = monster_db_map[um.monster_id]
+        defender_types.append((base_monster.main_type_id, base_monster.sub_type_id))
+
+    return type_chart.team_coverage(defender_types, move_type_ids)
+    
+def compute_magic_item_eval(magic_item, user_monster_outs, type_db_map):
+    valid_targets = []
+
+    # Dynamic type IDs by name
+    TYPE_NAME_TO_ID = {t.name.lower(): t.id for t in type_db_map.values()}
+    GRASS_TYPE_ID = TYPE_NAME_TO_ID.get("grass")
+    FIRE_TYPE_ID = TYPE_NAME_TO_ID.get("fire")
+    WATER_TYPE_ID = TYPE_NAME_TO_ID.get("water")
+    LEADER_TYPE_ID = TYPE_NAME_TO_ID.get("leader")
+
+    effect_code = getattr(magic_item, "effect_code", None)
+
+    for user_monster in user_monster_outs:
+        m = user_monster.monster  # MonsterLiteOut
+        legacy_type_id = getattr(user_monster.legacy_type, "id", None)
+        main_type_id = getattr(m.main_type, "id", None)
+        sub_type_id = getattr(m.sub_type, "id", None)
+
+        # Enhancement Spell: any monster
+        if effect_code == models.MagicEffectCode.ENHANCE_SPELL:
+            valid_targets.append(user_monster.id)
+
+        # Sun Healing: grass main/sub/legacy
+        elif effect_code == models.MagicEffectCode.SUN_HEALING:
+            if ((main_type_id == GRASS_TYPE_ID) or
+                (sub_type_id == GRASS_TYPE_ID) or
+                (legacy_type_id == GRASS_TYPE_ID)):
+                valid_targets.append(user_monster.id)
+
+        # Flare Burst: fire main/sub/legacy
+        elif effect_code == models.MagicEffectCode.FLARE_BURST:
+            if ((main_type_id == FIRE_TYPE_ID) or
+                (sub_type_id == FIRE_TYPE_ID) or
+                (legacy_type_id == FIRE_TYPE_ID)):
+                valid_targets.append(user_monster.id)
+
+        # Flow Spell: water main/sub/legacy
+        elif effect_code == models.MagicEffectCode.FLOW_SPELL:
+            if ((main_type_id == WATER_TYPE_ID) or
+                (sub_type_id == WATER_TYPE_ID) or
+                (legacy_type_id == WATER_TYPE_ID)):
+                valid_targets.append(user_monster.id)
+
+        # Evolution Power: only if leader_potential and legacy type is Leader
+        elif effect_code == models.MagicEffectCode.EVOLUTION_POWER:
+            if getattr(m, "leader_potential", False) and (legacy_type_id == LEADER_TYPE_ID):
+                valid_targets.append(user_monster.id)
+
+    # More logic can be added here for other analysis aspects
+    return {
+        "chosen_item": magic_item,
+        "valid_targets": valid_targets,
+        "best_target_monster_id": None,
+        "reasoning": None,
+    }
+
+def generate_recommendations(per_monster_analysis, type_coverage, magic_item_eval, move_db_map, type_db_map):
+    recs: List[schemas.RecItem] = []
+
+    def add(category, severity, message, *, type_ids=None, monster_ids=None, move_ids=None):
+        recs.append(schemas.RecItem(
+            category=category,
+            severity=severity,
+            message=message,
+            type_ids=type_ids or [],
+            monster_ids=monster_ids or [],
+            move_ids=move_ids or []
+        ))
+
+    # 1) Type coverage – offense
+    if type_coverage["weak_against_types"]:
+        names = [type_db_map[t].name for t in type_coverage["weak_against_types"]]
+        add("coverage", "warn",
+            f"Your team cannot hit these types super-effectively: {', '.join(names)}. Consider adding moves for coverage.",
+            type_ids=type_coverage["weak_against_types"])
+
+    # 2) Team defensive weaknesses
+    if type_coverage["team_weak_to"]:
+        names = [type_db_map[t].name for t in type_coverage["team_weak_to"]]
+        add("weakness", "danger",
+            f"Your team is especially vulnerable to: {', '.join(names)}. Consider defensive options or resistances.",
+            type_ids=type_coverage["team_weak_to"])
+
+    # 3) Magic item usage
+    vt = magic_item_eval.valid_targets
+    if not vt:
+        add("magic_item", "warn", "Your selected magic item cannot be used by any monster in your current team!")
+    elif len(vt) == 1:
+        add("magic_item", "info", "Only one monster can use the selected magic item.", monster_ids=vt)
+    else:
+        add("magic_item", "info", "Multiple monsters can use the selected magic item.", monster_ids=vt)
+
+    # 4) Redundant typing
+    from collections import Counter
+    all_types = []
+    for analysis in per_monster_analysis:
+        m = analysis.user_monster.monster
+        all_types.append(m.main_type.id)
+        if m.sub_type is not None:
+            all_types.append(m.sub_type.id)
+    counts = Counter(all_types)
+    common_type_ids = [tid for tid, cnt in counts.items() if cnt >= 4]
+    if common_type_ids:
+        names = [type_db_map[t].name for t in common_type_ids]
+        add("weakness", "warn",
+            f"Many monsters share these types: {', '.join(names)}. This increases vulnerability to specific counters.",
+            type_ids=common_type_ids)
+
+    # 5) Per-monster checks
+    for analysis in per_monster_analysis:
+        mid = analysis.user_monster.id
+        mname = analysis.user_monster.monster.name
+
+        if analysis.energy_profile.avg_energy_cost > 4:
+            add("energy", "warn",
+                f"{mname}'s moves have high average energy cost. Consider lower-cost or energy-restoring moves.",
+                monster_ids=[mid])
+
+        if analysis.counter_coverage.total_counter_moves == 0:
+            add("counters", "warn",
+                f"{mname} has no counter-effect moves selected.",
+                monster_ids=[mid])
+
+        if analysis.defense_status_move.defense_status_move_count < 2:
+            add("defense_status", "info",
+                f"{mname} has fewer than 2 Defense/Status moves. Consider adding more for survivability.",
+                monster_ids=[mid])
+
+        for synergy in analysis.trait_synergies:
+            if synergy.synergy_moves:
+                move_names = [move_db_map[x].name for x in synergy.synergy_moves]
+                add("trait_synergy", "info",
+                    f"{mname}'s trait works well with: {', '.join(move_names)}.",
+                    monster_ids=[mid], move_ids=synergy.synergy_moves)
+
+    # 6) Role diversity
+    styles = [getattr(a.user_monster.monster, "preferred_attack_style", None) for a in per_monster_analysis]
+    if len(set(styles)) == 1 and styles[0]:
+        add("general", "warn", f"All monsters are {styles[0]}-style attackers. This may make the team predictable.")
+
+    # 7) Stat and role highlights
+    stat_roles = {
+        "hp": "frontline or defensive pivot",
+        "phy_atk": "main physical attacker",
+        "mag_atk": "main magic attacker",
+        "overall_def": "physical or special tank",
+        "spd": "lead, scout, or revenge killer",
+    }
+
+    def best_of(stat, label, role_key=None):
+        vals = [(a.user_monster.monster.name, getattr(a.effective_stats, stat), a.user_monster.id)
+                for a in per_monster_analysis]
+        if not vals:
+            return
+        name, value, uid = max(vals, key=lambda x: x[1])
+        role_txt = stat_roles.get(role_key or stat)
+        role_suffix = f" Consider using it as your {role_txt}." if role_txt else ""
+        add(
+            "stat_highlight",
+            "info",
+            f"{name} has the highest {label} ({value}).{role_suffix}",
+            monster_ids=[uid],
+        )
+
+    best_of("hp", "HP")
+    best_of("phy_atk", "Physical Attack")
+    best_of("mag_atk", "Magic Attack")
+    # overall defense = phy_def + mag_def
+    vals_def = [
+        (a.user_monster.monster.name,
+         a.effective_stats.phy_def + a.effective_stats.mag_def,
+         a.user_monster.id)
+        for a in per_monster_analysis
+    ]
+    if vals_def:
+        name, value, uid = max(vals_def, key=lambda x: x[1])
+        role_suffix = f" Consider using it as your {stat_roles['overall_def']}."
+        add(
+            "stat_highlight",
+            "info",
+            f"{name} has the highest Total Defense ({value}).{role_suffix}",
+            monster_ids=[uid],
+        )
+    best_of("spd", "Speed")
+
+    return recs
+
+# === ANALYSIS PIPELINE ===
+# Split into a deterministic phase (stats, energy, counters, coverage, magic item)
+# and an LLM phase, so callers can either await everything or stream sections.
+
+class TeamAnalysisDraft:
+    """Deterministic part of a team analysis; trait synergies are added by finalize_team_analysis."""
+
+    def __init__(self, team_out, per_monster, type_coverage, magic_item_eval, synergy_requests):
+        self.team_out = team_out
+        self.per_monster = per_monster
+        self.type_coverage = type_coverage
+        self.magic_item_eval = magic_item_eval
+        self.synergy_requests = synergy_requests
+
+def to_monster_lite_out(monster, type_db_map):
+    return schemas.MonsterLiteOut(
+        id=monster.id,
+        name=monster.name,
+        form=monster.form,
+        main_type=schemas.TypeOut.model_validate(type_db_map[monster.main_type_id]),
+        sub_type=schemas.TypeOut.model_validate(type_db_map[monster.sub_type_id]) if monster.sub_type_id else None,
+        leader_potential=getattr(monster, "leader_potential", False),
+        is_leader_form=monster.is_leader_form,
+        preferred_attack_style = getattr(monster, "preferred_attack_style", "Both"),
+        localized=monster.localized
+    )
+
+TALENT_FIELDS = ("hp_boost", "phy_atk_boost", "mag_atk_boost", "phy_def_boost", "mag_def_boost", "spd_boost")
+
+def prepare_team_analysis(team_data, catalog) -> TeamAnalysisDraft:
+    # team_data is an inline TeamCreate or a saved models.Team with user_monsters and
+    # their talents loaded; only plain attributes are read, so rows need no conversion.
+    # Static data comes from the in-memory catalog (no DB I/O)
+    if not team_data.magic_item_id:
+        raise HTTPException(status_code=400, detail="Magic item is required to analyze a team.")
+    monster_db_map = catalog.monsters
+    move_db_map = catalog.moves
+    trait_db_map = catalog.traits
+    type_db_map = catalog.types
+    personality_db_map = catalog.personalities
+    magic_item = catalog.magic_items.get(team_data.magic_item_id)
+    if not magic_item:
+        raise HTTPException(status_code=404, detail="Magic item not found")
+
+    # Build UserMonsterOuts and compute per-monster analysis
+    user_monster_outs = []
+    per_monster_analysis = []
+    synergy_requests = []
+    with span("per_monster"):
+        for i, um in enumerate(team_data.user_monsters):
+            base_monster = monster_db_map[um.monster_id]
+            personality = personality_db_map[um.personality_id]
+            legacy_type = type_db_map[um.legacy_type_id]
+            trait = trait_db_map[base_monster.trait_id]
+            move1 = move_db_map[um.move1_id]
+            move2 = move_db_map[um.move2_id]
+            move3 = move_db_map[um.move3_id]
+            move4 = move_db_map[um.move4_id]
+            selected_moves = [move1, move2, move3, move4]
+            talent = um.talent
+            preferred_attack_style = getattr(base_monster, "preferred_attack_style", "Both")
+            synergy_requests.append(
+                TraitSynergyRequest(base_monster, trait, selected_moves, preferred_attack_style,
+                                    catalog.glossary.render(trait.id, [m.id for m in selected_moves]))
+            )
+
+            # Call the top-level helper functions
+            effective_stats = compute_effective_stats(base_monster, personality, talent)
+            energy_profile = compute_energy_profile(selected_moves)
+            counter_coverage = compute_counter_coverage(selected_moves)
+            defense_status_move = compute_defense_status_move(selected_moves)
+
+            user_monster_out = schemas.UserMonsterOut(
+                id=i,
+                monster=to_monster_lite_out(base_monster, type_db_map),
+                personality=schemas.PersonalityOut.model_validate(personality),
+                legacy_type=schemas.TypeOut.model_validate(legacy_type),
+                move1=schemas.MoveOut.model_validate(move1),
+                move2=schemas.MoveOut.model_validate(move2),
+                move3=schemas.MoveOut.model_validate(move3),
+                move4=schemas.MoveOut.model_validate(move4),
+                talent=schemas.TalentOut(id=i, **{f: getattr(talent, f) for f in TALENT_FIELDS}),
+            )
+            user_monster_outs.append(user_monster_out)
+
+            # Trait synergies are attached once the LLM phase finishes
+            per_monster_analysis.append(schemas.MonsterAnalysisOut(
+                user_monster=user_monster_out,
+                effective_stats=effective_stats,
+                energy_profile=energy_profile,
+                counter_coverage=counter_coverage,
+                defense_status_move=defense_status_move,
+            ))
+
+    with span("type_coverage"):
+        type_coverage = compute_type_coverage(team_data.user_monsters, move_db_map, monster_db_map, catalog.type_chart)
+    with span("magic_item"):
+        magic_item_eval_dict = compute_magic_item_eval(magic_item, user_monster_outs, type_db_map)
+    magic_item_out = schemas.MagicItemOut.model_validate(magic_item)
+    magic_item_eval = schemas.MagicItemEvaluation(
+        chosen_item=magic_item_out,
+        valid_targets=magic_item_eval_dict["valid_targets"],
+        best_target_monster_id=magic_item_eval_dict.get("best_target_monster_id"),
+        reasoning=magic_item_eval_dict.get("reasoning"),
+    )
+    team_out = schemas.TeamOut(
+        id=0,
+        name=team_data.name,
+        user_monsters=user_monster_outs,
+        magic_item=magic_item_out,
+    )
+    return TeamAnalysisDraft(team_out, per_monster_analysis, type_coverage, magic_item_eval, synergy_requests)
+
+def build_trait_synergy_finding(request: TraitSynergyRequest, llm_result) -> schemas.TraitSynergyFinding:
+    # Map move names to ids for schema output
+    move_name_to_id = {m.name: m.id for m in request.selected_moves}
+    synergy_moves = [move_name_to_id[name] for name in llm_result.get("synergy_moves", []) if name in move_name_to_id]
+    status = llm_result.get("status")
+    return schemas.TraitSynergyFinding(
+        monster_id=request.monster.id,
+        trait=schemas.TraitOut.model_validate(request.trait),
+        synergy_moves=synergy_moves,
+        recommendation=llm_result.get("recommendation", []),
+        status=status if status in ("error", "timeout") else "ok",
+    )
+
+def finalize_team_analysis(draft: TeamAnalysisDraft, llm_results, catalog) -> schemas.TeamAnalysisOut:
+    for analysis, request, llm_result in zip(draft.per_monster, draft.synergy_requests, llm_results):
+        analysis.trait_synergies = [build_trait_synergy_finding(request, llm_result)]
+
+    with span("recommendations"):
+        recs_struct = generate_recommendations(
+            draft.per_monster,
+            draft.type_coverage,
+            draft.magic_item_eval,
+            catalog.moves,
+            catalog.types
+        )
+    return schemas.TeamAnalysisOut(
+        team=draft.team_out,
+        per_monster=draft.per_monster,
+        type_coverage=draft.type_coverage,
+        magic_item_eval=draft.magic_item_eval,
+        recommendations=[r.message for r in recs_struct],
+        recommendations_structured=recs_struct,
+        incomplete_synergies=[i for i, analysis in enumerate(draft.per_monster)
+                              if any(f.status != "ok" for f in analysis.trait_synergies)],
+    )
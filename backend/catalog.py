@@ -0,0 +1,398 @@
+import enum
+import hashlib
+import json
+from dataclasses import dataclass, fields, is_dataclass
+from types import MappingProxyType
+from typing import Optional, Tuple, Mapping, FrozenSet, Dict, Any
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from backend import models, game_data
+from backend.glossary import GlossaryIndex
+from backend.name_index import NameIndex
+from backend.type_chart import TypeChart
+from backend.stat_engine import StatTables
+
+# === Read-only catalog of static game data ===
+# Everything here only changes when the import scripts run, so it is loaded once at
+# startup and shared by every request instead of being re-queried per call.
+# Entries expose the same attribute names as the ORM models, so the schemas
+# (from_attributes=True) and the analysis helpers can consume them unchanged.
+
+@dataclass(frozen=True, slots=True)
+class TypeEntry:
+    id: int
+    name: str
+    localized: Dict
+    # Type relations as id sets; vulnerable_to/resistant_to mirror the ORM backrefs
+    effective_against_ids: FrozenSet[int]
+    weak_against_ids: FrozenSet[int]
+    vulnerable_to_ids: FrozenSet[int]
+    resistant_to_ids: FrozenSet[int]
+
+@dataclass(frozen=True, slots=True)
+class TraitEntry:
+    id: int
+    name: str
+    description: str
+    localized: Dict
+
+@dataclass(frozen=True, slots=True)
+class PersonalityEntry:
+    id: int
+    name: str
+    hp_mod_pct: float
+    phy_atk_mod_pct: float
+    mag_atk_mod_pct: float
+    phy_def_mod_pct: float
+    mag_def_mod_pct: float
+    spd_mod_pct: float
+    localized: Dict
+
+@dataclass(frozen=True, slots=True)
+class MoveEntry:
+    id: int
+    name: str
+    move_type_id: Optional[int]
+    move_type: Optional[TypeEntry]
+    move_category: models.MoveCategory
+    energy_cost: int
+    power: Optional[int]
+    description: str
+    has_counter: bool
+    is_move_stone: bool
+    localized: Dict
+
+@dataclass(frozen=True, slots=True)
+class LegacyMoveEntry:
+    monster_id: int
+    type_id: int
+    move_id: int
+
+@dataclass(frozen=True, slots=True)
+class SpeciesEntry:
+    id: int
+    name: str
+    localized: Dict
+
+@dataclass(frozen=True, slots=True)
+class MonsterEntry:
+    id: int
+    name: str
+    form: str
+    evolves_from_id: Optional[int]
+    species_id: int
+    species: SpeciesEntry
+    main_type_id: int
+    main_type: TypeEntry
+    sub_type_id: Optional[int]
+    sub_type: Optional[TypeEntry]
+    default_legacy_type_id: int
+    trait_id: int
+    trait: TraitEntry
+    leader_potential: bool
+    is_leader_form: bool
+    base_hp: int
+    base_phy_atk: int
+    base_mag_atk: int
+    base_phy_def: int
+    base_mag_def: int
+    base_spd: int
+    preferred_attack_style: models.AttackStyle
+    localized: Dict
+    move_pool: Tuple[MoveEntry, ...]
+    legacy_moves: Tuple[LegacyMoveEntry, ...]
+
+@dataclass(frozen=True, slots=True)
+class MagicItemEntry:
+    id: int
+    name: str
+    description: str
+    effect_code: models.MagicEffectCode
+    applies_to_type_id: Optional[int]
+    effect_parameters: Optional[Dict]
+    localized: Dict
+
+@dataclass(frozen=True, slots=True)
+class GameTermEntry:
+    id: int
+    key: str
+    description: str
+    localized: Dict
+
+
+def _index(entries) -> Mapping[int, Any]:
+    # id -> entry, ordered by id so list endpoints stay deterministic
+    return MappingProxyType({e.id: e for e in sorted(entries, key=lambda e: e.id)})
+
+
+class GameCatalog:
+    """Immutable, indexed snapshot of all static game data."""
+
+    def __init__(self, types, traits, personalities, species, moves, monsters, magic_items, game_terms, legacy_moves):
+        self.types: Mapping[int, TypeEntry] = _index(types)
+        self.traits: Mapping[int, TraitEntry] = _index(traits)
+        self.personalities: Mapping[int, PersonalityEntry] = _index(personalities)
+        self.species: Mapping[int, SpeciesEntry] = _index(species)
+        self.moves: Mapping[int, MoveEntry] = _index(moves)
+        self.monsters: Mapping[int, MonsterEntry] = _index(monsters)
+        self.magic_items: Mapping[int, MagicItemEntry] = _index(magic_items)
+        self.game_terms: Tuple[GameTermEntry, ...] = tuple(sorted(game_terms, key=lambda g: g.id))
+        # (monster_id, type_id) -> legacy move
+        self.legacy_moves: Mapping[Tuple[int, int], LegacyMoveEntry] = MappingProxyType(
+            {(lm.monster_id, lm.type_id): lm for lm in legacy_moves}
+        )
+        self.types_by_name: Mapping[str, TypeEntry] = MappingProxyType({t.name: t for t in self.types.values()})
+        # Content hash of everything above; changes exactly when an import changes the data
+        self.version: str = _data_version(self)
+        self.type_chart = TypeChart(self.types.values())
+        # Name search over English name/form and zh name/form
+        self.monster_names = NameIndex({m.id: _monster_search_fields(m) for m in self.monsters.values()})
+        self.move_names = NameIndex({mv.id: _move_search_fields(mv) for mv in self.moves.values()})
+        self.stat_tables = StatTables(self.monsters.values(), self.personalities.values())
+        # Game terms mentioned by each move and trait, with pre-rendered prompt lines
+        self.glossary = GlossaryIndex(self.game_terms, self.moves.values(), self.traits.values())
+
+    @classmethod
+    def load(cls, db: Session) -> "GameCatalog":
+        """Read every catalog table once (no lazy loads) and build the indexed snapshot."""
+        return cls.from_rows(
+            types=db.query(models.Type).all(),
+            effective_against=_pairs(db, models.type_effective_against),
+            weak_against=_pairs(db, models.type_weak_against),
+            traits=db.query(models.Trait).all(),
+            personalities=db.query(models.Personality).all(),
+            species=db.query(models.MonsterSpecies).all(),
+            moves=db.query(models.Move).all(),
+            monsters=db.query(models.Monster).all(),
+            monster_moves=_pairs(db, models.monster_moves),
+            legacy_moves=db.query(models.LegacyMove).all(),
+            magic_items=db.query(models.MagicItem).all(),
+            game_terms=db.query(models.GameTerm).all(),
+        )
+
+    @classmethod
+    def from_json(cls, data_dir: str = game_data.DATA_DIR) -> "GameCatalog":
+        """Build the catalog straight from backend/data/*.json, without a database.
+
+        Ids follow file order, which is what the import scripts assign on a fresh database.
+        """
+        return cls.from_rows(**game_data.catalog_rows(data_dir))
+
+    @classmethod
+    def from_rows(cls, types, effective_against, weak_against, traits, personalities, species, moves,
+                  monsters, monster_moves, legacy_moves, magic_items, game_terms) -> "GameCatalog":
+        """Build the snapshot from row objects with the ORM attribute names and (id, id) pair lists."""
+        type_map = {}
+        for t in types:
+            type_map[t.id] = TypeEntry(
+                id=t.id,
+                name=t.name,
+                localized=t.localized,
+                effective_against_ids=frozenset(target for src, target in effective_against if src == t.id),
+                weak_against_ids=frozenset(target for src, target in weak_against if src == t.id),
+                vulnerable_to_ids=frozenset(src for src, target in effective_against if target == t.id),
+                resistant_to_ids=frozenset(src for src, target in weak_against if target == t.id),
+            )
+
+        traits = {
+            tr.id: TraitEntry(id=tr.id, name=tr.name, description=tr.description, localized=tr.localized)
+            for tr in traits
+        }
+        personalities = [
+            PersonalityEntry(
+                id=p.id,
+                name=p.name,
+                hp_mod_pct=p.hp_mod_pct,
+                phy_atk_mod_pct=p.phy_atk_mod_pct,
+                mag_atk_mod_pct=p.mag_atk_mod_pct,
+                phy_def_mod_pct=p.phy_def_mod_pct,
+                mag_def_mod_pct=p.mag_def_mod_pct,
+                spd_mod_pct=p.spd_mod_pct,
+                localized=p.localized,
+            )
+            for p in personalities
+        ]
+        species = {
+            s.id: SpeciesEntry(id=s.id, name=s.name, localized=s.localized)
+            for s in species
+        }
+        moves = {
+            mv.id: MoveEntry(
+                id=mv.id,
+                name=mv.name,
+                move_type_id=mv.move_type_id,
+                move_type=type_map.get(mv.move_type_id),
+                move_category=mv.move_category,
+                energy_cost=mv.energy_cost,
+                power=mv.power,
+                description=mv.description,
+                has_counter=bool(mv.has_counter),
+                is_move_stone=bool(mv.is_move_stone),
+                localized=mv.localized,
+            )
+            for mv in moves
+        }
+
+        move_pools: Dict[int, list] = {}
+        for monster_id, move_id in monster_moves:
+            move_pools.setdefault(monster_id, []).append(moves[move_id])
+        legacy_moves = [
+            LegacyMoveEntry(monster_id=lm.monster_id, type_id=lm.type_id, move_id=lm.move_id)
+            for lm in legacy_moves
+        ]
+        legacy_by_monster: Dict[int, list] = {}
+        for lm in legacy_moves:
+            legacy_by_monster.setdefault(lm.monster_id, []).append(lm)
+
+        monsters = [
+            MonsterEntry(
+                id=m.id,
+                name=m.name,
+                form=m.form,
+                evolves_from_id=m.evolves_from_id,
+                species_id=m.species_id,
+                species=species[m.species_id],
+                main_type_id=m.main_type_id,
+                main_type=type_map[m.main_type_id],
+                sub_type_id=m.sub_type_id,
+                sub_type=type_map.get(m.sub_type_id),
+                default_legacy_type_id=m.default_legacy_type_id,
+                trait_id=m.trait_id,
+                trait=traits[m.trait_id],
+                leader_potential=m.leader_potential,
+                is_leader_form=m.is_leader_form,
+                base_hp=m.base_hp,
+                base_phy_atk=m.base_phy_atk,
+                base_mag_atk=m.base_mag_atk,
+                base_phy_def=m.base_phy_def,
+                base_mag_def=m.base_mag_def,
+                base_spd=m.base_spd,
+                preferred_attack_style=m.preferred_attack_style,
+                localized=m.localized,
+                move_pool=tuple(sorted(move_pools.get(m.id, []), key=lambda mv: mv.id)),
+                legacy_moves=tuple(sorted(legacy_by_monster.get(m.id, []), key=lambda lm: lm.type_id)),
+            )
+            for m in monsters
+        ]
+        magic_items = [
+            MagicItemEntry(
+                id=mi.id,
+                name=mi.name,
+                description=mi.description,
+                effect_code=mi.effect_code,
+                applies_to_type_id=mi.applies_to_type_id,
+                effect_parameters=mi.effect_parameters,
+                localized=mi.localized,
+            )
+            for mi in magic_items
+        ]
+        game_terms = [
+            GameTermEntry(id=gt.id, key=gt.key, description=gt.description, localized=gt.localized)
+            for gt in game_terms
+        ]
+
+        return cls(
+            types=type_map.values(),
+            traits=traits.values(),
+            personalities=personalities,
+            species=species.values(),
+            moves=moves.values(),
+            monsters=monsters,
+            magic_items=magic_items,
+            game_terms=game_terms,
+            legacy_moves=legacy_moves,
+        )
+
+    def search_monsters(self, name: Optional[str] = None, type_id: Optional[int] = None,
+                        trait_id: Optional[int] = None, is_leader_form: Optional[bool] = None):
+        """Filter monsters the way GET /monsters/ used to in SQL (ILIKE on name/form and zh name/form)."""
+        name_ids = self.monster_names.contains(name) if name else None
+        results = []
+        for m in self.monsters.values():
+            if name_ids is not None and m.id not in name_ids:
+                continue
+            if type_id and type_id not in (m.main_type_id, m.sub_type_id):
+                continue
+            if trait_id and m.trait_id != trait_id:
+                continue
+            if is_leader_form is not None and m.is_leader_form != is_leader_form:
+                continue
+            results.append(m)
+        return results
+
+    def search_moves(self, name: Optional[str] = None, move_type_id: Optional[int] = None,
+                     move_category: Optional[models.MoveCategory] = None,
+                     has_counter: Optional[bool] = None, is_move_stone: Optional[bool] = None):
+        """Filter moves the way GET /moves/ used to in SQL, with the name also matched against the zh name."""
+        name_ids = self.move_names.contains(name) if name else None
+        results = []
+        for mv in self.moves.values():
+            if name_ids is not None and mv.id not in name_ids:
+                continue
+            if move_type_id and mv.move_type_id != move_type_id:
+                continue
+            if move_category and mv.move_category != move_category:
+                continue
+            if has_counter is not None and mv.has_counter != has_counter:
+                continue
+            if is_move_stone is not None and mv.is_move_stone != is_move_stone:
+                continue
+            results.append(mv)
+        return results
+
+    def autocomplete(self, term: str, kinds=("monster", "move"), limit: int = 10):
+        """Best `limit` (kind, entry, NameMatch) name matches across monsters and moves, best first."""
+        matches = []
+        if "monster" in kinds:
+            matches += [("monster", self.monsters[m.entry_id], m) for m in self.monster_names.search(term, limit)]
+        if "move" in kinds:
+            matches += [("move", self.moves[m.entry_id], m) for m in self.move_names.search(term, limit)]
+        matches.sort(key=lambda km: km[2].sort_key)
+        return matches[:limit]
+
+
+def _fingerprint(value, top_level: bool = False):
+    # JSON-able form of an entry; nested entries collapse to their ids (their own rows are hashed separately)
+    if is_dataclass(value):
+        if not top_level and hasattr(value, "id"):
+            return value.id
+        return {f.name: _fingerprint(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, frozenset):
+        return sorted(value)
+    if isinstance(value, (tuple, list)):
+        return [_fingerprint(v) for v in value]
+    return value
+
+def _data_version(catalog: "GameCatalog") -> str:
+    digest = hashlib.sha256()
+    tables = {
+        "types": catalog.types.values(),
+        "traits": catalog.traits.values(),
+        "personalities": catalog.personalities.values(),
+        "species": catalog.species.values(),
+        "moves": catalog.moves.values(),
+        "monsters": catalog.monsters.values(),
+        "magic_items": catalog.magic_items.values(),
+        "game_terms": catalog.game_terms,
+    }
+    for name, entries in tables.items():
+        rows = [_fingerprint(e, top_level=True) for e in entries]
+        digest.update(json.dumps([name, rows], sort_keys=True, ensure_ascii=False).encode())
+    return digest.hexdigest()
+
+def _pairs(db: Session, table):
+    return [tuple(row) for row in db.execute(select(*table.c)).all()]
+
+def _zh_fields(localized, keys):
+    zh = (localized or {}).get("zh") or {}
+    if not isinstance(zh, dict):
+        return []
+    return [v for v in (zh.get(k) for k in keys) if isinstance(v, str)]
+
+def _monster_search_fields(monster: MonsterEntry):
+    return [monster.name, monster.form] + _zh_fields(monster.localized, ("name", "form"))
+
+def _move_search_fields(move: MoveEntry):
+    return [move.name] + _zh_fields(move.localized, ("name",))
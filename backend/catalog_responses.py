@@ -0,0 +1,94 @@
+from typing import Dict, Iterable, Optional, Tuple
+from backend import models, schemas
+from backend.catalog import GameCatalog
+
+# === Pre-rendered catalog list responses ===
+# The catalog only changes with its version, so every list item is validated and
+# serialized through its response schema once, and responses are built by joining
+# the stored bytes. The unfiltered lists and every single-filter variant of
+# GET /moves/ and GET /monsters/ are joined up front as well; the rest (name
+# searches, combined filters, pages) are joined per request from the item bytes.
+
+def _render(schema, entry) -> bytes:
+    return schema.model_validate(entry).model_dump_json().encode()
+
+def _join(parts: Iterable[bytes]) -> bytes:
+    return b"[" + b",".join(parts) + b"]"
+
+def _render_list(schema, entries) -> bytes:
+    return _join(_render(schema, e) for e in entries)
+
+# Filter keys: (move_type_id, move_category, has_counter, is_move_stone) and (type_id,)
+MoveFilter = Tuple[Optional[int], Optional[models.MoveCategory], Optional[bool], Optional[bool]]
+
+class RenderedCatalog:
+    """JSON bodies for the catalog list endpoints of one catalog version."""
+
+    def __init__(self, catalog: GameCatalog):
+        self.catalog = catalog
+        self.version = catalog.version
+        self.types = _render_list(schemas.TypeOut, catalog.types.values())
+        self.traits = _render_list(schemas.TraitOut, catalog.traits.values())
+        self.personalities = _render_list(schemas.PersonalityOut, catalog.personalities.values())
+        self.magic_items = _render_list(schemas.MagicItemOut, catalog.magic_items.values())
+        self.game_terms = _render_list(schemas.GameTermOut, catalog.game_terms)
+        self.species = _render_list(schemas.MonsterSpeciesOut, catalog.species.values())
+
+        self._move_items: Dict[int, bytes] = {
+            mv.id: _render(schemas.MoveLiteOut, mv) for mv in catalog.moves.values()
+        }
+        self._monster_items: Dict[int, bytes] = {
+            m.id: _render(schemas.MonsterLiteOut, m) for m in catalog.monsters.values()
+        }
+
+        # filter key -> (matching entry count, joined body)
+        move_filters = [(None, None, None, None)]
+        move_filters += [(type_id, None, None, None) for type_id in catalog.types]
+        move_filters += [(None, category, None, None) for category in models.MoveCategory]
+        move_filters += [(None, None, flag, None) for flag in (True, False)]
+        move_filters += [(None, None, None, flag) for flag in (True, False)]
+        self._move_variants: Dict[MoveFilter, Tuple[int, bytes]] = {}
+        for key in move_filters:
+            ids = [mv.id for mv in self._search_moves(None, key)]
+            self._move_variants[key] = (len(ids), _join(self._move_items[i] for i in ids))
+
+        self._monster_variants: Dict[Tuple[Optional[int]], Tuple[int, bytes]] = {}
+        for type_id in [None, *catalog.types]:
+            ids = [m.id for m in catalog.search_monsters(type_id=type_id)]
+            self._monster_variants[(type_id,)] = (len(ids), _join(self._monster_items[i] for i in ids))
+
+    def _search_moves(self, name: Optional[str], key: MoveFilter):
+        move_type_id, move_category, has_counter, is_move_stone = key
+        return self.catalog.search_moves(
+            name=name,
+            move_type_id=move_type_id,
+            move_category=move_category,
+            has_counter=has_counter,
+            is_move_stone=is_move_stone,
+        )
+
+    def moves(self, name: Optional[str] = None, move_type_id: Optional[int] = None,
+              move_category: Optional[models.MoveCategory] = None, has_counter: Optional[bool] = None,
+              is_move_stone: Optional[bool] = None, limit: Optional[int] = None, offset: int = 0) -> bytes:
+        """Body of GET /moves/ for these filters (same matching and order as GameCatalog.search_moves)."""
+        key = (move_type_id, move_category, has_counter, is_move_stone)
+        variant = self._move_variants.get(key) if name is None and offset == 0 else None
+        if variant is not None and (limit is None or limit >= variant[0]):
+            return variant[1]
+        moves = self._search_moves(name, key)
+        end = None if limit is None else offset + limit
+        return _join(self._move_items[mv.id] for mv in moves[offset:end])
+
+    def monsters(self, name: Optional[str] = None, type_id: Optional[int] = None,
+                 trait_id: Optional[int] = None, is_leader_form: Optional[bool] = None,
+                 limit: Optional[int] = None, offset: int = 0) -> bytes:
+        """Body of GET /monsters/ for these filters (same matching and order as GameCatalog.search_monsters)."""
+        plain = name is None and trait_id is None and is_leader_form is None and offset == 0
+        variant = self._monster_variants.get((type_id,)) if plain else None
+        if variant is not None and (limit is None or limit >= variant[0]):
+            return variant[1]
+        monsters = self.catalog.search_monsters(
+            name=name, type_id=type_id, trait_id=trait_id, is_leader_form=is_leader_form,
+        )
+        end = None if limit is None else offset + limit
+        return _join(self._monster_items[m.id] for m in monsters[offset:end])
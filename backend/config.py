@@ -4,4 +4,31 @@ from dotenv import load_dotenv
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
\ No newline at end of file
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+
+# Trait-synergy LLM result cache (in-process tier; the DB tier has no expiry)
+TRAIT_SYNERGY_CACHE_SIZE = int(os.getenv("TRAIT_SYNERGY_CACHE_SIZE", "2048"))
+TRAIT_SYNERGY_CACHE_TTL_SECONDS = int(os.getenv("TRAIT_SYNERGY_CACHE_TTL_SECONDS", "3600"))
+
+# Max trait-synergy LLM calls in flight for one batch analysis
+LLM_BATCH_CONCURRENCY = int(os.getenv("LLM_BATCH_CONCURRENCY", "8"))
+# Latency budget for one whole batch analysis, in place of LLM_DEADLINE_MS (0 = no limit)
+LLM_BATCH_DEADLINE_MS = int(os.getenv("LLM_BATCH_DEADLINE_MS", "0"))
+
+# Browser cache lifetime for catalog GET endpoints (revalidated by ETag afterwards)
+CATALOG_CACHE_MAX_AGE = int(os.getenv("CATALOG_CACHE_MAX_AGE", "86400"))
+
+# Database engines (backend.database.create_db_engine); 0 disables the statement timeout
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "-1"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+DB_APPLICATION_NAME = os.getenv("DB_APPLICATION_NAME", "roco-team-builder")
+
+# Max LLM calls in flight across all requests (the rest queue)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+
+# Latency budget for one analysis request; LLM replies that miss it are dropped (0 = no limit)
+LLM_DEADLINE_MS = int(os.getenv("LLM_DEADLINE_MS", "10000"))
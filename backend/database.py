@@ -0,0 +1,90 @@
+from typing import Optional
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from backend import db_metrics
+from backend.config import (
+    DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT_SECONDS, DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE_SECONDS, DB_STATEMENT_TIMEOUT_MS, DB_APPLICATION_NAME,
+)
+
+# === Engine factory ===
+# Every engine (API, scripts) is built here so pool sizing, timeouts and the
+# application_name shown in pg_stat_activity come from config, and every engine is
+# instrumented for GET /metrics/db. Keyword overrides win over config.
+
+def _engine_options(name: str, async_driver: bool, pool_size: int, max_overflow: int, pool_timeout: float,
+                    pool_pre_ping: bool, pool_recycle: int, statement_timeout_ms: int,
+                    search_path: Optional[str]) -> dict:
+    metrics = db_metrics.EngineMetrics(name)
+    application_name = f"{DB_APPLICATION_NAME}:{name}"
+    settings = {}
+    if statement_timeout_ms:
+        settings["statement_timeout"] = str(statement_timeout_ms)
+    if search_path:
+        settings["search_path"] = search_path
+    if async_driver:
+        connect_args = {"server_settings": {"application_name": application_name, **settings}}
+    else:
+        connect_args = {"application_name": application_name}
+        if settings:
+            connect_args["options"] = " ".join(f"-c{k}={v}" for k, v in settings.items())
+    return {
+        "poolclass": db_metrics.timed_pool_class(metrics, async_driver),
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_pre_ping": pool_pre_ping,
+        "pool_recycle": pool_recycle,
+        "connect_args": connect_args,
+    }, metrics
+
+def create_db_engine(name: str = "api", url: str = DATABASE_URL, *, pool_size: int = DB_POOL_SIZE,
+                     max_overflow: int = DB_MAX_OVERFLOW, pool_timeout: float = DB_POOL_TIMEOUT_SECONDS,
+                     pool_pre_ping: bool = DB_POOL_PRE_PING, pool_recycle: int = DB_POOL_RECYCLE_SECONDS,
+                     statement_timeout_ms: int = DB_STATEMENT_TIMEOUT_MS,
+                     search_path: Optional[str] = None) -> Engine:
+    options, metrics = _engine_options(name, False, pool_size, max_overflow, pool_timeout, pool_pre_ping,
+                                       pool_recycle, statement_timeout_ms, search_path)
+    engine = create_engine(url, **options)
+    db_metrics.instrument(engine, metrics)
+    return engine
+
+def async_database_url(url: str):
+    # Same database through asyncpg; it spells libpq's sslmode as ssl
+    url = make_url(url).set(drivername="postgresql+asyncpg")
+    if "sslmode" in url.query:
+        query = dict(url.query)
+        query["ssl"] = query.pop("sslmode")
+        url = url.set(query=query)
+    return url
+
+def create_async_db_engine(name: str = "api-async", url: str = DATABASE_URL, *, pool_size: int = DB_POOL_SIZE,
+                           max_overflow: int = DB_MAX_OVERFLOW, pool_timeout: float = DB_POOL_TIMEOUT_SECONDS,
+                           pool_pre_ping: bool = DB_POOL_PRE_PING, pool_recycle: int = DB_POOL_RECYCLE_SECONDS,
+                           statement_timeout_ms: int = DB_STATEMENT_TIMEOUT_MS) -> AsyncEngine:
+    options, metrics = _engine_options(name, True, pool_size, max_overflow, pool_timeout, pool_pre_ping,
+                                       pool_recycle, statement_timeout_ms, None)
+    engine = create_async_engine(async_database_url(url), **options)
+    db_metrics.instrument(engine.sync_engine, metrics)
+    return engine
+
+# Sync engine: scripts, startup catalog load and the plain `def` endpoints (run in the threadpool)
+engine = create_db_engine()
+SessionLocal = sessionmaker(bind=engine)
+
+# Async engine: `async def` endpoints, so queries never block the event loop
+async_engine = create_async_db_engine()
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,106 @@
+import time
+from typing import Dict, List, Optional
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from backend.timing import Histogram, prometheus_counter, prometheus_gauge, prometheus_histogram
+
+# === Connection pool and query metrics ===
+# Each engine built by backend.database gets an EngineMetrics: its pool class is a
+# subclass that times how long a checkout waits for a free connection, and cursor
+# events time every statement by verb. GET /metrics/db reports them next to the
+# pool's live counters, which shows whether requests queue on the pool or the DB.
+
+QUERY_VERBS = ("select", "insert", "update", "delete")
+
+class EngineMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None  # set once the engine exists
+        self.checkout_wait = Histogram()
+        self.checkout_timeouts = 0
+        self.connects = 0
+        self.queries: Dict[str, Histogram] = {verb: Histogram() for verb in (*QUERY_VERBS, "other")}
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        return {
+            "pool": {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "connects": self.connects,
+                "checkout_timeouts": self.checkout_timeouts,
+            },
+            "checkout_wait_ms": self.checkout_wait.snapshot(),
+            "query_ms": {verb: h.snapshot() for verb, h in self.queries.items()},
+        }
+
+# Engine name -> metrics, for the /metrics/db endpoint
+REGISTRY: Dict[str, EngineMetrics] = {}
+
+class _TimedCheckout:
+    metrics: Optional[EngineMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.checkout_timeouts += 1
+            raise
+        finally:
+            self.metrics.checkout_wait.observe((time.perf_counter() - start) * 1000)
+
+def timed_pool_class(metrics: EngineMetrics, async_driver: bool = False):
+    # A class per engine, so the metrics survive pool.recreate() on engine.dispose()
+    base = AsyncAdaptedQueuePool if async_driver else QueuePool
+    return type(f"Timed{base.__name__}", (_TimedCheckout, base), {"metrics": metrics})
+
+def _verb(statement: str) -> str:
+    head = statement.lstrip()[:6].lower()
+    return head if head in QUERY_VERBS else "other"
+
+def instrument(engine: Engine, metrics: EngineMetrics) -> None:
+    """Attach query timing and pool bookkeeping to a (sync) engine."""
+    metrics.pool = engine.pool
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_start", None)
+        if start is not None:
+            metrics.queries[_verb(statement)].observe((time.perf_counter() - start) * 1000)
+
+    @event.listens_for(engine, "engine_disposed")
+    def _disposed(engine):
+        metrics.pool = engine.pool
+
+    @event.listens_for(engine.pool, "connect")
+    def _connect(dbapi_connection, record):
+        metrics.connects += 1
+
+    REGISTRY[metrics.name] = metrics
+
+def snapshot() -> dict:
+    return {name: m.snapshot() for name, m in REGISTRY.items()}
+
+def prometheus_lines() -> List[str]:
+    engines = sorted(REGISTRY.items())
+    pools = [(name, m.snapshot()["pool"]) for name, m in engines]
+    lines = []
+    for key, help_text in [("checked_out", "Connections currently checked out"),
+                           ("overflow", "Connections open beyond pool_size")]:
+        lines += prometheus_gauge(f"roco_db_pool_{key}", help_text, [({"engine": n}, p[key]) for n, p in pools])
+    lines += prometheus_counter("roco_db_pool_checkout_timeouts_total", "Checkouts that gave up waiting for a connection",
+                                [({"engine": n}, p["checkout_timeouts"]) for n, p in pools])
+    lines += prometheus_histogram("roco_db_checkout_wait_seconds", "Time waiting for a pooled connection",
+                                  [({"engine": n}, m.checkout_wait) for n, m in engines])
+    lines += prometheus_histogram("roco_db_query_seconds", "Statement latency by verb",
+                                  [({"engine": n, "verb": v}, h) for n, m in engines for v, h in m.queries.items()])
+    return lines
@@ -0,0 +1,173 @@
+import json
+import os
+from types import SimpleNamespace
+from backend.models import MoveCategory, AttackStyle, MagicEffectCode
+
+# === Static game data files (backend/data/*.json) ===
+# Same name -> enum mappings and defaults the import scripts apply.
+DATA_DIR = "backend/data"
+
+CATEGORY_MAP = {
+    "Physical Attack": "PHY_ATTACK",
+    "Magic Attack": "MAG_ATTACK",
+    "Defense": "DEFENSE",
+    "Status": "STATUS"
+}
+
+ATTACK_STYLE_MAP = {
+    "Physical": "PHYSICAL",
+    "Magic": "MAGIC",
+    "Both": "BOTH"
+}
+
+# The type order used for legacy moves
+LEGACY_TYPES_ORDER = [
+    "Normal", "Grass", "Fire", "Water", "Light", "Ground", "Ice", "Dragon",
+    "Electric", "Poison", "Bug", "Fighting", "Flying", "Cute", "Ghost",
+    "Dark", "Mechanical", "Illusion"
+]
+
+def load_json(filename: str, data_dir: str = DATA_DIR):
+    with open(os.path.join(data_dir, filename), encoding="utf-8") as f:
+        return json.load(f)
+
+def _rows(items):
+    # ORM-shaped rows with 1-based ids in file order (serial ids on a fresh import)
+    return [SimpleNamespace(id=i, **item) for i, item in enumerate(items, start=1)]
+
+def catalog_rows(data_dir: str = DATA_DIR) -> dict:
+    """Rows for GameCatalog.from_rows, resolved the way the import scripts resolve them."""
+    types_data = load_json("types.json", data_dir)
+    traits_data = load_json("traits.json", data_dir)
+    personalities_data = load_json("personalities.json", data_dir)
+    species_data = load_json("monster_species.json", data_dir)
+    items_data = load_json("magic_items.json", data_dir)
+    moves_data = load_json("moves.json", data_dir)
+    monsters_data = load_json("monsters.json", data_dir)
+    monster_moves_data = load_json("monster_moves.json", data_dir)
+    terms_data = load_json("game_terms.json", data_dir)
+
+    types = _rows({"name": t["name"], "localized": t["localized"]} for t in types_data)
+    type_map = {t.name: t.id for t in types}
+    effective_against = [
+        (type_map[t["name"]], type_map[name])
+        for t in types_data for name in t.get("effective_against", []) if name in type_map
+    ]
+    weak_against = [
+        (type_map[t["name"]], type_map[name])
+        for t in types_data for name in t.get("weak_against", []) if name in type_map
+    ]
+
+    traits = _rows(
+        {"name": t["name"], "description": t["description"], "localized": t["localized"]} for t in traits_data
+    )
+    trait_map = {t.name: t.id for t in traits}
+    personalities = _rows(
+        {
+            "name": p["name"],
+            "hp_mod_pct": p.get("hp_mod_pct", 0.0),
+            "phy_atk_mod_pct": p.get("phy_atk_mod_pct", 0.0),
+            "mag_atk_mod_pct": p.get("mag_atk_mod_pct", 0.0),
+            "phy_def_mod_pct": p.get("phy_def_mod_pct", 0.0),
+            "mag_def_mod_pct": p.get("mag_def_mod_pct", 0.0),
+            "spd_mod_pct": p.get("spd_mod_pct", 0.0),
+            "localized": p["localized"],
+        }
+        for p in personalities_data
+    )
+    species = _rows({"name": s["name"], "localized": s["localized"]} for s in species_data)
+    species_map = {s.name: s.id for s in species}
+
+    magic_items = _rows(
+        {
+            "name": item["name"],
+            "description": item["description"],
+            "effect_code": MagicEffectCode[item["effect_code"]],
+            "applies_to_type_id": type_map[item["applies_to_type"]] if item.get("applies_to_type") else None,
+            "effect_parameters": item.get("effect_parameters"),
+            "localized": item["localized"],
+        }
+        for item in items_data
+    )
+    moves = _rows(
+        {
+            "name": item["name"],
+            "move_type_id": type_map[item["type"]] if item.get("type") is not None else None,
+            "move_category": MoveCategory[CATEGORY_MAP[item["category"]]],
+            "energy_cost": item["energy_cost"],
+            "power": item.get("power"),
+            "description": item["description"],
+            "has_counter": item.get("has_counter", False),
+            "is_move_stone": item.get("is_move_stone", False),
+            "localized": item["localized"],
+        }
+        for item in moves_data
+    )
+    move_map = {mv.name: mv.id for mv in moves}
+
+    monsters = _rows(
+        {
+            "name": item["name"],
+            "evolves_from_id": None,
+            "species_id": species_map[item["species"]],
+            "form": item.get("form", "default"),
+            "main_type_id": type_map[item["main_type"]],
+            "sub_type_id": type_map.get(item["sub_type"]),
+            "default_legacy_type_id": type_map[item["default_legacy_type"]],
+            "trait_id": trait_map[item["trait"]],
+            "leader_potential": item.get("leader_potential", False),
+            "is_leader_form": item.get("is_leader_form", False),
+            "base_hp": item["base_hp"],
+            "base_phy_atk": item["base_phy_atk"],
+            "base_mag_atk": item["base_mag_atk"],
+            "base_phy_def": item["base_phy_def"],
+            "base_mag_def": item["base_mag_def"],
+            "base_spd": item["base_spd"],
+            "preferred_attack_style": AttackStyle[ATTACK_STYLE_MAP[item["preferred_attack_style"]]],
+            "localized": item["localized"],
+        }
+        for item in monsters_data
+    )
+    monster_by_name_and_form = {(m.name, m.form): m.id for m in monsters}
+
+    monster_moves = set()
+    legacy_moves = []
+    for m, item in zip(monsters, monsters_data):
+        # Parent's default form first, then the same form
+        evolves_from = item.get("evolves_from")
+        if evolves_from:
+            m.evolves_from_id = monster_by_name_and_form.get((evolves_from, "default")) \
+                or monster_by_name_and_form.get((evolves_from, m.form))
+
+        moveset = monster_moves_data.get(item.get("moveset_key") or "")
+        if moveset is None:
+            continue
+        for move_name in set(moveset.get("learnable_moves", [])) | set(moveset.get("move_stones", [])):
+            if move_name in move_map:
+                monster_moves.add((m.id, move_map[move_name]))
+        legacy = moveset.get("legacy_moves", [])
+        if len(legacy) == len(LEGACY_TYPES_ORDER):
+            for type_name, move_name in zip(LEGACY_TYPES_ORDER, legacy):
+                if move_name in move_map and type_name in type_map:
+                    legacy_moves.append(SimpleNamespace(
+                        monster_id=m.id, type_id=type_map[type_name], move_id=move_map[move_name]
+                    ))
+
+    game_terms = _rows(
+        {"key": t["key"], "description": t["description"], "localized": t["localized"]} for t in terms_data
+    )
+
+    return {
+        "types": types,
+        "effective_against": effective_against,
+        "weak_against": weak_against,
+        "traits": traits,
+        "personalities": personalities,
+        "species": species,
+        "moves": moves,
+        "monsters": monsters,
+        "monster_moves": sorted(monster_moves),
+        "legacy_moves": legacy_moves,
+        "magic_items": magic_items,
+        "game_terms": game_terms,
+    }
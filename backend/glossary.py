@@ -0,0 +1,65 @@
+import re
+from typing import Dict, FrozenSet, Iterable, List, Sequence
+
+# === Game-term glossary index ===
+# Trait-synergy prompts only need the glossary entries their trait and moves talk
+# about. A term is mentioned when its key appears as a whole word or phrase
+# (casefolded, with a plural or -ed/-ing ending allowed), and an entry pulls in the
+# terms its own description mentions, so "Poison Mark" brings "Poison" along.
+# Matching and rendering happen once per catalog version; a prompt only unions a
+# few precomputed id sets and joins the stored lines.
+
+def _stem(key: str) -> str:
+    return (key[:-1] if key.endswith("s") and not key.endswith("ss") else key).casefold()
+
+def _term_pattern(stem: str) -> "re.Pattern":
+    return re.compile(r"(?<!\w)" + re.escape(stem) + r"(?:s|es|ed|ing)?(?!\w)")
+
+class GlossaryIndex:
+    def __init__(self, game_terms: Sequence, moves: Iterable, traits: Iterable):
+        self.terms = tuple(game_terms)
+        self._stems = [_stem(t.key) for t in self.terms]
+        self._patterns = [_term_pattern(stem) for stem in self._stems]
+        # Pre-rendered prompt lines, in catalog order
+        self._lines = [f"- {t.key}: {t.description}" for t in self.terms]
+
+        # Positions in self.terms each term's description refers to, then their closure
+        refers = [self._mentions(t.description) - {i} for i, t in enumerate(self.terms)]
+        self._closure: List[FrozenSet[int]] = [self._close({i}, refers) for i in range(len(self.terms))]
+
+        self.move_terms: Dict[int, FrozenSet[int]] = {mv.id: self._expand(mv.description) for mv in moves}
+        self.trait_terms: Dict[int, FrozenSet[int]] = {t.id: self._expand(t.description) for t in traits}
+
+    def _mentions(self, text: str) -> set:
+        # Substring test first; the regex only confirms word boundaries on the few hits
+        text = (text or "").casefold()
+        return {i for i, (stem, pattern) in enumerate(zip(self._stems, self._patterns))
+                if stem in text and pattern.search(text)}
+
+    @staticmethod
+    def _close(start: set, refers: List[set]) -> FrozenSet[int]:
+        seen, todo = set(start), list(start)
+        while todo:
+            for j in refers[todo.pop()] - seen:
+                seen.add(j)
+                todo.append(j)
+        return frozenset(seen)
+
+    def _expand(self, text: str) -> FrozenSet[int]:
+        found = set()
+        for i in self._mentions(text):
+            found |= self._closure[i]
+        return frozenset(found)
+
+    def term_keys(self, trait_id: int, move_ids: Iterable[int]) -> List[str]:
+        return [self.terms[i].key for i in self._positions(trait_id, move_ids)]
+
+    def render(self, trait_id: int, move_ids: Iterable[int]) -> str:
+        """Glossary lines for the terms a trait and its moves mention ("" when none do)."""
+        return "\n".join(self._lines[i] for i in self._positions(trait_id, move_ids))
+
+    def _positions(self, trait_id: int, move_ids: Iterable[int]) -> List[int]:
+        found = set(self.trait_terms.get(trait_id, ()))
+        for move_id in move_ids:
+            found |= self.move_terms.get(move_id, frozenset())
+        return sorted(found)
@@ -0,0 +1,124 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from google import genai
+from google.genai import types
+from backend.config import GEMINI_API_KEY, LLM_MAX_CONCURRENCY
+from backend.timing import REQUEST_BUCKETS_MS, Histogram, prometheus_counter, prometheus_gauge, prometheus_histogram
+import json
+
+client = genai.Client(api_key=GEMINI_API_KEY)
+
+LLM_MODEL = "gemini-2.5-flash"
+
+# Stand-ins for a missing analysis; "status" ends up on the TraitSynergyFinding
+def llm_fallback_result():
+    return {"synergy_moves": [], "recommendation": ["Error generating analysis."], "status": "error"}
+
+def llm_timeout_result():
+    return {"synergy_moves": [], "recommendation": [], "status": "timeout"}
+
+# Call the LLM and parse its JSON reply; raises on API or parse errors
+async def generate_json(prompt: str):
+    resp = await client.aio.models.generate_content(
+        model=LLM_MODEL,
+        contents=prompt,
+        config=types.GenerateContentConfig(
+            response_mime_type="application/json"
+        ),
+    )
+    return json.loads(resp.text)
+
+# === Process-wide LLM dispatcher ===
+# Every LLM call goes through one dispatcher: at most `max_concurrency` calls are in
+# flight across all requests (the rest queue on a semaphore), and a prompt already in
+# flight through the same call function is not sent again; later callers await that
+# call. The shared
+# call runs in its own task, so one caller going away does not cancel it for the
+# others; it is only cancelled once nobody is waiting for it.
+
+class _InFlight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class LLMDispatcher:
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self.queued = 0       # calls waiting for a slot
+        self.active = 0       # calls talking to the LLM
+        self.calls = 0
+        self.coalesced = 0    # callers that joined a call already in flight
+        self.errors = 0
+        self.queue_wait = Histogram(REQUEST_BUCKETS_MS)
+        self._loop = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Tuple[Callable, str], _InFlight] = {}
+
+    def _bind(self):
+        # Tests and scripts run several event loops; loop-bound state starts fresh on each
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._inflight = {}
+
+    async def run(self, prompt: str, call: Callable[[str], Awaitable] = None):
+        """Result of `call(prompt)` (default: generate_json), sharing an in-flight call of the same pair."""
+        self._bind()
+        call = call or generate_json
+        key = (call, prompt)
+        entry = self._inflight.get(key)
+        if entry is None:
+            entry = _InFlight(asyncio.ensure_future(self._execute(prompt, call)))
+            inflight = self._inflight
+            inflight[key] = entry
+            # Also retrieve the outcome: a call that fails after every waiter left (timed
+            # out, cancelled) would otherwise be logged as "exception was never retrieved"
+            entry.task.add_done_callback(lambda t: (inflight.pop(key, None), t.cancelled() or t.exception()))
+        else:
+            self.coalesced += 1
+        entry.waiters += 1
+        try:
+            return await asyncio.shield(entry.task)
+        except asyncio.CancelledError:
+            if entry.waiters == 1 and not entry.task.done():
+                entry.task.cancel()
+            raise
+        finally:
+            entry.waiters -= 1
+
+    async def _execute(self, prompt: str, call: Callable[[str], Awaitable]):
+        start = time.perf_counter()
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.queue_wait.observe((time.perf_counter() - start) * 1000)
+        self.active += 1
+        self.calls += 1
+        try:
+            return await call(prompt)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def prometheus_lines(self) -> List[str]:
+        labels = {}
+        return (
+            prometheus_gauge("roco_llm_queue_depth", "LLM calls waiting for a concurrency slot", [(labels, self.queued)])
+            + prometheus_gauge("roco_llm_in_flight", "LLM calls in progress", [(labels, self.active)])
+            + prometheus_gauge("roco_llm_max_concurrency", "Global LLM concurrency limit", [(labels, self.max_concurrency)])
+            + prometheus_counter("roco_llm_calls_total", "LLM calls issued", [(labels, self.calls)])
+            + prometheus_counter("roco_llm_coalesced_total", "Callers served by an identical in-flight call",
+                                 [(labels, self.coalesced)])
+            + prometheus_counter("roco_llm_errors_total", "LLM calls that raised", [(labels, self.errors)])
+            + prometheus_histogram("roco_llm_queue_wait_seconds", "Time LLM calls waited for a slot",
+                                   [(labels, self.queue_wait)])
+        )
+
+llm_dispatcher = LLMDispatcher()
@@ -1,22 +1,46 @@
-from fastapi import FastAPI, Depends, Query, HTTPException, status
+from fastapi import FastAPI, Depends, Query, HTTPException, status, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session, sessionmaker, joinedload
-from sqlalchemy import create_engine, or_, cast, String, func
-from backend.config import DATABASE_URL, OPENAI_API_KEY, GEMINI_API_KEY
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from backend.config import LLM_BATCH_CONCURRENCY, LLM_BATCH_DEADLINE_MS, CATALOG_CACHE_MAX_AGE
+from backend.database import SessionLocal, AsyncSessionLocal, async_engine, get_db, get_async_db
 from typing import Optional, List
-from decimal import Decimal, ROUND_HALF_UP
-from backend import models, schemas
-from collections import Counter
-import re
-from google import genai
-from google.genai import types
-import asyncio
+from backend import db_metrics, models, schemas
+from backend.catalog import GameCatalog
+from backend.catalog_responses import RenderedCatalog
+from backend.name_index import FUZZY
+from backend.llm import llm_dispatcher
+from backend.timing import TimingMiddleware, prometheus_stage_lines, span
+from backend.stat_engine import STAT_FIELDS, talent_matrix
+from backend.team_search import TeamSearch
+from backend.moveset_optimizer import MovesetOptimizer
+from backend.analysis import (
+    compute_effective_stats, compute_energy_profile, compute_counter_coverage, compute_defense_status_move,
+    prepare_team_analysis, build_trait_synergy_finding, finalize_team_analysis,
+)
+from contextlib import asynccontextmanager
+from backend.trait_synergy import request_deadline, run_trait_synergy, iter_trait_synergy
+import base64
 import json
-import time
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
 
-client = genai.Client(api_key=GEMINI_API_KEY)
+# Static game data is loaded once here and served from memory afterwards
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    with SessionLocal() as db:
+        app.state.catalog = GameCatalog.load(db)
+    app.state.rendered_catalog = RenderedCatalog(app.state.catalog)
+    yield
+    await async_engine.dispose()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,397 +48,45 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine)
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-# === TOP-LEVEL HELPER FUNCTIONS ===
-# Compute effective stats with base, talent, and personality multipliers
-def round_half_up(n):
-    return int(Decimal(n).to_integral_value(rounding=ROUND_HALF_UP))
-
-def compute_effective_stats(monster, personality, talent):
-    # HP formula: hp = [1.7 × (base_stats + hp_talent × 6) + 70 − 2.55 × hp_talent] × (1 + hp_personality_modifier) + 100
-    base_hp = monster.base_hp
-    hp_talent = talent.hp_boost
-    hp = (1.7 * (base_hp + hp_talent * 6) + 70 - 2.55 * hp_talent)
-    hp = hp * (1 + personality.hp_mod_pct)
-    hp = int(round_half_up(hp + 100))  # int() for safety
-
-    # other stats = round_half_up(1.1 × (base_stats + talent × 6) + 10) × (1 + personality_modifier) + 50
-    def other_stat(attr, personality_attr, talent_attr):
-        base = getattr(monster, attr)
-        pers = getattr(personality, personality_attr)
-        tal = getattr(talent, talent_attr)
-        val = 1.1 * (base + tal * 6) + 10
-        val = round_half_up(val) * (1 + pers)
-        val = int(round_half_up(val + 50))
-        return val
-
-    return schemas.EffectiveStats(
-        hp=hp,
-        phy_atk=other_stat("base_phy_atk", "phy_atk_mod_pct", "phy_atk_boost"),
-        mag_atk=other_stat("base_mag_atk", "mag_atk_mod_pct", "mag_atk_boost"),
-        phy_def=other_stat("base_phy_def", "phy_def_mod_pct", "phy_def_boost"),
-        mag_def=other_stat("base_mag_def", "mag_def_mod_pct", "mag_def_boost"),
-        spd=other_stat("base_spd", "spd_mod_pct", "spd_boost"),
-    )
-    
-# Compute energy profile for moves, including average cost, zero-cost moves, and energy restore moves
-def compute_energy_profile(moves):
-    # moves: list of 4 move SQLAlchemy objects, each with .energy_cost
-    costs = [getattr(m, "energy_cost", None) for m in moves if m is not None]
-    costs = [c for c in costs if c is not None]
-
-    avg_cost = sum(costs) / len(costs) if costs else 0.0
-    zero_cost_moves = [m.id for m in moves if m and getattr(m, "energy_cost", None) == 0]
-    has_zero_cost = len(zero_cost_moves) > 0
-
-    # Energy restore pattern
-    energy_patterns = [
-        r"gain[s]? \w+ energy",
-        r"restore[s]? \w+ energy",
-        r"steal[s]? \w+ energy",
-        r"gain[s]? energy",
-        r"restore[s]? energy"
-    ]
-    combined_pattern = re.compile("|".join(energy_patterns), flags=re.IGNORECASE)
-
-    energy_restore_moves = [
-        m.id for m in moves
-        if m and hasattr(m, "description") and m.description and combined_pattern.search(m.description)
-    ]
-    has_energy_restore = len(energy_restore_moves) > 0
-
-    return schemas.EnergyProfile(
-        avg_energy_cost=round(avg_cost, 2),
-        has_zero_cost_move=has_zero_cost,
-        has_energy_restore_move=has_energy_restore,
-        zero_cost_moves=zero_cost_moves,
-        energy_restore_moves=energy_restore_moves
-    )
-
-# Compute counter coverage for moves with attack/defense/status counters
-def compute_counter_coverage(moves):
-    # moves: list of 4 move SQLAlchemy objects, each with .move_category and .has_counter
-    has_attack_counter_status = False
-    has_defense_counter_attack = False
-    has_status_counter_defense = False
-    counter_move_ids = []
-
-    for m in moves:
-        if not m or not getattr(m, "has_counter", False):
-            continue
-        counter_move_ids.append(m.id)
-        cat = getattr(m, "move_category", None)
-        if cat in [models.MoveCategory.PHY_ATTACK, models.MoveCategory.MAG_ATTACK]:
-            has_attack_counter_status = True
-        elif cat == models.MoveCategory.DEFENSE:
-            has_defense_counter_attack = True
-        elif cat == models.MoveCategory.STATUS:
-            has_status_counter_defense = True
-        
-    return schemas.CounterCoverage(
-        has_attack_counter_status=has_attack_counter_status,
-        has_defense_counter_attack=has_defense_counter_attack,
-        has_status_counter_defense=has_status_counter_defense,
-        total_counter_moves=len(counter_move_ids),
-        counter_move_ids=counter_move_ids
-    )
-    
-# Count and record defense/status moves
-def compute_defense_status_move(moves):
-    defense_status_move_ids = []
-    for m in moves:
-        if m.move_category in [models.MoveCategory.DEFENSE, models.MoveCategory.STATUS]:
-            defense_status_move_ids.append(m.id)
-    return schemas.DefenseStatusMove(
-        defense_status_move_count=len(defense_status_move_ids),
-        defense_status_move=defense_status_move_ids,
-    )
-    
-# Trait Synergy LLM Analysis
-def build_trait_synergy_prompt(monster, trait, selected_moves, preferred_attack_style, game_terms):
-    move_lines = "\n".join(
-        f"- {m.name}: {m.description}" for m in selected_moves
-    )
-    glossary = "\n".join(
-        f"- {gt.key}: {gt.description}" for gt in game_terms
-    )
-    prompt = f"""You are an expert game strategist.
-Monster: {monster.name}
-Trait: {trait.name} — {trait.description}
-Preferred attack style: {preferred_attack_style}
-Selected moves:
-{move_lines}
-
-Game Terms Glossary:
-{glossary}
-
-Instructions:
-1. Identify which moves are especially synergistic with the trait.
-2. For your recommendations:
-    - Give **exactly two recommendations** (3-4 sentences max) that **explain in detail how the user should use the selected moves together**, including possible combos, turn order, defensive or offensive applications, and how to leverage the trait with the current moveset.
-    - Give **one additional recommendation** (1-2 sentences) for how to improve move selection in general (such as favoring certain types, effects, or utility, but do NOT suggest specific move swaps).
-3. Output as JSON in the following format:
-{{
-"synergy_moves": [list of move names],
-"recommendation": [list of suggestions as strings]
-}}
-"""
-    return prompt
-
-# Compute team-level analysis
-def compute_type_coverage(user_monsters, move_db_map, monster_db_map, type_db_map):
-    IGNORED_TYPE_NAMES = {"Leader"}
-    ignored_type_ids = {t.id for t in type_db_map.values() if t.name in IGNORED_TYPE_NAMES}
-    all_type_ids = set(type_db_map.keys()) - ignored_type_ids
-
-    # Gather all move types for offense
-    team_move_types = set()
-    for um in user_monsters:
-        for move_id in [um.move1_id, um.move2_id, um.move3_id, um.move4_id]:
-            move = move_db_map[move_id]
-            if move.move_type_id:
-                team_move_types.add(move.move_type_id)
-
-    # Offensive coverage
-    effective_against_types = set()
-    for move_type_id in team_move_types:
-        move_type = type_db_map[move_type_id]
-        effective_against_types.update([t.id for t in move_type.effective_against])
-
-    weak_against_types = list(all_type_ids - effective_against_types)
-
-    # Defensive weakness, build weakness count per type across team
-    type_weak_count = Counter()
-    all_types = list(type_db_map.values())
-    for um in user_monsters:
-        base_monster = monster_db_map[um.monster_id]
-        main_type = type_db_map[base_monster.main_type_id]
-        sub_type = type_db_map[base_monster.sub_type_id] if base_monster.sub_type_id else None
-
-        for attacking_type in all_types:
-            weak_main = attacking_type in main_type.vulnerable_to
-            weak_sub = sub_type and attacking_type in sub_type.vulnerable_to
-
-            resist_main = attacking_type in main_type.resistant_to
-            resist_sub = sub_type and attacking_type in sub_type.resistant_to
-
-            # Per-monster weakness logic
-            is_weak = False
-            if weak_main and weak_sub:
-                is_weak = True
-            elif (weak_main and not resist_sub and not weak_sub) or (weak_sub and not resist_main and not weak_main):
-                is_weak = True
-
-            if is_weak:
-                type_weak_count[attacking_type.id] += 1
-
-    # Only include types that appear >= 3 times
-    team_weak_to = [type_id for type_id, count in type_weak_count.items() if count >= 3]
-
-    return {
-        "effective_against_types": sorted(effective_against_types),
-        "weak_against_types": sorted(weak_against_types),
-        "team_weak_to": sorted(team_weak_to),
-    }
-    
-def compute_magic_item_eval(magic_item, user_monster_outs, type_db_map):
-    valid_targets = []
-
-    # Dynamic type IDs by name
-    TYPE_NAME_TO_ID = {t.name.lower(): t.id for t in type_db_map.values()}
-    GRASS_TYPE_ID = TYPE_NAME_TO_ID.get("grass")
-    FIRE_TYPE_ID = TYPE_NAME_TO_ID.get("fire")
-    WATER_TYPE_ID = TYPE_NAME_TO_ID.get("water")
-    LEADER_TYPE_ID = TYPE_NAME_TO_ID.get("leader")
-
-    effect_code = getattr(magic_item, "effect_code", None)
-
-    for user_monster in user_monster_outs:
-        m = user_monster.monster  # MonsterLiteOut
-        legacy_type_id = getattr(user_monster.legacy_type, "id", None)
-        main_type_id = getattr(m.main_type, "id", None)
-        sub_type_id = getattr(m.sub_type, "id", None)
-
-        # Enhancement Spell: any monster
-        if effect_code == models.MagicEffectCode.ENHANCE_SPELL:
-            valid_targets.append(user_monster.id)
-
-        # Sun Healing: grass main/sub/legacy
-        elif effect_code == models.MagicEffectCode.SUN_HEALING:
-            if ((main_type_id == GRASS_TYPE_ID) or
-                (sub_type_id == GRASS_TYPE_ID) or
-                (legacy_type_id == GRASS_TYPE_ID)):
-                valid_targets.append(user_monster.id)
-
-        # Flare Burst: fire main/sub/legacy
-        elif effect_code == models.MagicEffectCode.FLARE_BURST:
-            if ((main_type_id == FIRE_TYPE_ID) or
-                (sub_type_id == FIRE_TYPE_ID) or
-                (legacy_type_id == FIRE_TYPE_ID)):
-                valid_targets.append(user_monster.id)
-
-        # Flow Spell: water main/sub/legacy
-        elif effect_code == models.MagicEffectCode.FLOW_SPELL:
-            if ((main_type_id == WATER_TYPE_ID) or
-                (sub_type_id == WATER_TYPE_ID) or
-                (legacy_type_id == WATER_TYPE_ID)):
-                valid_targets.append(user_monster.id)
-
-        # Evolution Power: only if leader_potential and legacy type is Leader
-        elif effect_code == models.MagicEffectCode.EVOLUTION_POWER:
-            if getattr(m, "leader_potential", False) and (legacy_type_id == LEADER_TYPE_ID):
-                valid_targets.append(user_monster.id)
-
-    # More logic can be added here for other analysis aspects
-    return {
-        "chosen_item": magic_item,
-        "valid_targets": valid_targets,
-        "best_target_monster_id": None,
-        "reasoning": None,
-    }
-
-def generate_recommendations(per_monster_analysis, type_coverage, magic_item_eval, move_db_map, type_db_map):
-    recs: List[schemas.RecItem] = []
-
-    def add(category, severity, message, *, type_ids=None, monster_ids=None, move_ids=None):
-        recs.append(schemas.RecItem(
-            category=category,
-            severity=severity,
-            message=message,
-            type_ids=type_ids or [],
-            monster_ids=monster_ids or [],
-            move_ids=move_ids or []
-        ))
-
-    # 1) Type coverage – offense
-    if type_coverage["weak_against_types"]:
-        names = [type_db_map[t].name for t in type_coverage["weak_against_types"]]
-        add("coverage", "warn",
-            f"Your team cannot hit these types super-effectively: {', '.join(names)}. Consider adding moves for coverage.",
-            type_ids=type_coverage["weak_against_types"])
-
-    # 2) Team defensive weaknesses
-    if type_coverage["team_weak_to"]:
-        names = [type_db_map[t].name for t in type_coverage["team_weak_to"]]
-        add("weakness", "danger",
-            f"Your team is especially vulnerable to: {', '.join(names)}. Consider defensive options or resistances.",
-            type_ids=type_coverage["team_weak_to"])
-
-    # 3) Magic item usage
-    vt = magic_item_eval.valid_targets
-    if not vt:
-        add("magic_item", "warn", "Your selected magic item cannot be used by any monster in your current team!")
-    elif len(vt) == 1:
-        add("magic_item", "info", "Only one monster can use the selected magic item.", monster_ids=vt)
-    else:
-        add("magic_item", "info", "Multiple monsters can use the selected magic item.", monster_ids=vt)
-
-    # 4) Redundant typing
-    from collections import Counter
-    all_types = []
-    for analysis in per_monster_analysis:
-        m = analysis.user_monster.monster
-        all_types.append(m.main_type.id)
-        if m.sub_type is not None:
-            all_types.append(m.sub_type.id)
-    counts = Counter(all_types)
-    common_type_ids = [tid for tid, cnt in counts.items() if cnt >= 4]
-    if common_type_ids:
-        names = [type_db_map[t].name for t in common_type_ids]
-        add("weakness", "warn",
-            f"Many monsters share these types: {', '.join(names)}. This increases vulnerability to specific counters.",
-            type_ids=common_type_ids)
-
-    # 5) Per-monster checks
-    for analysis in per_monster_analysis:
-        mid = analysis.user_monster.id
-        mname = analysis.user_monster.monster.name
-
-        if analysis.energy_profile.avg_energy_cost > 4:
-            add("energy", "warn",
-                f"{mname}'s moves have high average energy cost. Consider lower-cost or energy-restoring moves.",
-                monster_ids=[mid])
-
-        if analysis.counter_coverage.total_counter_moves == 0:
-            add("counters", "warn",
-                f"{mname} has no counter-effect moves selected.",
-                monster_ids=[mid])
-
-        if analysis.defense_status_move.defense_status_move_count < 2:
-            add("defense_status", "info",
-                f"{mname} has fewer than 2 Defense/Status moves. Consider adding more for survivability.",
-                monster_ids=[mid])
-
-        for synergy in analysis.trait_synergies:
-            if synergy.synergy_moves:
-                move_names = [move_db_map[x].name for x in synergy.synergy_moves]
-                add("trait_synergy", "info",
-                    f"{mname}'s trait works well with: {', '.join(move_names)}.",
-                    monster_ids=[mid], move_ids=synergy.synergy_moves)
-
-    # 6) Role diversity
-    styles = [getattr(a.user_monster.monster, "preferred_attack_style", None) for a in per_monster_analysis]
-    if len(set(styles)) == 1 and styles[0]:
-        add("general", "warn", f"All monsters are {styles[0]}-style attackers. This may make the team predictable.")
-
-    # 7) Stat and role highlights
-    stat_roles = {
-        "hp": "frontline or defensive pivot",
-        "phy_atk": "main physical attacker",
-        "mag_atk": "main magic attacker",
-        "overall_def": "physical or special tank",
-        "spd": "lead, scout, or revenge killer",
-    }
-
-    def best_of(stat, label, role_key=None):
-        vals = [(a.user_monster.monster.name, getattr(a.effective_stats, stat), a.user_monster.id)
-                for a in per_monster_analysis]
-        if not vals:
-            return
-        name, value, uid = max(vals, key=lambda x: x[1])
-        role_txt = stat_roles.get(role_key or stat)
-        role_suffix = f" Consider using it as your {role_txt}." if role_txt else ""
-        add(
-            "stat_highlight",
-            "info",
-            f"{name} has the highest {label} ({value}).{role_suffix}",
-            monster_ids=[uid],
-        )
-
-    best_of("hp", "HP")
-    best_of("phy_atk", "Physical Attack")
-    best_of("mag_atk", "Magic Attack")
-    # overall defense = phy_def + mag_def
-    vals_def = [
-        (a.user_monster.monster.name,
-         a.effective_stats.phy_def + a.effective_stats.mag_def,
-         a.user_monster.id)
-        for a in per_monster_analysis
-    ]
-    if vals_def:
-        name, value, uid = max(vals_def, key=lambda x: x[1])
-        role_suffix = f" Consider using it as your {stat_roles['overall_def']}."
-        add(
-            "stat_highlight",
-            "info",
-            f"{name} has the highest Total Defense ({value}).{role_suffix}",
-            monster_ids=[uid],
-        )
-    best_of("spd", "Speed")
-
-    return recs
-
+# Server-Timing header and per-endpoint stage histograms (see GET /metrics)
+app.add_middleware(TimingMiddleware)
+
+def get_catalog(request: Request) -> GameCatalog:
+    return request.app.state.catalog
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison: W/"x" matches "x"
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+def catalog_headers(catalog: GameCatalog) -> dict:
+    return {"ETag": f'"{catalog.version}"', "Cache-Control": f"public, max-age={CATALOG_CACHE_MAX_AGE}"}
+
+def catalog_cache(request: Request, response: Response, catalog: GameCatalog = Depends(get_catalog)) -> GameCatalog:
+    """Catalog data is versioned, so GETs carry its hash as ETag and revalidate to 304."""
+    headers = catalog_headers(catalog)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, headers["ETag"]):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return catalog
+
+def get_rendered_catalog(request: Request, catalog: GameCatalog = Depends(catalog_cache)) -> RenderedCatalog:
+    # Rebuilt on first use after the catalog version changes
+    rendered = getattr(request.app.state, "rendered_catalog", None)
+    if rendered is None or rendered.version != catalog.version:
+        rendered = request.app.state.rendered_catalog = RenderedCatalog(catalog)
+    return rendered
+
+def rendered_json(body: bytes, rendered: RenderedCatalog) -> Response:
+    # Pre-serialized bodies skip response_model validation, so the cache headers go on here
+    return Response(content=body, media_type="application/json", headers=catalog_headers(rendered.catalog))
 
 # === GET Endpoints ===
 
@@ -424,7 +96,7 @@ def read_root():
 
 @app.get("/monsters/", response_model=List[schemas.MonsterLiteOut])
 def get_monsters(
-    db: Session = Depends(get_db),
+    rendered: RenderedCatalog = Depends(get_rendered_catalog),
     name: Optional[str] = Query(None),
     type_id: Optional[int] = Query(None),
     trait_id: Optional[int] = Query(None),
@@ -432,64 +104,19 @@ def get_monsters(
     limit: int = Query(117, ge=1, le=117),
     offset: int = Query(0, ge=0),
 ):
-    query = db.query(models.Monster).options(
-        joinedload(models.Monster.main_type),
-        joinedload(models.Monster.sub_type),
-    )
-
-    if name:
-        term = f"%{name}%"
-
-        # Dialect-aware JSON -> text extraction for localized.zh.name / localized.zh.form
-        dialect = db.bind.dialect.name
-
-        if dialect == "postgresql":
-            zh_name_expr = cast(models.Monster.localized['zh']['name'].astext, String)
-            zh_form_expr = cast(models.Monster.localized['zh']['form'].astext, String)
-        elif dialect == "sqlite":
-            zh_name_expr = func.json_extract(models.Monster.localized, '$.zh.name')
-            zh_form_expr = func.json_extract(models.Monster.localized, '$.zh.form')
-        else:
-            zh_name_expr = None
-            zh_form_expr = None
-
-        # Allow searching both English name and form column
-        filters = [models.Monster.name.ilike(term)]
-        filters.append(models.Monster.form.ilike(term))
-
-        if zh_name_expr is not None:
-            filters.append(cast(zh_name_expr, String).ilike(term))
-        if zh_form_expr is not None:
-            filters.append(cast(zh_form_expr, String).ilike(term))
-
-        query = query.filter(or_(*filters))
-
-    if type_id:
-        query = query.filter(or_(
-            models.Monster.main_type_id == type_id,
-            models.Monster.sub_type_id == type_id,
-        ))
-
-    if trait_id:
-        query = query.filter(models.Monster.trait_id == trait_id)
-
-    if is_leader_form is not None:
-        query = query.filter(models.Monster.is_leader_form == is_leader_form)
-        
-    # Enforce deterministic order
-    query = query.order_by(models.Monster.id.asc())
-    
-    return query.offset(offset).limit(limit).all()
+    # Searches English name/form and localized zh name/form, ordered by id
+    return rendered_json(rendered.monsters(
+        name=name,
+        type_id=type_id,
+        trait_id=trait_id,
+        is_leader_form=is_leader_form,
+        limit=limit,
+        offset=offset,
+    ), rendered)
 
 @app.get("/monsters/{monster_id}", response_model=schemas.MonsterOut)
-def get_monster_detail(monster_id: int, db: Session = Depends(get_db)):
-    monster = db.query(models.Monster).options(
-        joinedload(models.Monster.main_type),
-        joinedload(models.Monster.sub_type),
-        joinedload(models.Monster.trait),
-        joinedload(models.Monster.species),
-        joinedload(models.Monster.move_pool).joinedload(models.Move.move_type)
-    ).filter(models.Monster.id == monster_id).first()
+def get_monster_detail(monster_id: int, catalog: GameCatalog = Depends(catalog_cache)):
+    monster = catalog.monsters.get(monster_id)
     if not monster:
         raise HTTPException(status_code=404, detail="Monster not found")
     return monster
@@ -497,7 +124,7 @@ def get_monster_detail(monster_id: int, db: Session = Depends(get_db)):
 
 @app.get("/moves/", response_model=List[schemas.MoveLiteOut])
 def get_moves(
-    db: Session = Depends(get_db),
+    rendered: RenderedCatalog = Depends(get_rendered_catalog),
     name: Optional[str] = Query(None),
     move_type_id: Optional[int] = Query(None),
     move_category: Optional[schemas.MoveCategory] = Query(None),
@@ -506,59 +133,75 @@ def get_moves(
     limit: int = Query(468, ge=1, le=468),
     offset: int = Query(0, ge=0),
 ):
-    query = db.query(models.Move).options(
-        joinedload(models.Move.move_type)
-    )
-    if name:
-        query = query.filter(models.Move.name.ilike(f"%{name}%"))
-    if move_type_id:
-        query = query.filter(models.Move.move_type_id == move_type_id)
-    if move_category:
-        query = query.filter(models.Move.move_category == models.MoveCategory(move_category.value))
-    if has_counter is not None:
-        query = query.filter(models.Move.has_counter == has_counter)
-    if is_move_stone is not None:
-        query = query.filter(models.Move.is_move_stone == is_move_stone)
-    return query.offset(offset).limit(limit).all()
+    return rendered_json(rendered.moves(
+        name=name,
+        move_type_id=move_type_id,
+        move_category=models.MoveCategory(move_category.value) if move_category else None,
+        has_counter=has_counter,
+        is_move_stone=is_move_stone,
+        limit=limit,
+        offset=offset,
+    ), rendered)
 
 @app.get("/moves/{move_id}", response_model=schemas.MoveOut)
-def get_move_detail(move_id: int, db: Session = Depends(get_db)):
-    move = db.query(models.Move).options(
-        joinedload(models.Move.move_type)
-    ).filter(models.Move.id == move_id).first()
+def get_move_detail(move_id: int, catalog: GameCatalog = Depends(catalog_cache)):
+    move = catalog.moves.get(move_id)
     if not move:
         raise HTTPException(status_code=404, detail="Move not found")
     return move
 
 
 @app.get("/traits/", response_model=List[schemas.TraitOut])
-def get_traits(db: Session = Depends(get_db)):
-    return db.query(models.Trait).all()
+def get_traits(rendered: RenderedCatalog = Depends(get_rendered_catalog)):
+    return rendered_json(rendered.traits, rendered)
 
 
 @app.get("/types/", response_model=List[schemas.TypeOut])
-def get_types(db: Session = Depends(get_db)):
-    return db.query(models.Type).all()
+def get_types(rendered: RenderedCatalog = Depends(get_rendered_catalog)):
+    return rendered_json(rendered.types, rendered)
 
 
 @app.get("/personalities/", response_model=List[schemas.PersonalityOut])
-def get_personalities(db: Session = Depends(get_db)):
-    return db.query(models.Personality).all()
+def get_personalities(rendered: RenderedCatalog = Depends(get_rendered_catalog)):
+    return rendered_json(rendered.personalities, rendered)
 
 
 @app.get("/magic_items/", response_model=List[schemas.MagicItemOut])
-def get_magic_items(db: Session = Depends(get_db)):
-    return db.query(models.MagicItem).all()
+def get_magic_items(rendered: RenderedCatalog = Depends(get_rendered_catalog)):
+    return rendered_json(rendered.magic_items, rendered)
 
 
 @app.get("/game_terms/", response_model=List[schemas.GameTermOut])
-def get_game_terms(db: Session = Depends(get_db)):
-    return db.query(models.GameTerm).all()
+def get_game_terms(rendered: RenderedCatalog = Depends(get_rendered_catalog)):
+    return rendered_json(rendered.game_terms, rendered)
 
 
 @app.get("/species/", response_model=List[schemas.MonsterSpeciesOut])
-def get_species(db: Session = Depends(get_db)):
-    return db.query(models.MonsterSpecies).all()
+def get_species(rendered: RenderedCatalog = Depends(get_rendered_catalog)):
+    return rendered_json(rendered.species, rendered)
+
+
+@app.get("/search/autocomplete", response_model=List[schemas.AutocompleteOut])
+def autocomplete(
+    q: str = Query(..., min_length=1, max_length=50),
+    kind: Optional[str] = Query(None, pattern="^(monster|move)$"),
+    limit: int = Query(10, ge=1, le=50),
+    catalog: GameCatalog = Depends(catalog_cache),
+):
+    # Ranked monster/move name matches (English and zh), typo-tolerant for 3+ characters
+    kinds = (kind,) if kind else ("monster", "move")
+    return [
+        schemas.AutocompleteOut(
+            kind=k,
+            id=entry.id,
+            name=entry.name,
+            form=entry.form if k == "monster" else None,
+            localized=entry.localized,
+            matched=match.field,
+            fuzzy=match.rank == FUZZY,
+        )
+        for k, entry, match in catalog.autocomplete(q, kinds, limit)
+    ]
 
 
 @app.get("/teams/", response_model=List[schemas.TeamOut])
@@ -580,6 +223,62 @@ def list_teams(db: Session = Depends(get_db)):
         .all()
     )
 
+def encode_team_cursor(updated_at, team_id: int) -> str:
+    raw = json.dumps([updated_at.isoformat(), team_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_team_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        updated_at, team_id = json.loads(raw)
+        return datetime.fromisoformat(updated_at), int(team_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@app.get("/teams/summary", response_model=schemas.TeamSummaryPageOut)
+def list_team_summaries(
+    db: Session = Depends(get_db),
+    catalog: GameCatalog = Depends(get_catalog),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+):
+    # Newest first, keyset on (updated_at, id); monster and item names come from the catalog
+    monster_ids = func.array_agg(
+        aggregate_order_by(models.UserMonster.monster_id, models.UserMonster.id)
+    ).filter(models.UserMonster.id.isnot(None))
+    query = (
+        select(
+            models.Team.id,
+            models.Team.name,
+            models.Team.magic_item_id,
+            models.Team.created_at,
+            models.Team.updated_at,
+            monster_ids.label("monster_ids"),
+        )
+        .outerjoin(models.UserMonster, models.UserMonster.team_id == models.Team.id)
+        .group_by(models.Team.id)
+        .order_by(models.Team.updated_at.desc(), models.Team.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        query = query.where(tuple_(models.Team.updated_at, models.Team.id) < decode_team_cursor(cursor))
+    rows = db.execute(query).all()
+
+    page = rows[:limit]
+    items = [
+        schemas.TeamSummaryOut(
+            id=row.id,
+            name=row.name,
+            monsters=[catalog.monsters[i] for i in row.monster_ids or [] if i in catalog.monsters],
+            magic_item=catalog.magic_items.get(row.magic_item_id),
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+        for row in page
+    ]
+    next_cursor = encode_team_cursor(page[-1].updated_at, page[-1].id) if len(rows) > limit else None
+    return schemas.TeamSummaryPageOut(items=items, next_cursor=next_cursor)
+
 @app.get("/teams/{team_id}", response_model=schemas.TeamOut)
 def get_team(team_id: int, db: Session = Depends(get_db)):
     db_team = (
@@ -644,242 +343,272 @@ def create_team(team: schemas.TeamCreate, db: Session = Depends(get_db)):
     db.refresh(db_team)
     return db_team
 
-# -------- Analyze Team (Inline) --------
-
-@app.post("/team/analyze/", response_model=schemas.TeamAnalysisOut)
-async def analyze_team(req: schemas.TeamAnalyzeInlineRequest, db: Session = Depends(get_db)):
-    start_time = time.time()
-    
-    team_data = req.team  # This is TeamCreate (with 6 UserMonsterCreate)
-    
-    # --- Helper: Call LLM and Parse Result ---
-    async def call_llm(prompt: str):
-        try:
-            resp = await client.aio.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json"
-                ),
-            )
-            return json.loads(resp.text)
-        except Exception as e:
-            print("LLM error:", e)
-            return {"synergy_moves": [], "recommendation": ["Error generating analysis."]}
-    
-    # === EFFICIENT DATA LOADING ===
-    print("Start loading data for analysis...")
-    monster_ids_to_load = {um.monster_id for um in team_data.user_monsters}
-    monster_db_map = {m.id: m for m in db.query(models.Monster).filter(models.Monster.id.in_(monster_ids_to_load)).all()}
-    print("Loaded monsters:", len(monster_db_map))
-    
-    print("Loading moves...")
-    move_ids_to_load = set()
-    for um in team_data.user_monsters:
-        move_ids_to_load.update([um.move1_id, um.move2_id, um.move3_id, um.move4_id])
-    move_db_map = {m.id: m for m in db.query(models.Move).filter(models.Move.id.in_(move_ids_to_load)).all()}
-    print("Loaded moves:", len(move_db_map))
-    
-    print("Loading traits...")
-    trait_ids_to_load = {m.trait_id for m in monster_db_map.values()}
-    trait_db_map = {t.id: t for t in db.query(models.Trait).filter(models.Trait.id.in_(trait_ids_to_load)).all()}
-    print("Loaded traits:", len(trait_db_map))
-
-    print("Loading types...")
-    type_db_map = {
-        t.id: t
-        for t in db.query(models.Type)
-        .options(
-            joinedload(models.Type.effective_against),
-            joinedload(models.Type.weak_against),
-        )
-        .all()
-    }
-    print("Loaded types:", len(type_db_map))
-    
-    print("Loading personalities...")
-    personality_ids_to_load = {um.personality_id for um in team_data.user_monsters}
-    personality_db_map = {p.id: p for p in db.query(models.Personality).filter(models.Personality.id.in_(personality_ids_to_load)).all()}
-    print("Loaded personalities:", len(personality_db_map))
-
-    print("Loading magic item and game terms...")
-    if not team_data.magic_item_id:
-        raise HTTPException(status_code=400, detail="Magic item is required to analyze a team.")
-    magic_item = (db.query(models.MagicItem).filter(models.MagicItem.id == team_data.magic_item_id).first())
-    game_terms = db.query(models.GameTerm).all()
-    print("Loaded game terms:", len(game_terms))
-    
-    print("Finish loading data for analysis!")
-
-    # === CONCURRENT LLM ANALYSIS ===
-    print("Start creating prompt for LLM analysis...")
-    llm_tasks = []
-    for um in team_data.user_monsters:
-        base_monster = monster_db_map[um.monster_id]
-        trait = trait_db_map[base_monster.trait_id]
-        selected_moves = [move_db_map[um.move1_id], move_db_map[um.move2_id], move_db_map[um.move3_id], move_db_map[um.move4_id]]
-        preferred_attack_style = getattr(base_monster, "preferred_attack_style", "Both")
-        prompt = build_trait_synergy_prompt(base_monster, trait, selected_moves, preferred_attack_style, game_terms)
-        llm_tasks.append(call_llm(prompt))
-    llm_results = await asyncio.gather(*llm_tasks)
-        
-    print("Finish creating prompt for LLM analysis!")
-
-    # Build UserMonsterOuts and compute per-monster analysis
-    print("Start per-monster analysis...")
-    user_monster_outs = []
-    per_monster_analysis = []
-    for i, um in enumerate(team_data.user_monsters):
-        base_monster = monster_db_map[um.monster_id]
-        personality = personality_db_map[um.personality_id]
-        legacy_type = type_db_map[um.legacy_type_id]
-        trait = trait_db_map[base_monster.trait_id]
-        move1 = move_db_map[um.move1_id]
-        move2 = move_db_map[um.move2_id]
-        move3 = move_db_map[um.move3_id]
-        move4 = move_db_map[um.move4_id]
-        selected_moves = [move1, move2, move3, move4]
-        talent = um.talent
-        llm_result = llm_results[i]
-        
-        # Map move names to ids for schema output
-        move_name_to_id = {m.name: m.id for m in selected_moves}
-        synergy_moves = [move_name_to_id[name] for name in llm_result.get("synergy_moves", []) if name in move_name_to_id]
-
-        trait_synergy_finding = schemas.TraitSynergyFinding(
-            monster_id=base_monster.id,
-            trait=schemas.TraitOut.model_validate(trait),
-            synergy_moves=synergy_moves,
-            recommendation=llm_result.get("recommendation", [])
-        )
-            
-        # Call the top-level helper functions
-        effective_stats = compute_effective_stats(base_monster, personality, talent)
-        energy_profile = compute_energy_profile(selected_moves)
-        counter_coverage = compute_counter_coverage(selected_moves)
-        defense_status_move = compute_defense_status_move(selected_moves)
-
-        # Build UserMonsterOut
-        def to_monster_lite_out(monster, type_db_map):
-            return schemas.MonsterLiteOut(
-                id=monster.id,
-                name=monster.name,
-                form=monster.form,
-                main_type=schemas.TypeOut(**type_db_map[monster.main_type_id].__dict__),
-                sub_type=schemas.TypeOut(**type_db_map[monster.sub_type_id].__dict__) if monster.sub_type_id else None,
-                leader_potential=getattr(monster, "leader_potential", False),
-                is_leader_form=monster.is_leader_form,
-                preferred_attack_style = getattr(monster, "preferred_attack_style", "Both"),
-                localized=monster.localized
-            )
-
-        user_monster_out = schemas.UserMonsterOut(
-            id=i,
-            monster=to_monster_lite_out(base_monster, type_db_map),
-            personality=schemas.PersonalityOut(**personality.__dict__),
-            legacy_type=schemas.TypeOut(**legacy_type.__dict__),
-            move1=schemas.MoveOut(**move1.__dict__),
-            move2=schemas.MoveOut(**move2.__dict__),
-            move3=schemas.MoveOut(**move3.__dict__),
-            move4=schemas.MoveOut(**move4.__dict__),
-            talent=schemas.TalentOut(id=i, **talent.model_dump()),
-        )
-        
-        user_monster_outs.append(user_monster_out)
-
-        # Build MonsterAnalysisOut
-        monster_analysis = schemas.MonsterAnalysisOut(
-            user_monster=user_monster_out,
-            effective_stats=effective_stats,
-            energy_profile=energy_profile,
-            counter_coverage=counter_coverage,
-            defense_status_move=defense_status_move,
-            trait_synergies=[trait_synergy_finding]
-        )
-        per_monster_analysis.append(monster_analysis)
-        
-    print("Finish per-monster analysis!")
-
-    # Call the top-level helper functions
-    print("Start team-level analysis...")
-    type_coverage = compute_type_coverage(team_data.user_monsters, move_db_map, monster_db_map, type_db_map)
-    magic_item_eval_dict = compute_magic_item_eval(magic_item, user_monster_outs, type_db_map)
-    magic_item_out = schemas.MagicItemOut(**magic_item.__dict__)
-    magic_item_eval = schemas.MagicItemEvaluation(
-        chosen_item=magic_item_out,
-        valid_targets=magic_item_eval_dict["valid_targets"],
-        best_target_monster_id=magic_item_eval_dict.get("best_target_monster_id"),
-        reasoning=magic_item_eval_dict.get("reasoning"),
+# -------- Batch Effective Stats --------
+
+@app.post("/stats/batch", response_model=schemas.StatBatchOut)
+def compute_stats_batch(req: schemas.StatBatchRequest, catalog: GameCatalog = Depends(get_catalog)):
+    monster_ids = [item.monster_id for item in req.items]
+    personality_ids = [item.personality_id for item in req.items]
+    missing_monsters = sorted(set(monster_ids) - catalog.monsters.keys())
+    if missing_monsters:
+        raise HTTPException(status_code=404, detail=f"Monsters not found: {missing_monsters}")
+    missing_personalities = sorted(set(personality_ids) - catalog.personalities.keys())
+    if missing_personalities:
+        raise HTTPException(status_code=404, detail=f"Personalities not found: {missing_personalities}")
+
+    stats = catalog.stat_tables.compute(monster_ids, personality_ids, talent_matrix(item.talent for item in req.items))
+    return schemas.StatBatchOut(
+        stats=[schemas.EffectiveStats(**dict(zip(STAT_FIELDS, row))) for row in stats.tolist()]
     )
 
-    recs_struct = generate_recommendations(
-        per_monster_analysis,
-        type_coverage,
-        magic_item_eval,
-        move_db_map,
-        type_db_map
+# -------- Team Search --------
+
+# Lineups minimizing team_weak_to, then maximizing move-pool coverage (CPU-bound, so a
+# plain def that runs in the threadpool)
+@app.post("/team/search", response_model=schemas.TeamSearchOut)
+def search_teams(req: schemas.TeamSearchRequest, catalog: GameCatalog = Depends(get_catalog)):
+    missing = sorted({mid for mid in req.must_include if mid not in catalog.monsters})
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Monsters not found: {missing}")
+    if len(set(req.must_include)) != len(req.must_include):
+        raise HTTPException(status_code=400, detail="must_include contains duplicate monsters")
+
+    search = TeamSearch(
+        catalog.type_chart,
+        catalog.monsters.values(),
+        must_include=[catalog.monsters[mid] for mid in req.must_include],
+        leader_forms=req.leader_forms,
+        min_physical=req.min_physical,
+        min_magic=req.min_magic,
+        limit=req.limit,
     )
+    results = search.run()
+    return schemas.TeamSearchOut(
+        results=[schemas.TeamSearchResultOut.model_validate(r) for r in results],
+        nodes=search.nodes,
+    )
+
+# -------- Moveset Optimizer --------
 
-    team_out = schemas.TeamOut(
-        id=0,
-        name=team_data.name,
-        user_monsters=user_monster_outs,
-        magic_item=magic_item_out,
+# Best 4-move sets from a monster's move pool plus its legacy move for the chosen legacy type
+@app.post("/moveset/optimize", response_model=schemas.MovesetOptimizeOut)
+def optimize_moveset(req: schemas.MovesetOptimizeRequest, catalog: GameCatalog = Depends(get_catalog)):
+    monster = catalog.monsters.get(req.monster_id)
+    if not monster:
+        raise HTTPException(status_code=404, detail="Monster not found")
+    legacy_type_id = req.legacy_type_id or monster.default_legacy_type_id
+    if legacy_type_id not in catalog.types:
+        raise HTTPException(status_code=404, detail="Type not found")
+    if req.min_defense_status > req.max_defense_status:
+        raise HTTPException(status_code=400, detail="min_defense_status is greater than max_defense_status")
+
+    pool = list(monster.move_pool)
+    legacy = catalog.legacy_moves.get((monster.id, legacy_type_id))
+    if legacy:
+        pool.append(catalog.moves[legacy.move_id])
+
+    optimizer = MovesetOptimizer(
+        pool,
+        catalog.type_chart,
+        coverage=req.goals.coverage,
+        energy=req.goals.energy,
+        counters=req.goals.counters,
+        defense_status=req.goals.defense_status,
+        min_defense_status=req.min_defense_status,
+        max_defense_status=req.max_defense_status,
+        max_avg_energy=req.max_avg_energy,
+        limit=req.limit,
+    )
+    results = []
+    for r in optimizer.run():
+        results.append(schemas.MovesetOut(
+            move_ids=[m.id for m in r.moves],
+            alternatives=r.alternatives,
+            score=r.score,
+            effective_against_types=r.effective_against_types,
+            energy_profile=compute_energy_profile(r.moves),
+            counter_coverage=compute_counter_coverage(r.moves),
+            defense_status_move=compute_defense_status_move(r.moves),
+        ))
+    return schemas.MovesetOptimizeOut(
+        monster_id=monster.id,
+        legacy_type_id=legacy_type_id,
+        legacy_move_id=legacy.move_id if legacy else None,
+        results=results,
+        nodes=optimizer.nodes,
     )
-    result = schemas.TeamAnalysisOut(
-        team=team_out,
-        per_monster=per_monster_analysis,
-        type_coverage=type_coverage,
-        magic_item_eval=magic_item_eval,
-        recommendations=[r.message for r in recs_struct],
-        recommendations_structured=recs_struct,
+
+# -------- Reload Catalog --------
+
+# Rebuild the in-memory catalog after the import scripts have run
+@app.post("/catalog/reload/")
+def reload_catalog(request: Request, db: Session = Depends(get_db)):
+    request.app.state.catalog = GameCatalog.load(db)
+    request.app.state.rendered_catalog = RenderedCatalog(request.app.state.catalog)
+    return {"message": "Catalog reloaded"}
+
+# -------- Metrics --------
+
+# Pool state, checkout waits and query latencies per engine (async, so it answers even
+# when the threadpool is saturated)
+@app.get("/metrics/db")
+async def get_db_metrics():
+    return {"engines": db_metrics.snapshot()}
+
+# Prometheus text exposition: request stage histograms and DB pool/query metrics
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    lines = prometheus_stage_lines() + db_metrics.prometheus_lines() + llm_dispatcher.prometheus_lines()
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+def json_model_response(model) -> Response:
+    # Serialize once here (timed) instead of re-validating through the response_model
+    with span("serialization"):
+        body = model.model_dump_json()
+    return Response(content=body, media_type="application/json")
+
+# -------- Analyze Team (Inline) --------
+
+@app.post("/team/analyze/", response_model=schemas.TeamAnalysisOut)
+async def analyze_team(
+    req: schemas.TeamAnalyzeInlineRequest,
+    db: AsyncSession = Depends(get_async_db),
+    catalog: GameCatalog = Depends(get_catalog),
+):
+    return json_model_response(await analyze_team_data(req.team, db, catalog, request_deadline(), req.synergy_mode))
+
+async def analyze_team_data(team_data, db: AsyncSession, catalog: GameCatalog, deadline: Optional[float],
+                            synergy_mode: schemas.SynergyMode = "per_monster"):
+    # Stages are timed by spans: per_monster, type_coverage, magic_item, llm, recommendations
+    draft = prepare_team_analysis(team_data, catalog)
+
+    # Cached results (memory, then DB) are reused; only misses go to the LLM, and
+    # replies that miss the request's deadline are left out (incomplete_synergies)
+    llm_results = await run_trait_synergy(draft.synergy_requests, db, deadline=deadline, mode=synergy_mode)
+    return finalize_team_analysis(draft, llm_results, catalog)
+
+# -------- Analyze Team (Server-Sent Events) --------
+
+def sse_event(event: str, model) -> str:
+    return f"event: {event}\ndata: {model.model_dump_json()}\n\n"
+
+# Same analysis as /team/analyze/, streamed as it becomes available:
+#   analysis         deterministic sections (trait_synergies still empty)
+#   trait_synergy    one per monster, in completion order ({slot, finding})
+#   recommendations  once all synergies are in or the deadline has passed
+#   done / error
+@app.post("/team/analyze/stream")
+async def analyze_team_stream(
+    req: schemas.TeamAnalyzeInlineRequest,
+    catalog: GameCatalog = Depends(get_catalog),
+):
+    # Validation errors surface as normal HTTP errors before the stream starts
+    deadline = request_deadline()
+    draft = prepare_team_analysis(req.team, catalog)
+
+    async def events():
+        yield sse_event("analysis", schemas.TeamAnalysisPartialOut(
+            team=draft.team_out,
+            per_monster=draft.per_monster,
+            type_coverage=draft.type_coverage,
+            magic_item_eval=draft.magic_item_eval,
+        ))
+        # Dependency-scoped sessions are closed before the body is sent, so open our own
+        async with AsyncSessionLocal() as db:
+            llm_results = [None] * len(draft.synergy_requests)
+            try:
+                async for slot, llm_result in iter_trait_synergy(draft.synergy_requests, db, deadline=deadline,
+                                                              mode=req.synergy_mode):
+                    llm_results[slot] = llm_result
+                    finding = build_trait_synergy_finding(draft.synergy_requests[slot], llm_result)
+                    yield sse_event("trait_synergy", schemas.TraitSynergyEvent(slot=slot, finding=finding))
+            except Exception as e:
+                logger.exception("Stream analysis failed")
+                yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+                return
+        result = finalize_team_analysis(draft, llm_results, catalog)
+        yield sse_event("recommendations", schemas.TeamRecommendationsOut(
+            recommendations=result.recommendations,
+            recommendations_structured=result.recommendations_structured,
+            incomplete_synergies=result.incomplete_synergies,
+        ))
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    
-    print("Finish team-level analysis!")
-    elapsed = time.time() - start_time
-    print(f"POST /team/analyze took {elapsed:.3f} seconds")
-    return result
+
+# Load Teams with their UserMonsters and Talents up front (no lazy loads on an async session)
+async def load_teams_for_analysis(db: AsyncSession, team_ids):
+    with span("db_load"):
+        rows = (await db.execute(
+            select(models.Team)
+            .options(selectinload(models.Team.user_monsters).selectinload(models.UserMonster.talent))
+            .where(models.Team.id.in_(set(team_ids)))
+        )).scalars().all()
+    return {t.id: t for t in rows}
 
 # -------- Analyze Team by ID --------
 
 @app.post("/team/analyze_by_id/", response_model=schemas.TeamAnalysisOut)
-async def analyze_team_by_id(req: schemas.TeamAnalyzeByIdRequest, db: Session = Depends(get_db)):
-    # Load the Team, its UserMonsters, Talents, etc. from the DB
-    db_team = db.query(models.Team).filter(models.Team.id == req.team_id).first()
+async def analyze_team_by_id(
+    req: schemas.TeamAnalyzeByIdRequest,
+    db: AsyncSession = Depends(get_async_db),
+    catalog: GameCatalog = Depends(get_catalog),
+):
+    deadline = request_deadline()
+    db_team = (await load_teams_for_analysis(db, [req.team_id])).get(req.team_id)
     if not db_team:
         raise HTTPException(status_code=404, detail="Team not found")
+    # The loaded rows feed the analysis directly (no TeamCreate rebuild and re-validation)
+    return json_model_response(await analyze_team_data(db_team, db, catalog, deadline, req.synergy_mode))
 
-    # Build TeamCreate-like dict from DB objects
-    user_monsters = []
-    for um in db_team.user_monsters:
-        talent = db.query(models.Talent).filter(models.Talent.monster_instance_id == um.id).first()
-        user_monsters.append(
-            schemas.UserMonsterCreate(
-                monster_id=um.monster_id,
-                personality_id=um.personality_id,
-                legacy_type_id=um.legacy_type_id,
-                move1_id=um.move1_id,
-                move2_id=um.move2_id,
-                move3_id=um.move3_id,
-                move4_id=um.move4_id,
-                talent=schemas.TalentIn(
-                    hp_boost=talent.hp_boost,
-                    phy_atk_boost=talent.phy_atk_boost,
-                    mag_atk_boost=talent.mag_atk_boost,
-                    phy_def_boost=talent.phy_def_boost,
-                    mag_def_boost=talent.mag_def_boost,
-                    spd_boost=talent.spd_boost
-                ),
-            )
-        )
-    team_data = schemas.TeamCreate(
-        name=db_team.name,
-        user_monsters=user_monsters,
-        magic_item_id=db_team.magic_item_id
-    )
-    # Wrap as a TeamAnalyzeInlineRequest and call analysis logic
-    inline_req = schemas.TeamAnalyzeInlineRequest(team=team_data)
-    return await analyze_team(inline_req, db)
+# -------- Analyze Teams (Batch) --------
+
+@app.post("/team/analyze/batch", response_model=schemas.TeamAnalyzeBatchOut)
+async def analyze_team_batch(
+    req: schemas.TeamAnalyzeBatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    catalog: GameCatalog = Depends(get_catalog),
+):
+    # Bulk jobs run at LLM_BATCH_CONCURRENCY, far longer than one interactive request's budget
+    deadline = request_deadline(LLM_BATCH_DEADLINE_MS)
+    # One query for every saved team; static data comes from the catalog
+    saved_teams = await load_teams_for_analysis(db, [it.team_id for it in req.items if it.team_id is not None])
+
+    results = []
+    drafts = []  # (result index, draft)
+    for item in req.items:
+        result = schemas.TeamAnalyzeBatchResult(team_id=item.team_id)
+        results.append(result)
+        if item.team is None and item.team_id not in saved_teams:
+            result.error = "Team not found"
+            continue
+        try:
+            team_data = item.team or saved_teams[item.team_id]
+            drafts.append((len(results) - 1, prepare_team_analysis(team_data, catalog)))
+        except HTTPException as e:
+            result.error = e.detail
+        except KeyError as e:
+            result.error = f"Unknown id: {e.args[0]}"
+        except ValidationError as e:
+            result.error = f"Invalid saved team: {e.errors()[0]['msg']}"
+
+    # All teams' prompts go out together: identical prompts share one call (and one
+    # cache entry), with a bounded number of calls in flight, all within the batch deadline
+    synergy_requests = [r for _, draft in drafts for r in draft.synergy_requests]
+    llm_results = await run_trait_synergy(synergy_requests, db, max_concurrency=LLM_BATCH_CONCURRENCY,
+                                          deadline=deadline)
+
+    offset = 0
+    for index, draft in drafts:
+        n = len(draft.synergy_requests)
+        results[index].analysis = finalize_team_analysis(draft, llm_results[offset:offset + n], catalog)
+        offset += n
+
+    return json_model_response(schemas.TeamAnalyzeBatchOut(results=results))
 
 # -------- PUT Team (Update) --------
 
@@ -244,6 +244,9 @@ class UserMonster(Base):
     move3_id: Mapped[int] = mapped_column(Integer, ForeignKey("moves.id"))
     move4_id: Mapped[int] = mapped_column(Integer, ForeignKey("moves.id"))
     team_id: Mapped[int] = mapped_column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=True)
+    __table_args__ = (
+        Index("ix_user_monsters_team_id", "team_id"),
+    )
     # Relationships
     monster = relationship("Monster", back_populates="user_monsters")
     personality = relationship("Personality", back_populates="user_monsters")
@@ -267,7 +270,39 @@ class Team(Base):
                         server_default=text("timezone('utc', now())"),
                         onupdate=text("timezone('utc', now())"),
                         nullable=False)
+    # Keyset pagination of the team list (newest first)
+    __table_args__ = (
+        Index("ix_teams_updated_at_id", "updated_at", "id"),
+    )
 
     # Relationships
-    user_monsters = relationship("UserMonster", back_populates="team", cascade="all, delete-orphan")
-    magic_item = relationship("MagicItem")
\ No newline at end of file
+    user_monsters = relationship("UserMonster", back_populates="team", cascade="all, delete-orphan",
+                                 order_by="UserMonster.id")
+    magic_item = relationship("MagicItem")
+
+# Cached trait-synergy LLM results, keyed by monster/trait/moves/style/prompt-template hash
+class TraitSynergyCacheEntry(Base):
+    __tablename__ = "trait_synergy_cache"
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    monster_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    trait_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    move_ids: Mapped[str] = mapped_column(String(64), nullable=False)  # sorted, comma-separated
+    preferred_attack_style: Mapped[str] = mapped_column(String(16), nullable=False)
+    template_hash: Mapped[str] = mapped_column(String(16), nullable=False)
+    result: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True),
+                        server_default=text("timezone('utc', now())"),
+                        nullable=False)
+    __table_args__ = (
+        Index("ix_trait_synergy_cache_monster_id", "monster_id"),
+    )
+
+# Content hashes of the last imported backend/data/*.json files, for incremental imports
+class ImportManifest(Base):
+    __tablename__ = "import_manifest"
+    source: Mapped[str] = mapped_column(String(64), primary_key=True)  # JSON file name
+    file_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    record_hashes: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)  # record key -> hash
+    imported_at = Column(DateTime(timezone=True),
+                         server_default=text("timezone('utc', now())"),
+                         nullable=False)
\ No newline at end of file
@@ -0,0 +1,196 @@
+import heapq
+from typing import Dict, List, Optional, Sequence, Tuple
+from backend import models
+from backend.team_search import ATTACK_CATEGORIES
+
+MOVESET_SIZE = 4
+DEFENSE_STATUS_CATEGORIES = {models.MoveCategory.DEFENSE, models.MoveCategory.STATUS}
+
+# Counter flags, same categories as compute_counter_coverage
+COUNTER_ATTACK = 1   # attack move that counters status
+COUNTER_DEFENSE = 2  # defense move that counters attacks
+COUNTER_STATUS = 4   # status move that counters defense
+
+# === Moveset optimizer ===
+# Each candidate move is reduced to a feature vector:
+#   offense  - coverable types its type hits super-effectively (damaging moves only)
+#   counter  - counter flag it sets (see compute_counter_coverage)
+#   defense_status - 1 for defense/status moves (see compute_defense_status_move)
+#   energy   - energy cost (averaged as in compute_energy_profile)
+# and a moveset scores
+#   coverage * |offense| - energy * avg cost + counters * |counter flags| + defense_status * count
+
+def move_features(move, type_chart) -> Tuple[int, int, int, int]:
+    offense = type_chart.offensive_mask([move.move_type_id]) if move.move_category in ATTACK_CATEGORIES else 0
+    counter = 0
+    if move.has_counter:
+        if move.move_category in ATTACK_CATEGORIES:
+            counter = COUNTER_ATTACK
+        elif move.move_category == models.MoveCategory.DEFENSE:
+            counter = COUNTER_DEFENSE
+        elif move.move_category == models.MoveCategory.STATUS:
+            counter = COUNTER_STATUS
+    defense_status = int(move.move_category in DEFENSE_STATUS_CATEGORIES)
+    return offense, counter, defense_status, move.energy_cost
+
+class MovesetResult:
+    def __init__(self, moves, alternatives, score, effective_against_types):
+        self.moves = moves
+        self.alternatives = alternatives
+        self.score = score
+        self.effective_against_types = effective_against_types
+
+class MovesetOptimizer:
+    """Best `limit` 4-move sets from a pool by branch-and-bound.
+
+    Moves with identical feature vectors form one class (a set may still take several
+    members of a class); a branch is cut once the sum of per-goal optimistic bounds
+    cannot beat the current limit-th best score.
+    """
+
+    def __init__(self, moves: Sequence, type_chart, coverage: float = 1.0, energy: float = 1.0,
+                 counters: float = 1.0, defense_status: float = 0.0, min_defense_status: int = 0,
+                 max_defense_status: int = MOVESET_SIZE, max_avg_energy: Optional[float] = None,
+                 limit: int = 10):
+        self.type_chart = type_chart
+        self.w_coverage = coverage
+        self.w_energy = energy
+        self.w_counters = counters
+        self.w_defense_status = defense_status
+        self.min_defense_status = min_defense_status
+        self.max_defense_status = max_defense_status
+        self.max_energy_total = None if max_avg_energy is None else max_avg_energy * MOVESET_SIZE
+        self.limit = limit
+        self.nodes = 0
+
+        # Group interchangeable moves; classes that score well on their own first
+        classes: Dict[tuple, list] = {}
+        for move in {m.id: m for m in moves}.values():
+            classes.setdefault(move_features(move, type_chart), []).append(move)
+        for members in classes.values():
+            members.sort(key=lambda m: m.id)
+        ordered = sorted(classes.items(), key=lambda kv: (-self._single_score(kv[0]), kv[1][0].id))
+        self.classes = [members for _, members in ordered]
+        self.items = [(features, m) for features, members in ordered for m in members]
+        self.item_class = [ci for ci, (_, members) in enumerate(ordered) for _ in members]
+        n = len(self.items)
+
+        # Suffix aggregates for bounding: what is still reachable from item j onwards
+        self.suffix_offense = [0] * (n + 1)
+        self.suffix_counter = [0] * (n + 1)
+        self.suffix_defense_status = [0] * (n + 1)
+        self.suffix_cheapest: List[List[int]] = [[] for _ in range(n + 1)]  # up to 4 lowest costs, ascending
+        for j in range(n - 1, -1, -1):
+            (offense, counter, ds, cost), _ = self.items[j]
+            self.suffix_offense[j] = self.suffix_offense[j + 1] | offense
+            self.suffix_counter[j] = self.suffix_counter[j + 1] | counter
+            self.suffix_defense_status[j] = self.suffix_defense_status[j + 1] + ds
+            self.suffix_cheapest[j] = sorted(self.suffix_cheapest[j + 1] + [cost])[:MOVESET_SIZE]
+
+        self._best: List[tuple] = []
+        self._seq = 0
+
+    def _single_score(self, features) -> float:
+        offense, counter, ds, cost = features
+        return (self.w_coverage * offense.bit_count() - self.w_energy * cost / MOVESET_SIZE
+                + self.w_counters * counter.bit_count() + self.w_defense_status * ds)
+
+    def _score(self, offense, counter, ds, energy_total) -> float:
+        return (self.w_coverage * offense.bit_count() - self.w_energy * energy_total / MOVESET_SIZE
+                + self.w_counters * counter.bit_count() + self.w_defense_status * ds)
+
+    # ---- bounds ----
+    def _ds_range(self, j: int, slots: int, ds: int) -> Tuple[int, int]:
+        # Fewest and most defense/status moves any completion from item j on can end with
+        remaining = len(self.items) - j
+        most = ds + min(slots, self.suffix_defense_status[j])
+        least = ds + max(0, slots - (remaining - self.suffix_defense_status[j]))
+        return least, most
+
+    def _feasible(self, j: int, slots: int, ds: int, energy_total: int) -> bool:
+        if slots > len(self.items) - j:
+            return False
+        least, most = self._ds_range(j, slots, ds)
+        if most < self.min_defense_status or least > self.max_defense_status:
+            return False
+        if self.max_energy_total is not None and \
+                energy_total + sum(self.suffix_cheapest[j][:slots]) > self.max_energy_total:
+            return False
+        return True
+
+    def _bound(self, j: int, slots: int, offense, counter, ds, energy_total) -> float:
+        if not slots:
+            return self._score(offense, counter, ds, energy_total)
+        least, most = self._ds_range(j, slots, ds)
+        least, most = max(least, self.min_defense_status), min(most, self.max_defense_status)
+        best_ds = most if self.w_defense_status >= 0 else least
+        return self._score(
+            offense | self.suffix_offense[j],
+            counter | self.suffix_counter[j],
+            best_ds,
+            energy_total + sum(self.suffix_cheapest[j][:slots]),
+        )
+
+    def _worst_kept(self) -> Optional[float]:
+        if len(self._best) < self.limit:
+            return None
+        return self._best[0][0]
+
+    # ---- search ----
+    def _dfs(self, start, slots, offense, counter, ds, energy_total, picks):
+        self.nodes += 1
+        if slots == 0:
+            if not self.min_defense_status <= ds <= self.max_defense_status:
+                return
+            score = self._score(offense, counter, ds, energy_total)
+            worst = self._worst_kept()
+            if worst is None or score > worst:
+                self._seq += 1
+                entry = (score, -self._seq, list(picks))
+                if worst is None:
+                    heapq.heappush(self._best, entry)
+                else:
+                    heapq.heapreplace(self._best, entry)
+            return
+
+        for j in range(start, len(self.items)):
+            if j > start and self.item_class[j] == self.item_class[j - 1]:
+                continue  # an earlier member of this class was skipped, so this one must be too
+            if not self._feasible(j, slots, ds, energy_total):
+                break  # suffixes only shrink
+            worst = self._worst_kept()
+            if worst is not None and self._bound(j, slots, offense, counter, ds, energy_total) <= worst:
+                break
+            (m_offense, m_counter, m_ds, m_cost), _ = self.items[j]
+            child = (offense | m_offense, counter | m_counter, ds + m_ds, energy_total + m_cost)
+            if not self._feasible(j + 1, slots - 1, child[2], child[3]):
+                continue
+            if worst is not None and self._bound(j + 1, slots - 1, *child) <= worst:
+                continue
+            picks.append(j)
+            self._dfs(j + 1, slots - 1, *child, picks)
+            picks.pop()
+
+    def run(self) -> List[MovesetResult]:
+        self._best = []
+        self.nodes = 0
+        if self._feasible(0, MOVESET_SIZE, 0, 0):
+            self._dfs(0, MOVESET_SIZE, 0, 0, 0, 0, [])
+        return [self._result(score, picks) for score, _, picks in sorted(self._best, reverse=True)]
+
+    def _result(self, score: float, picks: List[int]) -> MovesetResult:
+        moves = [self.items[j][1] for j in picks]
+        chosen_ids = {m.id for m in moves}
+        alternatives = [
+            [m.id for m in self.classes[self.item_class[j]] if m.id not in chosen_ids] for j in picks
+        ]
+        offense = 0
+        for j in picks:
+            offense |= self.items[j][0][0]
+        type_ids = self.type_chart.type_ids.tolist()
+        return MovesetResult(
+            moves=moves,
+            alternatives=alternatives,
+            score=round(score, 4),
+            effective_against_types=[type_ids[i] for i in range(len(type_ids)) if (offense >> i) & 1],
+        )
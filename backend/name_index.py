@@ -0,0 +1,120 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# === N-gram name index ===
+# Every searchable field (English name, form, zh name, ...) is casefolded and split
+# into all of its 1-, 2- and 3-grams. A query looks up the posting lists of its own
+# grams (3-grams, or the whole query when it is shorter), intersects them and then
+# confirms the substring on the few candidates left, so matching is exactly the old
+# `term in field` check without scanning every entry. Short grams matter here: zh
+# names are usually two or three characters long.
+
+GRAM = 3
+
+# Match ranks, best first
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING, FUZZY = range(5)
+
+def _grams(text: str, n: int) -> Set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+def _query_grams(term: str) -> Set[str]:
+    return _grams(term, min(GRAM, len(term)))
+
+def _rank(term: str, field: str) -> Optional[int]:
+    if field == term:
+        return EXACT
+    if field.startswith(term):
+        return PREFIX
+    pos = field.find(term)
+    if pos < 0:
+        return None
+    if not field[pos - 1].isalnum():
+        return WORD_PREFIX
+    return SUBSTRING
+
+class NameMatch:
+    def __init__(self, entry_id: int, rank: int, field: str, field_index: int, similarity: float = 1.0):
+        self.entry_id = entry_id
+        self.rank = rank
+        self.field = field                # the original (not casefolded) text that matched
+        self.field_index = field_index    # position of that field in the entry's field list
+        self.similarity = similarity      # share of query trigrams found, only below 1 for fuzzy matches
+
+    @property
+    def sort_key(self):
+        return self.rank, -self.similarity, self.field_index, len(self.field), self.entry_id
+
+class NameIndex:
+    """Substring and fuzzy lookup over a few text fields per entry."""
+
+    def __init__(self, fields_by_id: Dict[int, Sequence[str]]):
+        self._fields: Dict[int, List[Tuple[str, str]]] = {}  # id -> [(original, casefolded)]
+        self._postings: Dict[str, Set[int]] = {}
+        for entry_id, fields in fields_by_id.items():
+            pairs = [(f, f.casefold()) for f in fields if f]
+            self._fields[entry_id] = pairs
+            for _, folded in pairs:
+                for n in range(1, GRAM + 1):
+                    for gram in _grams(folded, n):
+                        self._postings.setdefault(gram, set()).add(entry_id)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def _candidates(self, grams: Iterable[str]) -> Set[int]:
+        postings = sorted((self._postings.get(g, set()) for g in grams), key=len)
+        if not postings:
+            return set()
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def contains(self, term: str) -> Set[int]:
+        """Ids of entries with a field containing `term` (case-insensitive)."""
+        term = term.casefold()
+        if not term:
+            return set(self._fields)
+        return {
+            entry_id for entry_id in self._candidates(_query_grams(term))
+            if any(term in folded for _, folded in self._fields[entry_id])
+        }
+
+    def search(self, term: str, limit: Optional[int] = None, fuzzy: bool = True,
+               min_similarity: float = 0.5) -> List[NameMatch]:
+        """Ranked matches: exact, prefix, word prefix, substring, then (optionally) fuzzy.
+
+        Fuzzy matches contain at least `min_similarity` of the query's trigrams in one
+        field, which survives a typo or two; they only apply to queries of 3+ characters.
+        """
+        term = term.casefold()
+        if not term:
+            return []
+        matches: Dict[int, NameMatch] = {}
+        for entry_id in self._candidates(_query_grams(term)):
+            for i, (original, folded) in enumerate(self._fields[entry_id]):
+                rank = _rank(term, folded)
+                if rank is None:
+                    continue
+                match = NameMatch(entry_id, rank, original, i)
+                best = matches.get(entry_id)
+                if best is None or match.sort_key < best.sort_key:
+                    matches[entry_id] = match
+
+        if fuzzy and len(term) >= GRAM:
+            query = _grams(term, GRAM)
+            near: Set[int] = set()
+            for gram in query:
+                near |= self._postings.get(gram, set())
+            for entry_id in near - matches.keys():
+                best = None
+                for i, (original, folded) in enumerate(self._fields[entry_id]):
+                    similarity = len(query & _grams(folded, GRAM)) / len(query)
+                    if similarity >= min_similarity and (best is None or similarity > best.similarity):
+                        best = NameMatch(entry_id, FUZZY, original, i, similarity)
+                if best is not None:
+                    matches[entry_id] = best
+
+        ranked = sorted(matches.values(), key=lambda m: m.sort_key)
+        return ranked if limit is None else ranked[:limit]
@@ -194,11 +194,45 @@ class TeamOut(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+# Lightweight saved-team listing (GET /teams/summary)
+class TeamSummaryMonsterOut(BaseModel):
+    id: int  # monster id
+    name: str
+    form: str
+    localized: Dict
+
+    model_config = ConfigDict(from_attributes=True)
+
+class TeamSummaryMagicItemOut(BaseModel):
+    id: int
+    name: str
+    localized: Dict
+
+    model_config = ConfigDict(from_attributes=True)
+
+class TeamSummaryOut(BaseModel):
+    id: int
+    name: Optional[str] = None
+    monsters: List[TeamSummaryMonsterOut]
+    magic_item: Optional[TeamSummaryMagicItemOut] = None
+    created_at: datetime
+    updated_at: datetime
+
+class TeamSummaryPageOut(BaseModel):
+    items: List[TeamSummaryOut]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page; null on the last page
+
+# How trait-synergy analyses are requested: one LLM call per monster, or one call for
+# the whole team (falling back to per-monster calls for anything it gets wrong)
+SynergyMode = Literal["per_monster", "team"]
+
 class TeamAnalyzeByIdRequest(BaseModel):
     team_id: int
+    synergy_mode: SynergyMode = "per_monster"
 
 class TeamAnalyzeInlineRequest(BaseModel):
     team: TeamCreate
+    synergy_mode: SynergyMode = "per_monster"
 
 class EffectiveStats(BaseModel):
     hp: int
@@ -208,6 +242,17 @@ class EffectiveStats(BaseModel):
     mag_def: int
     spd: int
     
+class StatBatchItem(BaseModel):
+    monster_id: int
+    personality_id: int
+    talent: TalentIn
+
+class StatBatchRequest(BaseModel):
+    items: List[StatBatchItem] = Field(..., min_length=1, max_length=5000)
+
+class StatBatchOut(BaseModel):
+    stats: List[EffectiveStats]  # same order as the request items
+    
 class EnergyProfile(BaseModel):
     avg_energy_cost: float
     has_zero_cost_move: bool
@@ -231,6 +276,8 @@ class TraitSynergyFinding(BaseModel):
     trait: TraitOut
     synergy_moves: List[int] = Field(default_factory=list)
     recommendation: List[str] = Field(default_factory=list)
+    # "error": the LLM call failed (generic fallback text); "timeout": it missed the request's deadline
+    status: Literal["ok", "error", "timeout"] = "ok"
 
 class TypeCoverageReport(BaseModel):
     effective_against_types: List[int] = Field(default_factory=list)
@@ -268,9 +315,109 @@ class TeamAnalysisOut(BaseModel):
     magic_item_eval: MagicItemEvaluation
     recommendations: List[str] = Field(default_factory=list)
     recommendations_structured: List[RecItem] = Field(default_factory=list)
+    # per_monster slots whose trait synergy analysis is missing or degraded
+    incomplete_synergies: List[int] = Field(default_factory=list)
 
     model_config = ConfigDict(from_attributes=True)
     
+class TeamAnalyzeBatchItem(BaseModel):
+    # Exactly one of a saved team id or an inline team
+    team_id: Optional[int] = None
+    team: Optional[TeamCreate] = None
+
+    @model_validator(mode="after")
+    def check_one_source(self) -> "TeamAnalyzeBatchItem":
+        if (self.team_id is None) == (self.team is None):
+            raise ValueError("Provide exactly one of team_id or team")
+        return self
+
+class TeamAnalyzeBatchRequest(BaseModel):
+    items: List[TeamAnalyzeBatchItem] = Field(..., min_length=1, max_length=1000)
+
+class TeamAnalyzeBatchResult(BaseModel):
+    team_id: Optional[int] = None
+    analysis: Optional[TeamAnalysisOut] = None
+    error: Optional[str] = None  # set instead of analysis when this item could not be analyzed
+
+class TeamAnalyzeBatchOut(BaseModel):
+    results: List[TeamAnalyzeBatchResult]  # same order as the request items
+
+class TeamSearchRequest(BaseModel):
+    must_include: List[int] = Field(default_factory=list, max_length=6)  # monster ids
+    leader_forms: Optional[int] = Field(None, ge=0, le=6)  # exact number of leader-form monsters
+    min_physical: int = Field(0, ge=0, le=6)  # monsters preferring Physical (or Both)
+    min_magic: int = Field(0, ge=0, le=6)  # monsters preferring Magic (or Both)
+    limit: int = Field(5, ge=1, le=50)
+
+class TeamSearchResultOut(BaseModel):
+    monster_ids: List[int]
+    alternatives: List[List[int]]  # per slot, monsters with the same types, move-pool coverage and constraints
+    team_weak_to: List[int]
+    shared_weak_to: List[int]  # types 2+ members are weak to (tie-breaker)
+    effective_against_types: List[int]
+
+    model_config = ConfigDict(from_attributes=True)
+
+class TeamSearchOut(BaseModel):
+    results: List[TeamSearchResultOut]
+    nodes: int  # search nodes visited
+
+class MovesetGoals(BaseModel):
+    coverage: float = Field(1.0, ge=0)  # per coverable type hit super-effectively
+    energy: float = Field(1.0, ge=0)  # per point of average energy cost (lower is better)
+    counters: float = Field(1.0, ge=0)  # per counter category covered (attack/defense/status)
+    defense_status: float = 0.0  # per defense/status move; negative prefers fewer
+
+class MovesetOptimizeRequest(BaseModel):
+    monster_id: int
+    legacy_type_id: Optional[int] = None  # defaults to the monster's default legacy type
+    goals: MovesetGoals = Field(default_factory=MovesetGoals)
+    min_defense_status: int = Field(0, ge=0, le=4)
+    max_defense_status: int = Field(4, ge=0, le=4)
+    max_avg_energy: Optional[float] = Field(None, ge=0)
+    limit: int = Field(10, ge=1, le=100)
+
+class MovesetOut(BaseModel):
+    move_ids: List[int]
+    alternatives: List[List[int]]  # per move, pool moves with identical type, category, counter and cost
+    score: float
+    effective_against_types: List[int]
+    energy_profile: EnergyProfile
+    counter_coverage: CounterCoverage
+    defense_status_move: DefenseStatusMove
+
+class MovesetOptimizeOut(BaseModel):
+    monster_id: int
+    legacy_type_id: int
+    legacy_move_id: Optional[int] = None
+    results: List[MovesetOut]
+    nodes: int  # search nodes visited
+
+# Events of POST /team/analyze/stream (trait_synergies are empty in the first one)
+class TeamAnalysisPartialOut(BaseModel):
+    team: TeamOut
+    per_monster: List[MonsterAnalysisOut]
+    type_coverage: TypeCoverageReport
+    magic_item_eval: MagicItemEvaluation
+
+class TraitSynergyEvent(BaseModel):
+    slot: int  # index into per_monster
+    finding: TraitSynergyFinding
+
+class TeamRecommendationsOut(BaseModel):
+    recommendations: List[str] = Field(default_factory=list)
+    recommendations_structured: List[RecItem] = Field(default_factory=list)
+    incomplete_synergies: List[int] = Field(default_factory=list)
+
+class AutocompleteOut(BaseModel):
+    kind: Literal["monster", "move"]
+    id: int
+    name: str
+    form: Optional[str] = None  # monsters only
+    localized: Dict
+    matched: str   # the name/form/zh text that matched
+    fuzzy: bool    # no substring match, only similar spelling
+
 class TalentUpsert(BaseModel):
     hp_boost: int = 0
     phy_atk_boost: int = 0
@@ -0,0 +1,210 @@
+"""Offline benchmark for the team analysis pipeline.
+
+Builds the catalog from backend/data/*.json (no Postgres) and replaces the Gemini
+call with a stub of configurable latency, then times every stage of an analysis at
+several concurrency levels and prints JSON results.
+
+    python -m backend.scripts.benchmark_analysis --teams 64 --concurrency 1 8 32 \\
+        --llm-latency-ms 800 --output bench.json
+
+Run it with --synergy-mode team to compare one call per team against the default
+one call per monster (latency, and calls / prompt characters per level).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import time
+
+# The LLM client is created at import time; it is never called here
+os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+
+from backend import schemas, trait_synergy  # noqa: E402
+from backend.analysis import prepare_team_analysis, finalize_team_analysis  # noqa: E402
+from backend.catalog import GameCatalog  # noqa: E402
+from backend.game_data import DATA_DIR  # noqa: E402
+from backend.timing import collect_spans, span  # noqa: E402
+from backend.trait_synergy import TraitSynergyCache, run_trait_synergy  # noqa: E402
+
+STAGES = ["per_monster", "type_coverage", "magic_item", "llm", "recommendations", "serialization", "total"]
+MOVE_LINE = re.compile(r"^- (.+?):", re.M)
+SLOT_LINE = re.compile(r"^Slot (\d+):$", re.M)
+STUB_ADVICE = ["Open with the first synergy move.", "Follow up with the second.", "Favor utility."]
+
+class LLMUsage:
+    # Prompt volume sent to the stub, as a stand-in for token cost
+    def __init__(self):
+        self.calls = 0
+        self.prompt_chars = 0
+
+def make_llm_stub(latency_ms: float, jitter_ms: float, seed: int, usage: LLMUsage = None):
+    rng = random.Random(seed)
+
+    def move_names(block: str):
+        return MOVE_LINE.findall(block.split("Selected moves:")[1].split("Game Terms Glossary:")[0])
+
+    async def fake_generate_json(prompt: str):
+        if usage is not None:
+            usage.calls += 1
+            usage.prompt_chars += len(prompt)
+        await asyncio.sleep(max(0.0, latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000)
+        slots = SLOT_LINE.split(prompt)
+        if len(slots) > 1:
+            # Team prompt: [preamble, slot, block, slot, block, ...]
+            return [
+                {"slot": int(slot), "synergy_moves": move_names(block)[:2], "recommendation": STUB_ADVICE}
+                for slot, block in zip(slots[1::2], slots[2::2])
+            ]
+        return {"synergy_moves": move_names(prompt)[:2], "recommendation": STUB_ADVICE}
+
+    return fake_generate_json
+
+def random_teams(catalog: GameCatalog, count: int, seed: int):
+    rng = random.Random(seed)
+    monsters = [m for m in catalog.monsters.values() if len(m.move_pool) >= 4]
+    personalities = list(catalog.personalities)
+    magic_items = list(catalog.magic_items)
+    talent_fields = ["hp_boost", "phy_atk_boost", "mag_atk_boost", "phy_def_boost", "mag_def_boost", "spd_boost"]
+    teams = []
+    for n in range(count):
+        user_monsters = []
+        for m in rng.sample(monsters, 6):
+            moves = rng.sample(m.move_pool, 4)
+            boosted = rng.sample(talent_fields, 3)
+            user_monsters.append(schemas.UserMonsterCreate(
+                monster_id=m.id,
+                personality_id=rng.choice(personalities),
+                legacy_type_id=m.default_legacy_type_id,
+                move1_id=moves[0].id,
+                move2_id=moves[1].id,
+                move3_id=moves[2].id,
+                move4_id=moves[3].id,
+                talent=schemas.TalentIn(**{f: rng.choice([7, 8, 9, 10]) for f in boosted}),
+            ))
+        teams.append(schemas.TeamCreate(name=f"Bench {n}", user_monsters=user_monsters, magic_item_id=rng.choice(magic_items)))
+    return teams
+
+async def analyze_once(team: schemas.TeamCreate, catalog: GameCatalog, cache: TraitSynergyCache,
+                       synergy_mode: str = "per_monster"):
+    # Same phases as POST /team/analyze/, including its one-pass JSON serialization
+    with collect_spans() as spans:
+        start = time.perf_counter()
+        draft = prepare_team_analysis(team, catalog)
+        llm_results = await run_trait_synergy(draft.synergy_requests, None, cache, mode=synergy_mode)
+        result = finalize_team_analysis(draft, llm_results, catalog)
+        with span("serialization"):
+            result.model_dump_json()
+        spans["total"] = time.perf_counter() - start
+    return spans
+
+async def run_level(teams, catalog: GameCatalog, concurrency: int, warm_cache: bool, synergy_mode: str = "per_monster"):
+    # Cold runs use a fresh cache so every analysis pays for its LLM calls
+    cache = TraitSynergyCache()
+    if warm_cache:
+        for team in teams:
+            await analyze_once(team, catalog, cache, synergy_mode)
+    limit = asyncio.Semaphore(concurrency)
+
+    async def bounded(team):
+        async with limit:
+            return await analyze_once(team, catalog, cache, synergy_mode)
+
+    start = time.perf_counter()
+    samples = await asyncio.gather(*(bounded(team) for team in teams))
+    wall = time.perf_counter() - start
+    return samples, wall
+
+def summarize(values):
+    ms = sorted(v * 1000 for v in values)
+    if not ms:
+        return {"count": 0}
+    return {
+        "count": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p50_ms": round(ms[len(ms) // 2], 3),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+def run_benchmark(data_dir: str = DATA_DIR, teams: int = 32, concurrency=(1, 8, 32), llm_latency_ms: float = 800.0,
+                  llm_jitter_ms: float = 200.0, warm_cache: bool = False, repeat_catalog_load: int = 5, seed: int = 0,
+                  synergy_mode: str = "per_monster"):
+    catalog_loads = []
+    for _ in range(repeat_catalog_load):
+        start = time.perf_counter()
+        catalog = GameCatalog.from_json(data_dir)
+        catalog_loads.append(time.perf_counter() - start)
+
+    team_payloads = random_teams(catalog, teams, seed)
+    original_generate_json = trait_synergy.generate_json
+    levels = []
+    try:
+        for level in concurrency:
+            usage = LLMUsage()
+            trait_synergy.generate_json = make_llm_stub(llm_latency_ms, llm_jitter_ms, seed, usage)
+            samples, wall = asyncio.run(run_level(team_payloads, catalog, level, warm_cache, synergy_mode))
+            levels.append({
+                "concurrency": level,
+                "wall_s": round(wall, 4),
+                "teams_per_s": round(len(samples) / wall, 3) if wall else None,
+                "llm": {"calls": usage.calls, "prompt_chars": usage.prompt_chars},
+                "stages": {stage: summarize([s[stage] for s in samples if stage in s]) for stage in STAGES},
+            })
+    finally:
+        trait_synergy.generate_json = original_generate_json
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "data_dir": data_dir,
+            "teams": teams,
+            "llm_latency_ms": llm_latency_ms,
+            "llm_jitter_ms": llm_jitter_ms,
+            "warm_cache": warm_cache,
+            "synergy_mode": synergy_mode,
+            "seed": seed,
+            "catalog": {"monsters": len(catalog.monsters), "moves": len(catalog.moves)},
+        },
+        "catalog_load": summarize(catalog_loads),
+        "levels": levels,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark for the team analysis pipeline")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--teams", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=200.0)
+    parser.add_argument("--warm-cache", action="store_true", help="pre-fill the trait-synergy cache (measures cache hits)")
+    parser.add_argument("--synergy-mode", choices=["per_monster", "team"], default="per_monster",
+                        help="one LLM call per monster, or one per team")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(
+        data_dir=args.data_dir,
+        teams=args.teams,
+        concurrency=args.concurrency,
+        llm_latency_ms=args.llm_latency_ms,
+        llm_jitter_ms=args.llm_jitter_ms,
+        warm_cache=args.warm_cache,
+        seed=args.seed,
+        synergy_mode=args.synergy_mode,
+    )
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import enum
+import io
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import Column, Integer, MetaData, Table, text
+from sqlalchemy.engine import Engine
+
+# === Bulk writes for the import scripts ===
+# Rows are staged in a temporary table (COPY, or batched executemany when the driver
+# has no COPY support) and then written with one set-based statement, all inside a
+# single transaction per call. Staged rows keep their input order, so a fresh table
+# still gets its serial ids in file order.
+
+METHODS = ("copy", "executemany")
+
+def _table(table) -> Table:
+    # ORM model or Core table
+    return getattr(table, "__table__", table)
+
+def _copy_value(value) -> str:
+    # COPY text format: \N is NULL; backslash, tab and newlines are escaped
+    if value is None:
+        return r"\N"
+    if isinstance(value, enum.Enum):
+        value = value.name  # SQLAlchemy Enum columns store member names
+    elif isinstance(value, bool):
+        value = "t" if value else "f"
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False)
+    else:
+        value = str(value)
+    return (value.replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+class LoadStats:
+    def __init__(self, table: str, action: str, rows: int, seconds: float, method: str):
+        self.table = table
+        self.action = action
+        self.rows = rows
+        self.seconds = seconds
+        self.method = method
+
+class BulkLoader:
+    """Stages rows and writes them to one table per transaction, recording timings."""
+
+    def __init__(self, engine: Engine, method: str = "copy"):
+        if method not in METHODS:
+            raise ValueError(f"Unknown bulk load method '{method}', expected one of {METHODS}")
+        self.engine = engine
+        self.method = method
+        self.stats: List[LoadStats] = []
+
+    # ---- public API ----
+    def upsert(self, table, rows: Sequence[Dict], conflict: Sequence[str],
+               update: Optional[Sequence[str]] = None) -> None:
+        """INSERT ... ON CONFLICT (conflict) DO UPDATE the `update` columns (default: all others).
+
+        Rows repeating a conflict key are merged the way per-row upserts would leave
+        them: the first occurrence's position with the last occurrence's values.
+        """
+        table = _table(table)
+        rows = self._dedupe(rows, conflict)
+        columns = self._columns(rows)
+        if update is None:
+            update = [c for c in columns if c not in conflict]
+        action = f"DO UPDATE SET {', '.join(f'{_quote(c)} = EXCLUDED.{_quote(c)}' for c in update)}" \
+            if update else "DO NOTHING"
+        sql = (
+            f"INSERT INTO {_quote(table.name)} ({', '.join(map(_quote, columns))}) "
+            f"SELECT {', '.join(map(_quote, columns))} FROM {{stage}} ORDER BY _ord "
+            f"ON CONFLICT ({', '.join(map(_quote, conflict))}) {action}"
+        )
+        self._run(table, "upsert", rows, columns, [sql])
+
+    def replace(self, table, rows: Sequence[Dict]) -> None:
+        """Swap the whole table content for `rows`, e.g. association tables.
+
+        Rows repeating a primary key keep the first occurrence, like per-row ON CONFLICT DO NOTHING.
+        """
+        table = _table(table)
+        rows = self._dedupe(rows, [c.name for c in table.primary_key.columns], keep="first")
+        columns = self._columns(rows) or [c.name for c in table.columns]
+        self._run(table, "replace", rows, columns, [
+            f"DELETE FROM {_quote(table.name)}",
+            f"INSERT INTO {_quote(table.name)} ({', '.join(map(_quote, columns))}) "
+            f"SELECT {', '.join(map(_quote, columns))} FROM {{stage}} ORDER BY _ord",
+        ])
+
+    def update(self, table, rows: Sequence[Dict], key: Sequence[str]) -> None:
+        """UPDATE the non-key columns of existing rows matched on `key`."""
+        table = _table(table)
+        rows = self._dedupe(rows, key)
+        columns = self._columns(rows)
+        assignments = ", ".join(f"{_quote(c)} = s.{_quote(c)}" for c in columns if c not in key)
+        match = " AND ".join(f"t.{_quote(k)} = s.{_quote(k)}" for k in key)
+        self._run(table, "update", rows, columns, [
+            f"UPDATE {_quote(table.name)} AS t SET {assignments} FROM {{stage}} AS s WHERE {match}",
+        ])
+
+    def delete(self, table, rows: Sequence[Dict], key: Sequence[str]) -> None:
+        """DELETE the rows matched on `key` (only the key columns of `rows` are used)."""
+        table = _table(table)
+        rows = self._dedupe([{k: row[k] for k in key} for row in rows], key)
+        match = " AND ".join(f"t.{_quote(k)} = s.{_quote(k)}" for k in key)
+        self._run(table, "delete", rows, self._columns(rows), [
+            f"DELETE FROM {_quote(table.name)} AS t USING {{stage}} AS s WHERE {match}",
+        ])
+
+    def report(self) -> str:
+        lines = [f"{'table':<24} {'action':<8} {'rows':>7} {'ms':>9}  method"]
+        for s in self.stats:
+            lines.append(f"{s.table:<24} {s.action:<8} {s.rows:>7} {s.seconds * 1000:>9.1f}  {s.method}")
+        total = sum(s.seconds for s in self.stats)
+        lines.append(f"{'total':<24} {'':<8} {sum(s.rows for s in self.stats):>7} {total * 1000:>9.1f}")
+        return "\n".join(lines)
+
+    def print_report(self) -> None:
+        print(self.report())
+
+    # ---- internals ----
+    @staticmethod
+    def _columns(rows: Sequence[Dict]) -> List[str]:
+        return list(rows[0]) if rows else []
+
+    @staticmethod
+    def _dedupe(rows: Sequence[Dict], key: Sequence[str], keep: str = "last") -> List[Dict]:
+        merged: Dict[tuple, Dict] = {}
+        for row in rows:
+            k = tuple(row[c] for c in key)
+            if k not in merged:
+                merged[k] = dict(row)
+            elif keep == "last":
+                merged[k].update(row)
+        return list(merged.values())
+
+    def _run(self, table: Table, action: str, rows: List[Dict], columns: List[str], statements: List[str]):
+        start = time.perf_counter()
+        stage = f"_stage_{table.name}"
+        with self.engine.begin() as conn:
+            if columns:
+                conn.execute(text(
+                    f"CREATE TEMP TABLE {_quote(stage)} ON COMMIT DROP AS "
+                    f"SELECT {', '.join(map(_quote, columns))}, 0::integer AS _ord "
+                    f"FROM {_quote(table.name)} WITH NO DATA"
+                ))
+                method = self._stage_rows(conn, table, stage, rows, columns)
+                for sql in statements:
+                    conn.execute(text(sql.format(stage=_quote(stage))))
+            else:
+                method = self.method  # no rows: upsert/update/delete have nothing to do
+        self.stats.append(LoadStats(table.name, action, len(rows), time.perf_counter() - start, method))
+
+    def _stage_rows(self, conn, table: Table, stage: str, rows: List[Dict], columns: List[str]) -> str:
+        if not rows:
+            return self.method
+        cursor = conn.connection.driver_connection.cursor()
+        try:
+            if self.method == "copy" and hasattr(cursor, "copy_expert"):
+                buf = io.StringIO()
+                for i, row in enumerate(rows):
+                    buf.write("\t".join([_copy_value(row[c]) for c in columns] + [str(i)]))
+                    buf.write("\n")
+                buf.seek(0)
+                cursor.copy_expert(
+                    f"COPY {_quote(stage)} ({', '.join(map(_quote, columns))}, _ord) FROM STDIN", buf
+                )
+                return "copy"
+        finally:
+            cursor.close()
+
+        # Batched executemany through SQLAlchemy (binds handle enums and JSON)
+        stage_table = Table(
+            stage, MetaData(),
+            *[Column(c, table.c[c].type) for c in columns], Column("_ord", Integer),
+        )
+        conn.execute(stage_table.insert(), [{**row, "_ord": i} for i, row in enumerate(rows)])
+        return "executemany"
+
+@contextmanager
+def loading(engine: Engine, loader: Optional[BulkLoader] = None):
+    """Reuse the caller's loader, or make one and print its report when a script runs alone."""
+    if loader is not None:
+        yield loader
+        return
+    loader = BulkLoader(engine)
+    yield loader
+    loader.print_report()
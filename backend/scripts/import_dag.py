@@ -0,0 +1,99 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence
+from backend.scripts.bulk_load import BulkLoader
+
+# === Dependency-ordered import runner ===
+# Each step declares the steps whose rows it needs (e.g. monsters resolve species,
+# types and traits by name). A step starts as soon as all of its dependencies have
+# finished, so independent steps run at the same time on their own connections and
+# the total time is bounded by the longest dependency chain instead of the sum.
+
+class Step:
+    def __init__(self, name: str, run: Callable[[BulkLoader], None], deps: Sequence[str] = ()):
+        self.name = name
+        self.run = run
+        self.deps = tuple(deps)
+
+class StepReport:
+    def __init__(self, name: str, deps: Sequence[str], started: float, seconds: float, rows: int):
+        self.name = name
+        self.deps = tuple(deps)
+        self.started = started  # seconds after the run started
+        self.seconds = seconds
+        self.rows = rows
+
+def check_steps(steps: Sequence[Step]) -> None:
+    """Raise ValueError for duplicate names, unknown dependencies or cycles."""
+    by_name = {}
+    for step in steps:
+        if step.name in by_name:
+            raise ValueError(f"Duplicate import step '{step.name}'")
+        by_name[step.name] = step
+    for step in steps:
+        unknown = [d for d in step.deps if d not in by_name]
+        if unknown:
+            raise ValueError(f"Import step '{step.name}' depends on unknown steps: {', '.join(unknown)}")
+
+    done = set()
+    pending = list(steps)
+    while pending:
+        ready = [s for s in pending if set(s.deps) <= done]
+        if not ready:
+            raise ValueError(f"Import steps have a dependency cycle: {', '.join(s.name for s in pending)}")
+        done |= {s.name for s in ready}
+        pending = [s for s in pending if s.name not in done]
+
+def run_steps(steps: Sequence[Step], loader: BulkLoader, workers: int = 4) -> List[StepReport]:
+    """Run `steps` in dependency order with up to `workers` at a time.
+
+    Every step writes through its own BulkLoader (same engine and method), whose stats
+    are added to `loader` when it finishes. If a step fails, no new steps are started
+    and the first error is raised once the running ones are done.
+    """
+    check_steps(steps)
+    lock = threading.Lock()
+    start = time.perf_counter()
+    reports: List[StepReport] = []
+
+    def run(step: Step) -> StepReport:
+        step_loader = BulkLoader(loader.engine, method=loader.method)
+        begun = time.perf_counter()
+        step.run(step_loader)
+        report = StepReport(step.name, step.deps, begun - start, time.perf_counter() - begun,
+                            sum(s.rows for s in step_loader.stats))
+        with lock:
+            loader.stats.extend(step_loader.stats)
+        return report
+
+    done = set()
+    pending = list(steps)
+    running: Dict[Future, Step] = {}
+    error: Optional[BaseException] = None
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="import") as pool:
+        while pending or running:
+            if error is None:
+                for step in [s for s in pending if set(s.deps) <= done]:
+                    pending.remove(step)
+                    running[pool.submit(run, step)] = step
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                step = running.pop(future)
+                if future.exception() is not None:
+                    error = error or future.exception()
+                else:
+                    reports.append(future.result())
+                    done.add(step.name)
+    if error is not None:
+        raise error
+    return reports
+
+def print_step_report(reports: Sequence[StepReport]) -> None:
+    print(f"{'step':<16} {'start ms':>9} {'ms':>9} {'rows':>7}  after")
+    for r in sorted(reports, key=lambda r: r.started):
+        print(f"{r.name:<16} {r.started * 1000:>9.1f} {r.seconds * 1000:>9.1f} {r.rows:>7}  {', '.join(r.deps) or '-'}")
+    wall = max((r.started + r.seconds for r in reports), default=0.0)
+    print(f"wall {wall * 1000:.1f} ms, sum of steps {sum(r.seconds for r in reports) * 1000:.1f} ms")
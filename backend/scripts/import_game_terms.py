@@ -1,37 +1,24 @@
-import json
-from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.orm import Session
 from backend.models import GameTerm
-from backend.config import DATABASE_URL
-from sqlalchemy import create_engine
+from backend.database import create_db_engine
+from backend.game_data import load_json
+from backend.scripts.bulk_load import loading
 
-GAME_TERMS_JSON_PATH = "backend/data/game_terms.json"
+engine = create_db_engine("import", statement_timeout_ms=0)
 
-engine = create_engine(DATABASE_URL)
+def build_rows(session, terms_data):
+    return [
+        {"key": item["key"], "description": item["description"], "localized": item["localized"]}
+        for item in terms_data
+    ]
 
-def load_game_terms():
-    with open(GAME_TERMS_JSON_PATH, encoding="utf-8") as f:
-        terms_data = json.load(f)
+def load_game_terms(loader):
+    terms_data = load_json("game_terms.json")
+    loader.upsert(GameTerm, build_rows(None, terms_data), conflict=["key"])
+    print("Game terms imported successfully!")
 
-    with Session(engine) as session:
-        for item in terms_data:
-            stmt = insert(GameTerm).values(
-                key=item["key"],
-                description=item["description"],
-                localized=item["localized"]
-            ).on_conflict_do_update(
-                index_elements=["key"],
-                set_={
-                    "description": item["description"],
-                    "localized": item["localized"]
-                }
-            )
-            session.execute(stmt)
-        session.commit()
-        print("Game terms imported successfully!")
-
-def main():
-    load_game_terms()
+def main(loader=None):
+    with loading(engine, loader) as loader:
+        load_game_terms(loader)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,55 +1,51 @@
-import json
 from sqlalchemy.orm import Session
-from backend.models import Monster, Move
-from backend.config import DATABASE_URL
-from sqlalchemy import create_engine, text
-
-MONSTERS_JSON_PATH = "backend/data/monsters.json"
-MONSTER_MOVES_JSON_PATH = "backend/data/monster_moves.json"
-
-engine = create_engine(DATABASE_URL)
-
-def load_monster_moves():
-    with open(MONSTERS_JSON_PATH, encoding="utf-8") as f:
-        monsters_data = json.load(f)
-    with open(MONSTER_MOVES_JSON_PATH, encoding="utf-8") as f:
-        monster_moves_data = json.load(f)
-
-    with Session(engine) as session:
-        # Clear old associations (idempotent)
-        session.execute(text("DELETE FROM monster_moves"))
-
-        # Build monster and move maps
-        monster_by_name_and_form = {(m.name, m.form): m.id for m in session.query(Monster).all()}
-        move_map = {mv.name: mv.id for mv in session.query(Move).all()}
-
-        for monster in monsters_data:
-            m_name = monster["name"]
-            m_form = monster.get("form", "default")
-            moveset_key = monster.get("moveset_key")
-            monster_id = monster_by_name_and_form.get((m_name, m_form))
-            if not moveset_key or moveset_key not in monster_moves_data:
-                print(f"Warning: Monster '{m_name}' (form '{m_form}') has no valid moveset_key: {moveset_key}")
+from backend.models import Monster, Move, monster_moves
+from backend.database import create_db_engine
+from backend.game_data import load_json
+from backend.scripts.bulk_load import loading
+
+engine = create_db_engine("import", statement_timeout_ms=0)
+
+def build_rows(session, monsters_data, monster_moves_data):
+    # Build monster and move maps
+    monster_by_name_and_form = {(m.name, m.form): m.id for m in session.query(Monster).all()}
+    move_map = {mv.name: mv.id for mv in session.query(Move).all()}
+
+    rows = []
+    for monster in monsters_data:
+        m_name = monster["name"]
+        m_form = monster.get("form", "default")
+        moveset_key = monster.get("moveset_key")
+        monster_id = monster_by_name_and_form.get((m_name, m_form))
+        if not moveset_key or moveset_key not in monster_moves_data:
+            print(f"Warning: Monster '{m_name}' (form '{m_form}') has no valid moveset_key: {moveset_key}")
+            continue
+
+        # Collect all moves (learnable + move stones)
+        moveset = monster_moves_data[moveset_key]
+        all_moves = set(moveset.get("learnable_moves", [])) | set(moveset.get("move_stones", []))
+
+        for move_name in sorted(all_moves):
+            move_id = move_map.get(move_name)
+            if move_id is None:
+                print(f"Warning: Move '{move_name}' not found in DB for monster '{m_name}' (form '{m_form}')")
                 continue
+            rows.append({"monster_id": monster_id, "move_id": move_id})
+    return rows
 
-            # Collect all moves (learnable + move stones)
-            moveset = monster_moves_data[moveset_key]
-            all_moves = set(moveset.get("learnable_moves", [])) | set(moveset.get("move_stones", []))
-
-            for move_name in all_moves:
-                move_id = move_map.get(move_name)
-                if move_id is None:
-                    print(f"Warning: Move '{move_name}' not found in DB for monster '{m_name}' (form '{m_form}')")
-                    continue
-                session.execute(
-                    text("INSERT INTO monster_moves (monster_id, move_id) VALUES (:mid, :moid) ON CONFLICT DO NOTHING"),
-                    {"mid": monster_id, "moid": move_id}
-                )
-        session.commit()
-        print("Monster-move associations imported successfully!")
-
-def main():
-    load_monster_moves()
+def load_monster_moves(loader):
+    monsters_data = load_json("monsters.json")
+    monster_moves_data = load_json("monster_moves.json")
+    with Session(loader.engine) as session:
+        rows = build_rows(session, monsters_data, monster_moves_data)
+
+    # Old associations are cleared and rewritten in one transaction (idempotent)
+    loader.replace(monster_moves, rows)
+    print("Monster-move associations imported successfully!")
+
+def main(loader=None):
+    with loading(engine, loader) as loader:
+        load_monster_moves(loader)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,35 +1,21 @@
-import json
-from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.orm import Session
 from backend.models import MonsterSpecies
-from backend.config import DATABASE_URL
-from sqlalchemy import create_engine
+from backend.database import create_db_engine
+from backend.game_data import load_json
+from backend.scripts.bulk_load import loading
 
-SPECIES_JSON_PATH = "backend/data/monster_species.json"
+engine = create_db_engine("import", statement_timeout_ms=0)
 
-engine = create_engine(DATABASE_URL)
+def build_rows(session, species_data):
+    return [{"name": item["name"], "localized": item["localized"]} for item in species_data]
 
-def load_monster_species():
-    with open(SPECIES_JSON_PATH, encoding="utf-8") as f:
-        species_data = json.load(f)
+def load_monster_species(loader):
+    species_data = load_json("monster_species.json")
+    loader.upsert(MonsterSpecies, build_rows(None, species_data), conflict=["name"])
+    print("Monster species imported successfully!")
 
-    with Session(engine) as session:
-        for item in species_data:
-            stmt = insert(MonsterSpecies).values(
-                name=item["name"],
-                localized=item["localized"]
-            ).on_conflict_do_update(
-                index_elements=["name"],
-                set_={
-                    "localized": item["localized"]
-                }
-            )
-            session.execute(stmt)
-        session.commit()
-        print("Monster species imported successfully!")
-
-def main():
-    load_monster_species()
+def main(loader=None):
+    with loading(engine, loader) as loader:
+        load_monster_species(loader)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,100 +1,85 @@
-import json
-from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from backend.models import Monster, MonsterSpecies, Type, Trait, AttackStyle
-from backend.config import DATABASE_URL
-from sqlalchemy import create_engine, text
+from backend.database import create_db_engine
+from backend.game_data import ATTACK_STYLE_MAP, load_json
+from backend.scripts.bulk_load import loading
 
-MONSTERS_JSON_PATH = "backend/data/monsters.json"
+engine = create_db_engine("import", statement_timeout_ms=0)
 
-engine = create_engine(DATABASE_URL)
+# evolves_from_id is filled in by the second pass
+UPDATE_COLUMNS = [
+    "species_id", "main_type_id", "sub_type_id", "default_legacy_type_id", "trait_id", "leader_potential",
+    "is_leader_form", "base_hp", "base_phy_atk", "base_mag_atk", "base_phy_def", "base_mag_def", "base_spd",
+    "preferred_attack_style", "localized",
+]
 
-ATTACK_STYLE_MAP = {
-    "Physical": "PHYSICAL",
-    "Magic": "MAGIC",
-    "Both": "BOTH"
-}
+def build_rows(session, monsters_data):
+    # Build all FK maps
+    species_map = {s.name: s.id for s in session.query(MonsterSpecies).all()}
+    type_map = {t.name: t.id for t in session.query(Type).all()}
+    trait_map = {tr.name: tr.id for tr in session.query(Trait).all()}
+    return [
+        {
+            "name": item["name"],
+            "evolves_from_id": None,
+            "species_id": species_map[item["species"]],
+            "form": item.get("form", "default"),
+            "main_type_id": type_map[item["main_type"]],
+            "sub_type_id": type_map.get(item["sub_type"]),
+            "default_legacy_type_id": type_map[item["default_legacy_type"]],
+            "trait_id": trait_map[item["trait"]],
+            "leader_potential": item.get("leader_potential", False),
+            "is_leader_form": item.get("is_leader_form", False),
+            "base_hp": item["base_hp"],
+            "base_phy_atk": item["base_phy_atk"],
+            "base_mag_atk": item["base_mag_atk"],
+            "base_phy_def": item["base_phy_def"],
+            "base_mag_def": item["base_mag_def"],
+            "base_spd": item["base_spd"],
+            "preferred_attack_style": AttackStyle[ATTACK_STYLE_MAP[item["preferred_attack_style"]]],
+            "localized": item["localized"]
+        }
+        for item in monsters_data
+    ]
 
-def load_monsters_two_pass():
-    with open(MONSTERS_JSON_PATH, encoding="utf-8") as f:
-        monsters_data = json.load(f)
+def link_rows(session, monsters_data):
+    # Build monster_map by (name, form) now that all monsters exist
+    monster_by_name_and_form = {(m.name, m.form): m.id for m in session.query(Monster).all()}
 
-    with Session(engine) as session:
-        # Build all FK maps
-        species_map = {s.name: s.id for s in session.query(MonsterSpecies).all()}
-        type_map = {t.name: t.id for t in session.query(Type).all()}
-        trait_map = {tr.name: tr.id for tr in session.query(Trait).all()}
+    links = []
+    for item in monsters_data:
+        evolves_from = item.get("evolves_from")
+        this_form = item.get("form", "default")
+        parent_id = None
+        if evolves_from:
+            # Try parent's default form first
+            parent_id = monster_by_name_and_form.get((evolves_from, "default"))
+            if parent_id is None:
+                # Fallback: try matching this form
+                parent_id = monster_by_name_and_form.get((evolves_from, this_form))
+            if parent_id is None:
+                print(f"Warning: evolves_from '{evolves_from}' (form 'default' or '{this_form}') not found for monster '{item['name']}' with form '{this_form}'")
+                continue
+        links.append({"name": item["name"], "form": this_form, "evolves_from_id": parent_id})
+    return links
 
-        # FIRST PASS: Insert all monsters with evolves_from_id=None
-        for item in monsters_data:
-            stmt = insert(Monster).values(
-                name=item["name"],
-                evolves_from_id=None,
-                species_id=species_map[item["species"]],
-                form=item.get("form", "default"),
-                main_type_id=type_map[item["main_type"]],
-                sub_type_id=type_map.get(item["sub_type"]),
-                default_legacy_type_id=type_map[item["default_legacy_type"]],
-                trait_id=trait_map[item["trait"]],
-                leader_potential=item.get("leader_potential", False),
-                is_leader_form=item.get("is_leader_form", False),
-                base_hp=item["base_hp"],
-                base_phy_atk=item["base_phy_atk"],
-                base_mag_atk=item["base_mag_atk"],
-                base_phy_def=item["base_phy_def"],
-                base_mag_def=item["base_mag_def"],
-                base_spd=item["base_spd"],
-                preferred_attack_style=AttackStyle[ATTACK_STYLE_MAP[item["preferred_attack_style"]]],
-                localized=item["localized"]
-            ).on_conflict_do_update(
-                index_elements=["name", "form"],
-                set_={
-                    "species_id": species_map[item["species"]],
-                    "form": item.get("form", "default"),
-                    "main_type_id": type_map[item["main_type"]],
-                    "sub_type_id": type_map.get(item["sub_type"]),
-                    "default_legacy_type_id": type_map[item["default_legacy_type"]],
-                    "trait_id": trait_map[item["trait"]],
-                    "leader_potential": item.get("leader_potential", False),
-                    "is_leader_form": item.get("is_leader_form", False),
-                    "base_hp": item["base_hp"],
-                    "base_phy_atk": item["base_phy_atk"],
-                    "base_mag_atk": item["base_mag_atk"],
-                    "base_phy_def": item["base_phy_def"],
-                    "base_mag_def": item["base_mag_def"],
-                    "base_spd": item["base_spd"],
-                    "preferred_attack_style": AttackStyle[ATTACK_STYLE_MAP[item["preferred_attack_style"]]],
-                    "localized": item["localized"]
-                }
-            )
-            session.execute(stmt)
-        session.commit()
+def load_monsters_two_pass(loader):
+    monsters_data = load_json("monsters.json")
 
-        # Build monster_map by (name, form) now that all monsters exist
-        monster_by_name_and_form = {(m.name, m.form): m.id for m in session.query(Monster).all()}
+    # FIRST PASS: Insert all monsters with evolves_from_id=None (existing links are kept until the second pass)
+    with Session(loader.engine) as session:
+        rows = build_rows(session, monsters_data)
+    loader.upsert(Monster, rows, conflict=["name", "form"], update=UPDATE_COLUMNS)
 
-        # SECOND PASS: Update evolves_from_id for each monster by (name, form)
-        for item in monsters_data:
-            evolves_from = item.get("evolves_from")
-            this_form = item.get("form", "default")
-            if evolves_from:
-                # Try parent's default form first
-                parent_id = monster_by_name_and_form.get((evolves_from, "default"))
-                if parent_id is None:
-                    # Fallback: try matching this form
-                    parent_id = monster_by_name_and_form.get((evolves_from, this_form))
-                if parent_id is None:
-                    print(f"Warning: evolves_from '{evolves_from}' (form 'default' or '{this_form}') not found for monster '{item['name']}' with form '{this_form}'")
-                    continue
-                session.execute(
-                    text("UPDATE monsters SET evolves_from_id = :eid WHERE name = :name AND form = :form"),
-                    {"eid": parent_id, "name": item["name"], "form": this_form}
-                )
-        session.commit()
-        print("Monsters imported successfully!")
+    # SECOND PASS: Update evolves_from_id for each monster by (name, form)
+    with Session(loader.engine) as session:
+        links = link_rows(session, monsters_data)
+    loader.update(Monster, links, key=["name", "form"])
+    print("Monsters imported successfully!")
 
-def main():
-    load_monsters_two_pass()
+def main(loader=None):
+    with loading(engine, loader) as loader:
+        load_monsters_two_pass(loader)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,67 +1,47 @@
-import json
-from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from backend.models import Move, Type, MoveCategory
-from backend.config import DATABASE_URL
-from sqlalchemy import create_engine
-
-MOVES_JSON_PATH = "backend/data/moves.json"
-
-engine = create_engine(DATABASE_URL)
-
-CATEGORY_MAP = {
-    "Physical Attack": "PHY_ATTACK",
-    "Magic Attack": "MAG_ATTACK",
-    "Defense": "DEFENSE",
-    "Status": "STATUS"
-}
-
-def load_moves():
-    with open(MOVES_JSON_PATH, encoding="utf-8") as f:
-        moves_data = json.load(f)
-
-    with Session(engine) as session:
-        # Build a type name -> id map for FK resolution
-        type_name_to_id = {t.name: t.id for t in session.query(Type).all()}
-
-        for item in moves_data:
-            move_type_value = item.get("type")
-            if move_type_value is None:
-                move_type_id = None
-            else:
-                move_type_id = type_name_to_id.get(move_type_value)
-                if move_type_id is None:
-                    raise ValueError(f"Type '{move_type_value}' in moves.json not found in DB.")
-
-            stmt = insert(Move).values(
-                name=item["name"],
-                move_type_id=move_type_id,
-                move_category=MoveCategory[CATEGORY_MAP[item["category"]]],
-                energy_cost=item["energy_cost"],
-                power=item.get("power"),
-                description=item["description"],
-                has_counter=item.get("has_counter", False),
-                is_move_stone=item.get("is_move_stone", False),
-                localized=item["localized"]
-            ).on_conflict_do_update(
-                index_elements=["name"],
-                set_={
-                    "move_type_id": move_type_id,
-                    "move_category": MoveCategory[CATEGORY_MAP[item["category"]]],
-                    "energy_cost": item["energy_cost"],
-                    "power": item.get("power"),
-                    "description": item["description"],
-                    "has_counter": item.get("has_counter", False),
-                    "is_move_stone": item.get("is_move_stone", False),
-                    "localized": item["localized"]
-                }
-            )
-            session.execute(stmt)
-        session.commit()
-        print("Moves imported successfully!")
-
-def main():
-    load_moves()
+from backend.database import create_db_engine
+from backend.game_data import CATEGORY_MAP, load_json
+from backend.scripts.bulk_load import loading
+
+engine = create_db_engine("import", statement_timeout_ms=0)
+
+def build_rows(session, moves_data):
+    # Build a type name -> id map for FK resolution
+    type_name_to_id = {t.name: t.id for t in session.query(Type).all()}
+
+    rows = []
+    for item in moves_data:
+        move_type_value = item.get("type")
+        if move_type_value is None:
+            move_type_id = None
+        else:
+            move_type_id = type_name_to_id.get(move_type_value)
+            if move_type_id is None:
+                raise ValueError(f"Type '{move_type_value}' in moves.json not found in DB.")
+        rows.append({
+            "name": item["name"],
+            "move_type_id": move_type_id,
+            "move_category": MoveCategory[CATEGORY_MAP[item["category"]]],
+            "energy_cost": item["energy_cost"],
+            "power": item.get("power"),
+            "description": item["description"],
+            "has_counter": item.get("has_counter", False),
+            "is_move_stone": item.get("is_move_stone", False),
+            "localized": item["localized"]
+        })
+    return rows
+
+def load_moves(loader):
+    moves_data = load_json("moves.json")
+    with Session(loader.engine) as session:
+        rows = build_rows(session, moves_data)
+    loader.upsert(Move, rows, conflict=["name"])
+    print("Moves imported successfully!")
+
+def main(loader=None):
+    with loading(engine, loader) as loader:
+        load_moves(loader)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
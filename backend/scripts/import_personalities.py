@@ -1,47 +1,33 @@
-import json
-from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.orm import Session
 from backend.models import Personality
-from backend.config import DATABASE_URL
-from sqlalchemy import create_engine
+from backend.database import create_db_engine
+from backend.game_data import load_json
+from backend.scripts.bulk_load import loading
 
-PERSONALITIES_JSON_PATH = "backend/data/personalities.json"
+engine = create_db_engine("import", statement_timeout_ms=0)
 
-engine = create_engine(DATABASE_URL)
+def build_rows(session, personalities_data):
+    return [
+        {
+            "name": item["name"],
+            "hp_mod_pct": item.get("hp_mod_pct", 0.0),
+            "phy_atk_mod_pct": item.get("phy_atk_mod_pct", 0.0),
+            "mag_atk_mod_pct": item.get("mag_atk_mod_pct", 0.0),
+            "phy_def_mod_pct": item.get("phy_def_mod_pct", 0.0),
+            "mag_def_mod_pct": item.get("mag_def_mod_pct", 0.0),
+            "spd_mod_pct": item.get("spd_mod_pct", 0.0),
+            "localized": item["localized"]
+        }
+        for item in personalities_data
+    ]
 
-def load_personalities():
-    with open(PERSONALITIES_JSON_PATH, encoding="utf-8") as f:
-        personalities_data = json.load(f)
+def load_personalities(loader):
+    personalities_data = load_json("personalities.json")
+    loader.upsert(Personality, build_rows(None, personalities_data), conflict=["name"])
+    print("Personalities imported successfully!")
 
-    with Session(engine) as session:
-        for item in personalities_data:
-            stmt = insert(Personality).values(
-                name=item["name"],
-                hp_mod_pct=item.get("hp_mod_pct", 0.0),
-                phy_atk_mod_pct=item.get("phy_atk_mod_pct", 0.0),
-                mag_atk_mod_pct=item.get("mag_atk_mod_pct", 0.0),
-                phy_def_mod_pct=item.get("phy_def_mod_pct", 0.0),
-                mag_def_mod_pct=item.get("mag_def_mod_pct", 0.0),
-                spd_mod_pct=item.get("spd_mod_pct", 0.0),
-                localized=item["localized"]
-            ).on_conflict_do_update(
-                index_elements=["name"],
-                set_={
-                    "hp_mod_pct": item.get("hp_mod_pct", 0.0),
-                    "phy_atk_mod_pct": item.get("phy_atk_mod_pct", 0.0),
-                    "mag_atk_mod_pct": item.get("mag_atk_mod_pct", 0.0),
-                    "phy_def_mod_pct": item.get("phy_def_mod_pct", 0.0),
-                    "mag_def_mod_pct": item.get("mag_def_mod_pct", 0.0),
-                    "spd_mod_pct": item.get("spd_mod_pct", 0.0),
-                    "localized": item["localized"]
-                }
-            )
-            session.execute(stmt)
-        session.commit()
-        print("Personalities imported successfully!")
-
-def main():
-    load_personalities()
+def main(loader=None):
+    with loading(engine, loader) as loader:
+        load_personalities(loader)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,38 +1,24 @@
-import json
-from sqlalchemy import select, text
-from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.orm import Session
 from backend.models import Trait
-from backend.config import DATABASE_URL
-from sqlalchemy import create_engine
+from backend.database import create_db_engine
+from backend.game_data import load_json
+from backend.scripts.bulk_load import loading
 
-TRAITS_JSON_PATH = "backend/data/traits.json"
+engine = create_db_engine("import", statement_timeout_ms=0)
 
-engine = create_engine(DATABASE_URL)
+def build_rows(session, traits_data):
+    return [
+        {"name": item["name"], "description": item["description"], "localized": item["localized"]}
+        for item in traits_data
+    ]
 
-def load_traits():
-    with open(TRAITS_JSON_PATH, encoding="utf-8") as f:
-        traits_data = json.load(f)
+def load_traits(loader):
+    traits_data = load_json("traits.json")
+    loader.upsert(Trait, build_rows(None, traits_data), conflict=["name"])
+    print("Traits imported successfully!")
 
-    with Session(engine) as session:
-        for item in traits_data:
-            stmt = insert(Trait).values(
-                name=item["name"],
-                description=item["description"],
-                localized=item["localized"]
-            ).on_conflict_do_update(
-                index_elements=["name"],
-                set_={
-                    "description": item["description"],
-                    "localized": item["localized"]
-                }
-            )
-            session.execute(stmt)
-        session.commit()
-        print("Traits imported successfully!")
-
-def main():
-    load_traits()
+def main(loader=None):
+    with loading(engine, loader) as loader:
+        load_traits(loader)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
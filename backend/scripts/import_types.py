@@ -1,63 +1,39 @@
-import json
-from sqlalchemy import select, text
-from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
-from backend.models import Base, Type
-from backend.config import DATABASE_URL
-from sqlalchemy import create_engine
+from backend.models import Type, type_effective_against, type_weak_against
+from backend.database import create_db_engine
+from backend.game_data import load_json
+from backend.scripts.bulk_load import loading
 
-TYPES_JSON_PATH = "backend/data/types.json"
+engine = create_db_engine("import", statement_timeout_ms=0)
 
-engine = create_engine(DATABASE_URL)
+# Association table -> the types.json field listing its targets
+RELATIONS = [(type_effective_against, "effective_against"), (type_weak_against, "weak_against")]
 
-def load_types():
-    with open(TYPES_JSON_PATH, encoding="utf-8") as f:
-        types_data = json.load(f)
+def build_rows(session, types_data):
+    return [{"name": item["name"], "localized": item["localized"]} for item in types_data]
+
+def relation_rows(session, types_data, key):
+    name_to_id = {t.name: t.id for t in session.query(Type).all()}
+    return [
+        {"type_id": name_to_id[item["name"]], "target_type_id": name_to_id[target]}
+        for item in types_data for target in item.get(key, []) if target in name_to_id
+    ]
+
+def load_types(loader):
+    types_data = load_json("types.json")
 
     # Step 1: Insert/update all types (idempotent upsert)
-    with Session(engine) as session:
-        name_to_id = {}
-        for item in types_data:
-            stmt = insert(Type).values(
-                name=item["name"],
-                localized=item["localized"]
-            ).on_conflict_do_update(
-                index_elements=["name"],
-                set_={"localized": item["localized"]}
-            ).returning(Type.id, Type.name)
-            result = session.execute(stmt)
-            row = result.first()
-            name_to_id[item["name"]] = row[0]  # Map type name to DB id
-
-        session.commit()
-
-        # Step 2: Now handle the association tables (idempotent)
-        session.execute(text("DELETE FROM type_effective_against"))
-        session.execute(text("DELETE FROM type_weak_against"))
-        session.commit()
-
-        # Re-create associations based on JSON
-        for item in types_data:
-            this_id = name_to_id[item["name"]]
-            for eff in item.get("effective_against", []):
-                target_id = name_to_id.get(eff)
-                if target_id:
-                    session.execute(
-                        text("INSERT INTO type_effective_against (type_id, target_type_id) VALUES (:tid, :tid2) ON CONFLICT DO NOTHING"),
-                        {"tid": this_id, "tid2": target_id}
-                    )
-            for weak in item.get("weak_against", []):
-                target_id = name_to_id.get(weak)
-                if target_id:
-                    session.execute(
-                        text("INSERT INTO type_weak_against (type_id, target_type_id) VALUES (:tid, :tid2) ON CONFLICT DO NOTHING"),
-                        {"tid": this_id, "tid2": target_id}
-                    )
-        session.commit()
-        print("Types and associations imported successfully!")
-
-def main():
-    load_types()
+    loader.upsert(Type, build_rows(None, types_data), conflict=["name"])
+
+    # Step 2: Re-create the association tables from JSON (idempotent)
+    with Session(loader.engine) as session:
+        for table, key in RELATIONS:
+            loader.replace(table, relation_rows(session, types_data, key))
+    print("Types and associations imported successfully!")
+
+def main(loader=None):
+    with loading(engine, loader) as loader:
+        load_types(loader)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
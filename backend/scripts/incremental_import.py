@@ -0,0 +1,221 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from backend.models import (
+    GameTerm, Type, Trait, Personality, MonsterSpecies, MagicItem, Move, Monster, LegacyMove, ImportManifest,
+    monster_moves, type_effective_against, type_weak_against,
+)
+from backend.database import create_db_engine
+from backend.game_data import DATA_DIR
+from backend.scripts import import_types, import_traits, import_personalities, import_monster_species, import_magic_items, import_game_terms, import_moves, import_monsters, import_monster_moves, import_legacy_moves
+from backend.scripts.bulk_load import BulkLoader, METHODS
+
+engine = create_db_engine("import", statement_timeout_ms=0)
+
+# === Incremental, diff-based import ===
+# Every JSON file and every record in it is hashed and compared with the hashes stored
+# in `import_manifest` by the last import. Unchanged files are skipped; for changed
+# ones only new/changed records are upserted and records gone from the file are
+# deleted. Association tables (type relations, monster_moves, legacy_moves) and
+# evolution links are rebuilt in memory when one of their source files changed and
+# diffed against the rows in the database. The manifest is written last, so a failed
+# run is simply repeated in full by the next one.
+
+def record_hash(item) -> str:
+    return hashlib.sha256(json.dumps(item, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+class Entity:
+    """One JSON file imported into one table, records matched on `key` columns."""
+
+    def __init__(self, source: str, model, key: Sequence[str], build_rows: Callable,
+                 update: Optional[Sequence[str]] = None, defaults: Optional[Dict] = None):
+        self.source = source
+        self.model = model
+        self.key = list(key)
+        self.build_rows = build_rows
+        self.update = update
+        self.defaults = defaults or {}  # JSON fields the import scripts default, e.g. monster form
+
+    def record_key(self, item) -> str:
+        return json.dumps([item.get(k, self.defaults.get(k)) for k in self.key], ensure_ascii=False)
+
+class Derived:
+    """A table computed from several JSON files, synced by diffing against its current rows."""
+
+    def __init__(self, table, key: Sequence[str], columns: Sequence[str], sources: Sequence[str],
+                 build_rows: Callable, prune: bool = True):
+        self.table = getattr(table, "__table__", table)
+        self.key = list(key)
+        self.columns = list(columns)  # key + value columns
+        self.sources = set(sources)
+        self.build_rows = build_rows  # (session, {source: data}) -> rows
+        self.prune = prune            # delete rows no longer produced; False updates existing rows only
+
+# Import order (foreign keys first)
+ENTITIES = [
+    Entity("game_terms.json", GameTerm, ["key"], import_game_terms.build_rows),
+    Entity("types.json", Type, ["name"], import_types.build_rows),
+    Entity("traits.json", Trait, ["name"], import_traits.build_rows),
+    Entity("personalities.json", Personality, ["name"], import_personalities.build_rows),
+    Entity("monster_species.json", MonsterSpecies, ["name"], import_monster_species.build_rows),
+    Entity("magic_items.json", MagicItem, ["name"], import_magic_items.build_rows),
+    Entity("moves.json", Move, ["name"], import_moves.build_rows),
+    Entity("monsters.json", Monster, ["name", "form"], import_monsters.build_rows,
+           update=import_monsters.UPDATE_COLUMNS, defaults={"form": "default"}),
+]
+
+# Files without a table of their own (dicts keyed by moveset key)
+SOURCES = [e.source for e in ENTITIES] + ["monster_moves.json"]
+
+MOVESET_SOURCES = ["monsters.json", "monster_moves.json", "moves.json"]
+
+DERIVED = [
+    Derived(type_effective_against, ["type_id", "target_type_id"], ["type_id", "target_type_id"], ["types.json"],
+            lambda s, d: import_types.relation_rows(s, d["types.json"], "effective_against")),
+    Derived(type_weak_against, ["type_id", "target_type_id"], ["type_id", "target_type_id"], ["types.json"],
+            lambda s, d: import_types.relation_rows(s, d["types.json"], "weak_against")),
+    Derived(Monster, ["name", "form"], ["name", "form", "evolves_from_id"], ["monsters.json"],
+            lambda s, d: import_monsters.link_rows(s, d["monsters.json"]), prune=False),
+    Derived(monster_moves, ["monster_id", "move_id"], ["monster_id", "move_id"], MOVESET_SOURCES,
+            lambda s, d: import_monster_moves.build_rows(s, d["monsters.json"], d["monster_moves.json"])),
+    Derived(LegacyMove, ["monster_id", "type_id"], ["monster_id", "type_id", "move_id"], MOVESET_SOURCES + ["types.json"],
+            lambda s, d: import_legacy_moves.build_rows(s, d["monsters.json"], d["monster_moves.json"])),
+]
+
+ENTITY_BY_SOURCE = {e.source: e for e in ENTITIES}
+
+class SourceDiff:
+    """Record-level changes of one JSON file against its manifest entry."""
+
+    def __init__(self, source: str, data, file_hash: str, record_hashes: Dict[str, str],
+                 previous: Optional[Dict[str, str]], unchanged_file: bool):
+        self.source = source
+        self.data = data
+        self.file_hash = file_hash
+        self.record_hashes = record_hashes
+        self.unchanged_file = unchanged_file
+        previous = previous or {}
+        self.added = [k for k in record_hashes if k not in previous]
+        self.updated = [k for k, h in record_hashes.items() if k in previous and previous[k] != h]
+        self.removed = [k for k in previous if k not in record_hashes]
+
+    @property
+    def changed(self) -> bool:
+        return not self.unchanged_file
+
+def read_source(source: str, data_dir: str = DATA_DIR):
+    with open(os.path.join(data_dir, source), "rb") as f:
+        raw = f.read()
+    return json.loads(raw), hashlib.sha256(raw).hexdigest()
+
+def _records(source: str, data) -> Dict[str, object]:
+    if isinstance(data, dict):
+        return dict(data)
+    entity = ENTITY_BY_SOURCE[source]
+    return {entity.record_key(item): item for item in data}
+
+def load_manifest(session) -> Dict[str, ImportManifest]:
+    return {m.source: m for m in session.query(ImportManifest).all()}
+
+def diff_sources(manifest: Dict[str, ImportManifest], data_dir: str = DATA_DIR) -> Dict[str, SourceDiff]:
+    diffs = {}
+    for source in SOURCES:
+        data, file_hash = read_source(source, data_dir)
+        entry = manifest.get(source)
+        if entry is not None and entry.file_hash == file_hash:
+            diffs[source] = SourceDiff(source, data, file_hash, entry.record_hashes, entry.record_hashes, True)
+            continue
+        hashes = {k: record_hash(item) for k, item in _records(source, data).items()}
+        diffs[source] = SourceDiff(source, data, file_hash, hashes, entry.record_hashes if entry else None, False)
+    return diffs
+
+def _current_rows(session, derived: Derived) -> Dict[tuple, Dict]:
+    rows = session.execute(select(*[derived.table.c[c] for c in derived.columns])).mappings()
+    return {tuple(r[k] for k in derived.key): dict(r) for r in rows}
+
+def sync_derived(loader: BulkLoader, derived: Derived, data: Dict[str, object]) -> List[Dict]:
+    """Write the rows that differ from the database; return the rows to delete (if pruning)."""
+    with Session(loader.engine) as session:
+        desired = {}
+        for row in derived.build_rows(session, data):
+            desired.setdefault(tuple(row[k] for k in derived.key), row)
+        current = _current_rows(session, derived)
+    changed = [row for k, row in desired.items() if current.get(k) != row]
+    if derived.prune:
+        loader.upsert(derived.table, changed, conflict=derived.key)
+        return [row for k, row in current.items() if k not in desired]
+    loader.update(derived.table, changed, key=derived.key)
+    return []
+
+def write_manifest(loader: BulkLoader, diffs: Dict[str, SourceDiff]) -> None:
+    now = datetime.now(timezone.utc)
+    loader.upsert(ImportManifest, [
+        {"source": d.source, "file_hash": d.file_hash, "record_hashes": d.record_hashes, "imported_at": now}
+        for d in diffs.values() if d.changed
+    ], conflict=["source"])
+
+def record_manifest(loader: BulkLoader, data_dir: str = DATA_DIR) -> None:
+    """Store the hashes of every file after a full import, so the next incremental run starts from it."""
+    write_manifest(loader, diff_sources({}, data_dir))
+
+def run(loader: BulkLoader, data_dir: str = DATA_DIR) -> Dict[str, SourceDiff]:
+    with Session(loader.engine) as session:
+        diffs = diff_sources(load_manifest(session), data_dir)
+    changed = {s for s, d in diffs.items() if d.changed}
+
+    # 1. Upsert new and changed records, parents first
+    for entity in ENTITIES:
+        diff = diffs[entity.source]
+        if not diff.changed:
+            continue
+        keys = set(diff.added) | set(diff.updated)
+        items = [item for item in diff.data if entity.record_key(item) in keys]
+        if items:
+            with Session(loader.engine) as session:
+                rows = entity.build_rows(session, items)
+            loader.upsert(entity.model, rows, conflict=entity.key, update=entity.update)
+
+    # 2. Association tables and evolution links whose inputs changed
+    data = {s: d.data for s, d in diffs.items()}
+    stale = []
+    for derived in DERIVED:
+        if derived.sources & changed:
+            stale.append((derived, sync_derived(loader, derived, data)))
+    for derived, rows in stale:
+        if rows:
+            loader.delete(derived.table, rows, key=derived.key)
+
+    # 3. Delete records gone from their file, children first
+    for entity in reversed(ENTITIES):
+        diff = diffs[entity.source]
+        if diff.changed and diff.removed:
+            loader.delete(entity.model, [dict(zip(entity.key, json.loads(k))) for k in diff.removed], key=entity.key)
+
+    write_manifest(loader, diffs)
+    return diffs
+
+def print_summary(diffs: Dict[str, SourceDiff]) -> None:
+    for d in diffs.values():
+        if d.changed:
+            print(f"{d.source}: {len(d.added)} added, {len(d.updated)} updated, {len(d.removed)} removed")
+        else:
+            print(f"{d.source}: unchanged")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply only the changes in backend/data/*.json since the last import")
+    parser.add_argument("--method", choices=METHODS, default="copy", help="how rows are staged")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    loader = BulkLoader(engine, method=args.method)
+    diffs = run(loader, args.data_dir)
+    print_summary(diffs)
+    loader.print_report()
+    print(f"Incremental import finished in {time.perf_counter() - start:.2f}s!")
@@ -1,9 +1,13 @@
-from sqlalchemy import create_engine, inspect, text
+import argparse
+import time
+from sqlalchemy import inspect, text
 from backend.models import Base
-from backend.config import DATABASE_URL
-from backend.scripts import import_types, import_traits, import_personalities, import_monster_species, import_magic_items, import_game_terms, import_moves, import_monsters, import_monster_moves, import_legacy_moves
+from backend.database import create_db_engine
+from backend.scripts import incremental_import, import_types, import_traits, import_personalities, import_monster_species, import_magic_items, import_game_terms, import_moves, import_monsters, import_monster_moves, import_legacy_moves
+from backend.scripts.bulk_load import BulkLoader, METHODS
+from backend.scripts.import_dag import Step, print_step_report, run_steps
 
-engine = create_engine(DATABASE_URL)
+engine = create_db_engine("import", statement_timeout_ms=0)
 
 def drop_all_except(engine, keep_tables):
     insp = inspect(engine)
@@ -17,20 +21,46 @@ def drop_all_except(engine, keep_tables):
 def recreate_schema():
     Base.metadata.create_all(bind=engine)
 
+# Import steps and the steps whose rows they look up
+IMPORT_STEPS = [
+    Step("game_terms", import_game_terms.main),
+    Step("types", import_types.main),
+    Step("traits", import_traits.main),
+    Step("personalities", import_personalities.main),
+    Step("monster_species", import_monster_species.main),
+    Step("magic_items", import_magic_items.main, deps=["types"]),
+    Step("moves", import_moves.main, deps=["types"]),
+    Step("monsters", import_monsters.main, deps=["monster_species", "types", "traits"]),
+    Step("monster_moves", import_monster_moves.main, deps=["monsters", "moves"]),
+    Step("legacy_moves", import_legacy_moves.main, deps=["monsters", "moves", "types"]),
+]
+
+def import_all(loader, workers=4):
+    # Independent steps run concurrently, each on its own connection
+    return run_steps(IMPORT_STEPS, loader, workers=workers)
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drop the game-data tables and re-import backend/data/*.json")
+    parser.add_argument("--method", choices=METHODS, default="copy", help="how rows are staged")
+    parser.add_argument("--workers", type=int, default=4, help="import steps run at the same time (1 = sequential)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="keep the tables and apply only what changed since the last import")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.incremental:
+        loader = BulkLoader(engine, method=args.method)
+        incremental_import.print_summary(incremental_import.run(loader))
+        loader.print_report()
+        print(f"Incremental import finished in {time.perf_counter() - start:.2f}s!")
+        raise SystemExit
     keep_tables = ['user_monsters', 'teams']  # Tables need to keep
     drop_all_except(engine, keep_tables)
     recreate_schema()
 
-    # Run import scripts in order
-    import_game_terms.main()
-    import_types.main()
-    import_traits.main()
-    import_personalities.main()
-    import_monster_species.main()
-    import_magic_items.main()
-    import_moves.main()
-    import_monsters.main()
-    import_monster_moves.main()
-    import_legacy_moves.main()
-    print("Database has been reset and core data imported!")
\ No newline at end of file
+    loader = BulkLoader(engine, method=args.method)
+    reports = import_all(loader, workers=args.workers)
+    incremental_import.record_manifest(loader)
+    loader.print_report()
+    print_step_report(reports)
+    print(f"Database has been reset and core data imported in {time.perf_counter() - start:.2f}s!")
@@ -0,0 +1,269 @@
+import argparse
+import json
+import time
+from typing import Dict, List, Set, Tuple, Union
+from sqlalchemy import MetaData, select, text
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.orm import Session
+from backend.catalog import GameCatalog
+from backend.models import Base
+from backend.config import DATABASE_URL
+from backend.database import create_db_engine
+from backend.game_data import DATA_DIR, LEGACY_TYPES_ORDER, load_json
+from backend.scripts import incremental_import
+from backend.scripts.bulk_load import BulkLoader, METHODS
+from backend.scripts.import_dag import StepReport, print_step_report
+
+engine = create_db_engine("import", statement_timeout_ms=0)
+
+# === Zero-downtime reimport through a shadow schema ===
+# The catalog tables are created and imported in `catalog_shadow` while the API keeps
+# reading `public`. Existing rows are copied in first so every (name, form) keeps its
+# id and saved teams stay valid. After the shadow copy passes validation, one short
+# transaction moves the live tables to `catalog_previous`, moves the shadow tables
+# into `public` and re-creates the foreign keys of the user tables against them.
+# `--rollback` swaps `catalog_previous` back the same way.
+
+SHADOW_SCHEMA = "catalog_shadow"
+PREVIOUS_SCHEMA = "catalog_previous"
+SWAP_SCHEMA = "catalog_swap"
+
+# Tables holding user data; everything else in the schema is catalog data
+USER_TABLES = {"user_monsters", "teams", "talents", "trait_synergy_cache"}
+CATALOG_TABLES = [t for t in Base.metadata.sorted_tables if t.name not in USER_TABLES]
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+def schema_engine(schema: str, url: Union[str, URL] = DATABASE_URL) -> Engine:
+    # Unqualified names resolve to `schema` first; user tables still resolve to public
+    return create_db_engine(f"import-{schema}", url, search_path=f"{schema},public", statement_timeout_ms=0)
+
+def _schema_exists(conn, schema: str) -> bool:
+    return conn.execute(text("SELECT 1 FROM pg_namespace WHERE nspname = :s"), {"s": schema}).first() is not None
+
+def _table_exists(conn, schema: str, table: str) -> bool:
+    return conn.execute(text("SELECT to_regclass(:t)"), {"t": f"{_quote(schema)}.{_quote(table)}"}).scalar() is not None
+
+# === Build ===
+def create_shadow(engine: Engine) -> None:
+    """(Re)create the shadow schema with empty catalog tables, seeded with the live ids."""
+    shadow_meta = MetaData()
+    # Enum types have no schema of their own, so they keep resolving to the shared public types
+    tables = [t.to_metadata(shadow_meta, schema=SHADOW_SCHEMA) for t in CATALOG_TABLES]
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {_quote(SHADOW_SCHEMA)} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {_quote(SHADOW_SCHEMA)}"))
+        shadow_meta.create_all(conn)
+        for table in tables:
+            if "id" not in table.c or not _table_exists(conn, "public", table.name):
+                continue
+            # Copy the live rows so the import's upserts keep their ids
+            columns = ", ".join(_quote(c.name) for c in table.columns)
+            target = f"{_quote(SHADOW_SCHEMA)}.{_quote(table.name)}"
+            conn.execute(text(f"INSERT INTO {target} ({columns}) SELECT {columns} FROM public.{_quote(table.name)}"))
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence(:t, 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {target}"
+            ), {"t": target})
+
+def prune_stale(loader: BulkLoader, data_dir: str = DATA_DIR) -> None:
+    """Delete copied records that are no longer in the JSON files, children first."""
+    for entity in reversed(incremental_import.ENTITIES):
+        keys = {entity.record_key(item) for item in load_json(entity.source, data_dir)}
+        table = entity.model.__table__
+        with loader.engine.connect() as conn:
+            rows = conn.execute(select(*[table.c[k] for k in entity.key])).mappings().all()
+        stale = [dict(r) for r in rows if json.dumps([r[k] for k in entity.key], ensure_ascii=False) not in keys]
+        if stale:
+            loader.delete(table, stale, key=entity.key)
+
+def build_shadow(loader: BulkLoader) -> List[StepReport]:
+    from backend.scripts.reset_and_reimport import import_all
+    # Every statement there is schema-qualified, so the loader's shadow engine will do
+    create_shadow(loader.engine)
+    reports = import_all(loader)
+    prune_stale(loader)
+    incremental_import.record_manifest(loader)
+    return reports
+
+# === Validate ===
+def expected_associations(data_dir: str = DATA_DIR) -> Dict[str, Set[Tuple]]:
+    """Association rows by name, resolved from the JSON the way the import scripts resolve them."""
+    types_data = load_json("types.json", data_dir)
+    moves = {mv["name"] for mv in load_json("moves.json", data_dir)}
+    monsters_data = load_json("monsters.json", data_dir)
+    movesets = load_json("monster_moves.json", data_dir)
+    types = {t["name"] for t in types_data}
+
+    expected = {
+        "type_effective_against": {(t["name"], o) for t in types_data for o in t.get("effective_against", []) if o in types},
+        "type_weak_against": {(t["name"], o) for t in types_data for o in t.get("weak_against", []) if o in types},
+        "monster_moves": set(),
+        "legacy_moves": set(),
+    }
+    for monster in monsters_data:
+        moveset = movesets.get(monster.get("moveset_key"))
+        if moveset is None:
+            continue
+        name, form = monster["name"], monster.get("form", "default")
+        for move in set(moveset.get("learnable_moves", [])) | set(moveset.get("move_stones", [])):
+            if move in moves:
+                expected["monster_moves"].add((name, form, move))
+        legacy = moveset.get("legacy_moves", [])
+        if len(legacy) == len(LEGACY_TYPES_ORDER):
+            for type_name, move in zip(LEGACY_TYPES_ORDER, legacy):
+                if move in moves and type_name in types:
+                    expected["legacy_moves"].add((name, form, type_name, move))
+    return expected
+
+ASSOCIATION_SQL = {
+    "type_effective_against": "SELECT a.name, b.name FROM type_effective_against r "
+                              "JOIN types a ON a.id = r.type_id JOIN types b ON b.id = r.target_type_id",
+    "type_weak_against": "SELECT a.name, b.name FROM type_weak_against r "
+                         "JOIN types a ON a.id = r.type_id JOIN types b ON b.id = r.target_type_id",
+    "monster_moves": "SELECT m.name, m.form, mv.name FROM monster_moves r "
+                     "JOIN monsters m ON m.id = r.monster_id JOIN moves mv ON mv.id = r.move_id",
+    "legacy_moves": "SELECT m.name, m.form, t.name, mv.name FROM legacy_moves r JOIN monsters m ON m.id = r.monster_id "
+                    "JOIN types t ON t.id = r.type_id JOIN moves mv ON mv.id = r.move_id",
+}
+
+def _user_references() -> List[Tuple[str, str, str]]:
+    # (user table, column, catalog table) for every foreign key from user data into the catalog
+    return [
+        (fk.parent.table.name, fk.parent.name, fk.column.table.name)
+        for table in Base.metadata.sorted_tables if table.name in USER_TABLES
+        for fk in table.foreign_keys if fk.column.table.name not in USER_TABLES
+    ]
+
+def validate(shadow_engine: Engine, data_dir: str = DATA_DIR) -> List[str]:
+    """Problems that block the swap: row counts, association content, and saved-team references."""
+    problems = []
+    with shadow_engine.connect() as conn:
+        # Row counts match the distinct records of each file
+        for entity in incremental_import.ENTITIES:
+            expected = len({entity.record_key(item) for item in load_json(entity.source, data_dir)})
+            actual = conn.execute(text(f"SELECT COUNT(*) FROM {_quote(entity.model.__tablename__)}")).scalar_one()
+            if actual != expected:
+                problems.append(f"{entity.model.__tablename__}: {actual} rows, expected {expected}")
+
+        # Association tables hold exactly the rows the JSON describes
+        for table, expected in expected_associations(data_dir).items():
+            actual = {tuple(r) for r in conn.execute(text(ASSOCIATION_SQL[table]))}
+            if actual != expected:
+                problems.append(f"{table}: {len(expected - actual)} missing, {len(actual - expected)} unexpected rows")
+
+        # Saved teams reference rows that exist and mean the same thing as before
+        for user_table, column, target in _user_references():
+            missing = conn.execute(text(
+                f"SELECT COUNT(*) FROM public.{_quote(user_table)} u WHERE u.{_quote(column)} IS NOT NULL "
+                f"AND NOT EXISTS (SELECT 1 FROM {_quote(SHADOW_SCHEMA)}.{_quote(target)} c WHERE c.id = u.{_quote(column)})"
+            )).scalar_one()
+            if missing:
+                problems.append(f"{user_table}.{column}: {missing} rows reference {target} ids missing from the new data")
+            if "name" in Base.metadata.tables[target].c:
+                renamed = conn.execute(text(
+                    f"SELECT COUNT(DISTINCT u.{_quote(column)}) FROM public.{_quote(user_table)} u "
+                    f"JOIN public.{_quote(target)} live ON live.id = u.{_quote(column)} "
+                    f"JOIN {_quote(SHADOW_SCHEMA)}.{_quote(target)} shadow ON shadow.id = live.id "
+                    f"WHERE shadow.name <> live.name"
+                )).scalar_one()
+                if renamed:
+                    problems.append(f"{user_table}.{column}: {renamed} referenced {target} ids now name a different record")
+
+    # The API must be able to load it
+    try:
+        with Session(shadow_engine) as session:
+            GameCatalog.load(session)
+    except Exception as e:
+        problems.append(f"catalog failed to load: {e}")
+    return problems
+
+# === Swap ===
+_FK_SQL = text("""
+    SELECT c.conrelid::regclass::text AS table_name, c.conname, pg_get_constraintdef(c.oid) AS definition
+    FROM pg_constraint c
+    JOIN pg_class ref ON ref.oid = c.confrelid
+    JOIN pg_namespace ref_ns ON ref_ns.oid = ref.relnamespace
+    JOIN pg_class src ON src.oid = c.conrelid
+    JOIN pg_namespace src_ns ON src_ns.oid = src.relnamespace
+    WHERE c.contype = 'f' AND ref_ns.nspname = 'public' AND ref.relname = ANY(:names)
+      AND src_ns.nspname = 'public' AND NOT (src.relname = ANY(:names))
+""")
+
+def swap_in(engine: Engine, incoming: str, outgoing: str, lock_timeout: str = "5s") -> None:
+    """In one transaction, move the live catalog tables to `outgoing` and `incoming`'s into public.
+
+    Foreign keys from the user tables follow a table when it changes schema, so they are
+    dropped and re-created against the new tables (which re-checks every saved team).
+    `incoming` and `outgoing` may be the same schema, which exchanges the two.
+    """
+    names = [t.name for t in CATALOG_TABLES]
+    with engine.begin() as conn:
+        if not _schema_exists(conn, incoming):
+            raise ValueError(f"Schema '{incoming}' does not exist")
+        missing = [n for n in names if not _table_exists(conn, incoming, n)]
+        if missing:
+            raise ValueError(f"Schema '{incoming}' is missing catalog tables: {', '.join(missing)}")
+
+        conn.execute(text("SET LOCAL search_path = public"))
+        conn.execute(text(f"SET LOCAL lock_timeout = '{lock_timeout}'"))
+        foreign_keys = conn.execute(_FK_SQL, {"names": names}).all()
+        for fk in foreign_keys:
+            conn.execute(text(f"ALTER TABLE {fk.table_name} DROP CONSTRAINT {_quote(fk.conname)}"))
+
+        conn.execute(text(f"CREATE SCHEMA {_quote(SWAP_SCHEMA)}"))
+        for name in names:
+            if _table_exists(conn, "public", name):
+                conn.execute(text(f"ALTER TABLE public.{_quote(name)} SET SCHEMA {_quote(SWAP_SCHEMA)}"))
+        for name in names:
+            conn.execute(text(f"ALTER TABLE {_quote(incoming)}.{_quote(name)} SET SCHEMA public"))
+        if outgoing != incoming:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {_quote(outgoing)} CASCADE"))
+        conn.execute(text(f"DROP SCHEMA {_quote(incoming)}"))
+        conn.execute(text(f"ALTER SCHEMA {_quote(SWAP_SCHEMA)} RENAME TO {_quote(outgoing)}"))
+
+        for fk in foreign_keys:
+            conn.execute(text(f"ALTER TABLE {fk.table_name} ADD CONSTRAINT {_quote(fk.conname)} {fk.definition}"))
+
+def promote(engine: Engine) -> None:
+    swap_in(engine, SHADOW_SCHEMA, PREVIOUS_SCHEMA)
+
+def rollback(engine: Engine) -> None:
+    # The rolled-back data becomes the previous version, so a second rollback undoes the first
+    swap_in(engine, PREVIOUS_SCHEMA, PREVIOUS_SCHEMA)
+
+def run(method: str = "copy", swap: bool = True, engine: Engine = engine) -> List[str]:
+    shadow_engine = schema_engine(SHADOW_SCHEMA, engine.url)
+    try:
+        loader = BulkLoader(shadow_engine, method=method)
+        reports = build_shadow(loader)
+        loader.print_report()
+        print_step_report(reports)
+        problems = validate(shadow_engine)
+    finally:
+        shadow_engine.dispose()
+    if not problems and swap:
+        promote(engine)
+    return problems
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reimport backend/data/*.json into a shadow schema and swap it in")
+    parser.add_argument("--method", choices=METHODS, default="copy", help="how rows are staged")
+    parser.add_argument("--no-swap", action="store_true", help="build and validate the shadow schema only")
+    parser.add_argument("--rollback", action="store_true", help=f"swap '{PREVIOUS_SCHEMA}' back in instead of importing")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.rollback:
+        rollback(engine)
+        print("Rolled back to the previous catalog.")
+    else:
+        problems = run(args.method, swap=not args.no_swap)
+        if problems:
+            print(f"Validation failed, '{SHADOW_SCHEMA}' was left for inspection:")
+            for problem in problems:
+                print(f"  - {problem}")
+            raise SystemExit(1)
+        print("Shadow catalog validated." if args.no_swap else
+              f"Shadow catalog swapped in; the old tables are kept in '{PREVIOUS_SCHEMA}'.")
+    print(f"Done in {time.perf_counter() - start:.2f}s. POST /catalog/reload/ to serve the new data.")
@@ -0,0 +1,69 @@
+import numpy as np
+from typing import Iterable, Sequence
+
+# Column order shared by every stat matrix below (matches schemas.EffectiveStats)
+STAT_FIELDS = ("hp", "phy_atk", "mag_atk", "phy_def", "mag_def", "spd")
+BASE_STAT_ATTRS = ("base_hp", "base_phy_atk", "base_mag_atk", "base_phy_def", "base_mag_def", "base_spd")
+PERSONALITY_ATTRS = ("hp_mod_pct", "phy_atk_mod_pct", "mag_atk_mod_pct", "phy_def_mod_pct", "mag_def_mod_pct", "spd_mod_pct")
+TALENT_ATTRS = ("hp_boost", "phy_atk_boost", "mag_atk_boost", "phy_def_boost", "mag_def_boost", "spd_boost")
+
+def round_half_up(values):
+    """Vectorized equivalent of Decimal(x).to_integral_value(ROUND_HALF_UP).
+
+    Works on the exact binary value of each float: x - floor(x) is exact in
+    float64, so the >= 0.5 test never suffers the x + 0.5 rounding error.
+    """
+    magnitude = np.abs(values)
+    whole = np.floor(magnitude)
+    rounded = whole + (magnitude - whole >= 0.5)
+    return (np.sign(values) * rounded).astype(np.int64)
+
+def compute_effective_stats_batch(base_stats, personality_mods, talents):
+    """Effective stats for n builds at once.
+
+    base_stats, talents: int arrays of shape (n, 6); personality_mods: float array (n, 6),
+    all in STAT_FIELDS order. Returns an int64 array (n, 6). Performs the same float
+    operations, in the same order, as compute_effective_stats so results match it exactly.
+    """
+    base = np.asarray(base_stats, dtype=np.int64)
+    pers = np.asarray(personality_mods, dtype=np.float64)
+    tal = np.asarray(talents, dtype=np.int64)
+    out = np.empty(base.shape, dtype=np.int64)
+
+    # HP: [1.7 × (base + talent × 6) + 70 − 2.55 × talent] × (1 + modifier) + 100
+    hp = 1.7 * (base[:, 0] + tal[:, 0] * 6) + 70 - 2.55 * tal[:, 0]
+    hp = hp * (1 + pers[:, 0])
+    out[:, 0] = round_half_up(hp + 100)
+
+    # Others: round_half_up(1.1 × (base + talent × 6) + 10) × (1 + modifier) + 50
+    val = 1.1 * (base[:, 1:] + tal[:, 1:] * 6) + 10
+    val = round_half_up(val) * (1 + pers[:, 1:])
+    out[:, 1:] = round_half_up(val + 50)
+    return out
+
+
+class StatTables:
+    """Base-stat and personality-modifier matrices indexed by id, built once per catalog."""
+
+    def __init__(self, monsters: Iterable, personalities: Iterable):
+        monsters = list(monsters)
+        personalities = list(personalities)
+        self.monster_rows = {m.id: i for i, m in enumerate(monsters)}
+        self.personality_rows = {p.id: i for i, p in enumerate(personalities)}
+        self.base_stats = np.array(
+            [[getattr(m, a) for a in BASE_STAT_ATTRS] for m in monsters], dtype=np.int64
+        ).reshape(-1, 6)
+        self.personality_mods = np.array(
+            [[getattr(p, a) for a in PERSONALITY_ATTRS] for p in personalities], dtype=np.float64
+        ).reshape(-1, 6)
+        self.base_stats.flags.writeable = False
+        self.personality_mods.flags.writeable = False
+
+    def compute(self, monster_ids: Sequence[int], personality_ids: Sequence[int], talents) -> np.ndarray:
+        """Gather rows for each (monster, personality, talent) triple and compute in one pass."""
+        m_rows = [self.monster_rows[mid] for mid in monster_ids]
+        p_rows = [self.personality_rows[pid] for pid in personality_ids]
+        return compute_effective_stats_batch(self.base_stats[m_rows], self.personality_mods[p_rows], talents)
+
+def talent_matrix(talents: Iterable) -> np.ndarray:
+    return np.array([[getattr(t, a) for a in TALENT_ATTRS] for t in talents], dtype=np.int64).reshape(-1, 6)
@@ -0,0 +1,226 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from backend import models
+
+TEAM_SIZE = 6
+ATTACK_CATEGORIES = {models.MoveCategory.PHY_ATTACK, models.MoveCategory.MAG_ATTACK}
+
+# === Coverage-optimal team search ===
+# Every monster becomes two bitsets over type-chart rows: the attacking types it is
+# weak to (same rule as compute_type_coverage) and the coverable defending types its
+# damaging move pool hits super-effectively. A team is scored on
+#   1. team_weak_to    - attacking types 3+ members are weak to (fewer is better)
+#   2. coverage        - coverable types the team can hit (more is better)
+#   3. shared_weak_to  - attacking types 2+ members are weak to (fewer is better)
+# Weakness counts are kept as bit-sliced counters (c1 = weak at least once, c2 = at
+# least twice, c3 = at least three times), so adding a monster is three ANDs/ORs.
+
+def _add(c1: int, c2: int, c3: int, weak: int) -> Tuple[int, int, int]:
+    return c1 | weak, c2 | (c1 & weak), c3 | (c2 & weak)
+
+class SearchCandidate:
+    """One monster's search profile. Monsters with equal profiles are interchangeable."""
+
+    def __init__(self, monster, type_chart):
+        self.monster_id = monster.id
+        attack_types = {m.move_type_id for m in monster.move_pool if m.move_category in ATTACK_CATEGORIES}
+        self.weak = type_chart.weak_mask(monster.main_type_id, monster.sub_type_id)
+        self.offense = type_chart.offensive_mask(attack_types)
+        self.is_leader = monster.is_leader_form
+        style = monster.preferred_attack_style
+        self.physical = style in (models.AttackStyle.PHYSICAL, models.AttackStyle.BOTH)
+        self.magic = style in (models.AttackStyle.MAGIC, models.AttackStyle.BOTH)
+
+    @property
+    def profile(self):
+        return self.weak, self.offense, self.is_leader, self.physical, self.magic
+
+class TeamSearchResult:
+    def __init__(self, monster_ids, alternatives, team_weak_to, shared_weak_to, effective_against_types):
+        self.monster_ids = monster_ids
+        self.alternatives = alternatives
+        self.team_weak_to = team_weak_to
+        self.shared_weak_to = shared_weak_to
+        self.effective_against_types = effective_against_types
+
+class TeamSearch:
+    """Branch-and-bound over monster combinations, best `limit` lineups first.
+
+    Candidates with identical profiles are searched as one equivalence class (the
+    same class may still fill several slots), and a node is cut as soon as an
+    optimistic bound on its completions cannot beat the current limit-th best team.
+    """
+
+    def __init__(self, type_chart, monsters: Iterable, must_include: Sequence = (),
+                 leader_forms: Optional[int] = None, min_physical: int = 0, min_magic: int = 0,
+                 limit: int = 5):
+        self.type_chart = type_chart
+        self.must_include = [SearchCandidate(m, type_chart) for m in must_include]
+        fixed_ids = {c.monster_id for c in self.must_include}
+        self.leader_forms = leader_forms
+        self.min_physical = min_physical
+        self.min_magic = min_magic
+        self.limit = limit
+        self.nodes = 0
+
+        # Group interchangeable monsters; promising classes first so good teams are found early.
+        # With a fixed leader count, leader forms come first: the search then fills the
+        # leader slots before any others, and the bounds for the rest only see non-leaders.
+        classes: Dict[tuple, List[SearchCandidate]] = {}
+        for m in monsters:
+            if m.id in fixed_ids:
+                continue
+            c = SearchCandidate(m, type_chart)
+            classes.setdefault(c.profile, []).append(c)
+        leaders_first = leader_forms is not None
+        ordered = sorted(classes.values(), key=lambda cs: (
+            leaders_first and not cs[0].is_leader, cs[0].weak.bit_count(), -cs[0].offense.bit_count(), cs[0].monster_id,
+        ))
+        self.classes = ordered
+
+        # Flatten with members of a class adjacent; slot k may only reuse class of slot k-1
+        # when it takes the next member, which enumerates each multiset of classes once
+        self.items: List[SearchCandidate] = [c for cs in ordered for c in cs]
+        self.item_class = [ci for ci, cs in enumerate(ordered) for _ in cs]
+        n = len(self.items)
+
+        # Suffix aggregates for bounding: what is still reachable from item j onwards
+        # suffix_forced[j][k]: types fewer than k remaining candidates are safe from, so
+        # picking k more monsters from item j on adds at least one weakness to each
+        type_count = len(type_chart.type_ids)
+        safe_from = [0] * type_count
+        self.suffix_forced = [[0] * (TEAM_SIZE + 1) for _ in range(n + 1)]
+        for k in range(1, TEAM_SIZE + 1):
+            self.suffix_forced[n][k] = (1 << type_count) - 1
+        self.suffix_offense = [0] * (n + 1)
+        self.suffix_total = [0] * (n + 1)
+        self.suffix_leaders = [0] * (n + 1)
+        self.suffix_physical = [0] * (n + 1)
+        self.suffix_magic = [0] * (n + 1)
+        for j in range(n - 1, -1, -1):
+            c = self.items[j]
+            self.suffix_offense[j] = self.suffix_offense[j + 1] | c.offense
+            for t in range(type_count):
+                safe_from[t] += not (c.weak >> t) & 1
+            self.suffix_forced[j] = [
+                sum(1 << t for t in range(type_count) if safe_from[t] < k) for k in range(TEAM_SIZE + 1)
+            ]
+            self.suffix_total[j] = self.suffix_total[j + 1] + 1
+            self.suffix_leaders[j] = self.suffix_leaders[j + 1] + c.is_leader
+            self.suffix_physical[j] = self.suffix_physical[j + 1] + c.physical
+            self.suffix_magic[j] = self.suffix_magic[j + 1] + c.magic
+
+        self._best: List[tuple] = []  # max-heap on score via negation: (-score..., seq, picks)
+        self._seq = 0
+
+    # ---- bounds ----
+    def _feasible(self, j: int, slots: int, leaders: int, physical: int, magic: int) -> bool:
+        if slots > self.suffix_total[j]:
+            return False
+        if self.leader_forms is not None:
+            need = self.leader_forms - leaders
+            if need < 0 or need > min(slots, self.suffix_leaders[j]):
+                return False
+            if slots - need > self.suffix_total[j] - self.suffix_leaders[j]:
+                return False
+        if max(self.min_physical - physical, 0) > min(slots, self.suffix_physical[j]):
+            return False
+        if max(self.min_magic - magic, 0) > min(slots, self.suffix_magic[j]):
+            return False
+        return True
+
+    def _bound(self, j: int, slots: int, c1: int, c2: int, c3: int, offense: int):
+        # Any completion adds at least the forced weaknesses (at least m more for types in
+        # forced[slots - m + 1]) and at most the offense of all remaining candidates together
+        if slots:
+            forced = self.suffix_forced[j]
+            at_least_1 = forced[slots]
+            at_least_2 = forced[slots - 1] if slots >= 2 else 0
+            at_least_3 = forced[slots - 2] if slots >= 3 else 0
+            c3 = c3 | (c2 & at_least_1) | (c1 & at_least_2) | at_least_3
+            c2 = c2 | (c1 & at_least_1) | at_least_2
+            offense |= self.suffix_offense[j]
+        return c3.bit_count(), -offense.bit_count(), c2.bit_count()
+
+    def _worst_kept(self):
+        if len(self._best) < self.limit:
+            return None
+        neg = self._best[0]
+        return -neg[0], -neg[1], -neg[2]
+
+    # ---- search ----
+    def _dfs(self, start, slots, c1, c2, c3, offense, leaders, physical, magic, picks):
+        self.nodes += 1
+        if slots == 0:
+            score = (c3.bit_count(), -offense.bit_count(), c2.bit_count())
+            worst = self._worst_kept()
+            if worst is None or score < worst:
+                self._seq += 1
+                entry = (-score[0], -score[1], -score[2], -self._seq, list(picks))
+                if worst is None:
+                    heapq.heappush(self._best, entry)
+                else:
+                    heapq.heapreplace(self._best, entry)
+            return
+
+        for j in range(start, len(self.items)):
+            if j > start and self.item_class[j] == self.item_class[j - 1]:
+                continue  # an earlier member of this class was skipped, so this one must be too
+            if not self._feasible(j, slots, leaders, physical, magic):
+                break  # suffixes only shrink
+            worst = self._worst_kept()
+            if worst is not None and self._bound(j, slots, c1, c2, c3, offense) >= worst:
+                break  # no team drawing every remaining pick from item j on can make the cut
+            c = self.items[j]
+            n1, n2, n3 = _add(c1, c2, c3, c.weak)
+            n_offense = offense | c.offense
+            if worst is not None and self._bound(j + 1, slots - 1, n1, n2, n3, n_offense) >= worst:
+                continue
+            n_leaders, n_physical, n_magic = leaders + c.is_leader, physical + c.physical, magic + c.magic
+            if not self._feasible(j + 1, slots - 1, n_leaders, n_physical, n_magic):
+                continue
+            picks.append(j)
+            self._dfs(j + 1, slots - 1, n1, n2, n3, n_offense, n_leaders, n_physical, n_magic, picks)
+            picks.pop()
+
+    def run(self) -> List[TeamSearchResult]:
+        c1 = c2 = c3 = offense = 0
+        for c in self.must_include:
+            c1, c2, c3 = _add(c1, c2, c3, c.weak)
+            offense |= c.offense
+        slots = TEAM_SIZE - len(self.must_include)
+        leaders = sum(c.is_leader for c in self.must_include)
+        physical = sum(c.physical for c in self.must_include)
+        magic = sum(c.magic for c in self.must_include)
+        self._best = []
+        self.nodes = 0
+        if self._feasible(0, slots, leaders, physical, magic):
+            self._dfs(0, slots, c1, c2, c3, offense, leaders, physical, magic, [])
+
+        results = []
+        for entry in sorted(self._best, key=lambda e: (-e[0], -e[1], -e[2], -e[3])):
+            results.append(self._result(entry[4]))
+        return results
+
+    def _result(self, picks: List[int]) -> TeamSearchResult:
+        chosen = self.must_include + [self.items[j] for j in picks]
+        chosen_ids = {c.monster_id for c in chosen}
+        alternatives = [[] for _ in self.must_include]
+        for j in picks:
+            members = self.classes[self.item_class[j]]
+            alternatives.append([c.monster_id for c in members if c.monster_id not in chosen_ids])
+
+        weak_counts = [0] * len(self.type_chart.type_ids)
+        offense = 0
+        for c in chosen:
+            offense |= c.offense
+            for i in range(len(weak_counts)):
+                weak_counts[i] += (c.weak >> i) & 1
+        type_ids = self.type_chart.type_ids.tolist()
+        return TeamSearchResult(
+            monster_ids=[c.monster_id for c in chosen],
+            alternatives=alternatives,
+            team_weak_to=[type_ids[i] for i, n in enumerate(weak_counts) if n >= 3],
+            shared_weak_to=[type_ids[i] for i, n in enumerate(weak_counts) if n >= 2],
+            effective_against_types=[type_ids[i] for i in range(len(type_ids)) if (offense >> i) & 1],
+        )
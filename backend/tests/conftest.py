@@ -0,0 +1,121 @@
+import asyncio
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from backend import database, main, trait_synergy
+from backend.catalog import GameCatalog
+from backend.config import DATABASE_URL
+from backend.database import create_db_engine, create_async_db_engine
+from backend.game_data import DATA_DIR
+from backend.models import Base, TraitSynergyCacheEntry
+from backend.scripts.bulk_load import BulkLoader
+
+# === Scratch database ===
+# Tests that truncate, reimport or swap tables run against a throwaway database on the
+# configured server (created empty, dropped after the run), never against DATABASE_URL
+# itself. They are skipped when the role may not create databases.
+
+@pytest.fixture(scope="session")
+def scratch_engine():
+    url = make_url(DATABASE_URL)
+    name = f"{url.database}_test_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(url, isolation_level="AUTOCOMMIT")
+    try:
+        with admin.connect() as conn:
+            conn.execute(text(f'CREATE DATABASE "{name}"'))
+    except exc.DBAPIError as e:
+        admin.dispose()
+        pytest.skip(f"cannot create a scratch database: {e.orig}")
+    engine = create_db_engine("test-scratch", url.set(database=name), statement_timeout_ms=0)
+    try:
+        Base.metadata.create_all(engine)
+        yield engine
+    finally:
+        engine.dispose()
+        with admin.connect() as conn:
+            conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+        admin.dispose()
+
+@pytest.fixture(scope="session")
+def scratch_catalog_engine(scratch_engine):
+    """scratch_engine with backend/data imported, the way a fresh install is."""
+    from backend.scripts.reset_and_reimport import import_all
+    import_all(BulkLoader(scratch_engine))
+    return scratch_engine
+
+# === App on the scratch database ===
+# API tests that save teams or write the trait-synergy cache use this client: the
+# session dependencies, the startup catalog load and the stream endpoint's own
+# session all point at scratch_catalog_engine's database.
+
+@pytest.fixture(scope="module")
+def client(scratch_catalog_engine):
+    async_engine = create_async_db_engine("test-scratch-async", scratch_catalog_engine.url, statement_timeout_ms=0)
+    session_local = sessionmaker(bind=scratch_catalog_engine)
+    async_session_local = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    def get_db():
+        db = session_local()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with async_session_local() as db:
+            yield db
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(main, "SessionLocal", session_local)
+        mp.setattr(main, "AsyncSessionLocal", async_session_local)
+        mp.setattr(main, "async_engine", async_engine)
+        mp.setitem(main.app.dependency_overrides, database.get_db, get_db)
+        mp.setitem(main.app.dependency_overrides, database.get_async_db, get_async_db)
+        with TestClient(main.app) as c:
+            yield c
+
+@pytest.fixture(scope="module")
+def make_team(client):
+    """Inline team payload: the first six monsters, each with the first four moves of its pool."""
+    def make(name: str = "Test team") -> dict:
+        user_monsters = []
+        for m in client.get("/monsters/?limit=6").json():
+            pool = [mv["id"] for mv in client.get(f"/monsters/{m['id']}").json()["move_pool"]][:4]
+            user_monsters.append({
+                "monster_id": m["id"], "personality_id": 1, "legacy_type_id": 1,
+                "move1_id": pool[0], "move2_id": pool[1], "move3_id": pool[2], "move4_id": pool[3],
+                "talent": {"hp_boost": 10, "phy_atk_boost": 0, "mag_atk_boost": 10,
+                           "phy_def_boost": 0, "mag_def_boost": 0, "spd_boost": 10},
+            })
+        return {"name": name, "magic_item_id": 1, "user_monsters": user_monsters}
+    return make
+
+@pytest.fixture
+def fake_llm(monkeypatch, scratch_catalog_engine):
+    """Stub trait-synergy LLM; both cache tiers start and end empty."""
+    async def fake_generate_json(prompt):
+        await asyncio.sleep(0)
+        return {"synergy_moves": [], "recommendation": ["stub"]}
+
+    monkeypatch.setattr(trait_synergy, "generate_json", fake_generate_json)
+    trait_synergy.trait_synergy_cache.clear()
+    yield
+    trait_synergy.trait_synergy_cache.clear()
+    with Session(scratch_catalog_engine) as db:
+        db.query(TraitSynergyCacheEntry).delete()
+        db.commit()
+
+# === Static game data ===
+# The catalog built straight from backend/data (no database), for the pure-function tests
+
+@pytest.fixture(scope="session")
+def json_catalog():
+    return GameCatalog.from_json(DATA_DIR)
+
+@pytest.fixture(scope="session")
+def type_chart(json_catalog):
+    return json_catalog.type_chart
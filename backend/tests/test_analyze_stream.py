@@ -0,0 +1,150 @@
+import asyncio
+import json
+import time
+import pytest
+from sqlalchemy import event
+from backend import main, trait_synergy
+
+# Stub LLM, and a cold trait-synergy cache for every test
+pytestmark = pytest.mark.usefixtures("fake_llm")
+
+def parse_events(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+def test_analysis_returns_within_deadline_with_missing_synergies(client, make_team, monkeypatch):
+    team = make_team()
+
+    async def hung_generate_json(prompt):
+        await asyncio.sleep(30)
+
+    monkeypatch.setattr(trait_synergy, "generate_json", hung_generate_json)
+    monkeypatch.setattr(trait_synergy, "LLM_DEADLINE_MS", 200)
+    start = time.monotonic()
+    resp = client.post("/team/analyze/", json={"team": team})
+    assert time.monotonic() - start < 5
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["incomplete_synergies"] == list(range(len(team["user_monsters"])))
+    finding = body["per_monster"][0]["trait_synergies"][0]
+    assert (finding["status"], finding["recommendation"]) == ("timeout", [])
+    assert body["type_coverage"] and body["recommendations"]
+
+def test_team_synergy_mode_matches_per_monster(client, make_team, monkeypatch):
+    team = make_team()
+    prompts = []
+
+    async def generate_json(prompt):
+        prompts.append(prompt)
+        if "Slot 0:" in prompt:
+            return [{"slot": slot, "synergy_moves": [], "recommendation": ["stub"]} for slot in range(6)]
+        return {"synergy_moves": [], "recommendation": ["stub"]}
+
+    monkeypatch.setattr(trait_synergy, "generate_json", generate_json)
+    team_mode = client.post("/team/analyze/", json={"team": team, "synergy_mode": "team"}).json()
+    assert len(prompts) == 1
+
+    # Team-mode results are cached under their own keys, so this calls the LLM again
+    assert client.post("/team/analyze/", json={"team": team}).json() == team_mode
+    assert len(prompts) == 7
+
+def test_stream_assembles_to_inline_analysis(client, make_team):
+    team = make_team()
+    resp = client.post("/team/analyze/stream", json={"team": team})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+
+    events = parse_events(resp.text)
+    names = [name for name, _ in events]
+    assert names == ["analysis"] + ["trait_synergy"] * 6 + ["recommendations", "done"]
+
+    analysis = events[0][1]
+    assert all(m["trait_synergies"] == [] for m in analysis["per_monster"])
+    for _, data in events[1:7]:
+        analysis["per_monster"][data["slot"]]["trait_synergies"] = [data["finding"]]
+    analysis.update(events[7][1])
+
+    expected = client.post("/team/analyze/", json={"team": team}).json()
+    assert analysis == expected
+
+def test_stream_rejects_missing_magic_item_before_streaming(client, make_team):
+    team = make_team()
+    team["magic_item_id"] = 99999
+    resp = client.post("/team/analyze/stream", json={"team": team})
+    assert resp.status_code == 404
+
+def test_analyze_by_id_matches_inline(client, make_team):
+    team = make_team()
+    saved = client.post("/teams/", json=team).json()
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    try:
+        event.listen(main.async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            by_id = client.post("/team/analyze_by_id/", json={"team_id": saved["id"]})
+        finally:
+            event.remove(main.async_engine.sync_engine, "before_cursor_execute", record)
+        assert by_id.status_code == 200
+        # teams, user_monsters and talents: one SELECT each, however many monsters
+        team_graph = [s for s in statements if "trait_synergy_cache" not in s]
+        assert len(team_graph) == 3
+        inline = client.post("/team/analyze/", json={"team": team}).json()
+        assert by_id.json() == inline
+    finally:
+        client.delete(f"/teams/{saved['id']}")
+
+def test_analyze_by_id_unknown_team(client):
+    assert client.post("/team/analyze_by_id/", json={"team_id": 999999}).status_code == 404
+
+def test_batch_results_follow_request_order_and_share_prompts(client, make_team, monkeypatch):
+    prompts = []
+
+    async def counting_generate_json(prompt):
+        prompts.append(prompt)
+        return {"synergy_moves": [], "recommendation": ["stub"]}
+
+    monkeypatch.setattr(trait_synergy, "generate_json", counting_generate_json)
+    team = make_team()
+    saved = client.post("/teams/", json=team).json()
+    try:
+        resp = client.post("/team/analyze/batch", json={"items": [
+            {"team_id": saved["id"]},
+            {"team": team},
+            {"team_id": 999999},
+            {"team": {**team, "magic_item_id": 99999}},
+        ]})
+        assert resp.status_code == 200
+        results = resp.json()["results"]
+        assert [r["error"] for r in results] == [None, None, "Team not found", "Magic item not found"]
+        assert results[0]["team_id"] == saved["id"]
+        assert results[0]["analysis"] == results[1]["analysis"]
+        assert results[1]["analysis"] == client.post("/team/analyze/", json={"team": team}).json()
+        # Both copies of the team share the same six prompts
+        assert len(prompts) == 6
+    finally:
+        client.delete(f"/teams/{saved['id']}")
+
+def test_batch_outlives_the_interactive_deadline(client, make_team, monkeypatch):
+    async def slow_generate_json(prompt):
+        await asyncio.sleep(0.1)
+        return {"synergy_moves": [], "recommendation": ["stub"]}
+
+    # Six prompts, two at a time: three windows, well past the interactive budget
+    monkeypatch.setattr(trait_synergy, "generate_json", slow_generate_json)
+    monkeypatch.setattr(trait_synergy, "LLM_DEADLINE_MS", 150)
+    monkeypatch.setattr(main, "LLM_BATCH_CONCURRENCY", 2)
+    team = make_team()
+    resp = client.post("/team/analyze/batch", json={"items": [{"team": team}]})
+    assert resp.status_code == 200
+    analysis = resp.json()["results"][0]["analysis"]
+    assert analysis["incomplete_synergies"] == []
+    assert all(f["status"] == "ok" for m in analysis["per_monster"] for f in m["trait_synergies"])
+
+def test_batch_item_needs_exactly_one_source(client):
+    assert client.post("/team/analyze/batch", json={"items": [{}]}).status_code == 422
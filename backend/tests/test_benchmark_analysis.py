@@ -0,0 +1,20 @@
+from backend.scripts.benchmark_analysis import run_benchmark, STAGES
+from backend.timing import collect_spans, span
+
+def test_spans_only_record_inside_a_collector():
+    with span("outside"):
+        pass
+    with collect_spans() as spans:
+        with span("stage"):
+            pass
+        with span("stage"):
+            pass
+    assert set(spans) == {"stage"}
+
+def test_benchmark_runs_offline_and_reports_every_stage():
+    results = run_benchmark(teams=3, concurrency=[1, 3], llm_latency_ms=0, llm_jitter_ms=0, repeat_catalog_load=1)
+    assert results["catalog_load"]["count"] == 1
+    assert [level["concurrency"] for level in results["levels"]] == [1, 3]
+    for level in results["levels"]:
+        assert set(level["stages"]) == set(STAGES)
+        assert all(level["stages"][stage]["count"] == 3 for stage in STAGES)
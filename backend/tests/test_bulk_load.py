@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, Boolean, select
+from sqlalchemy.dialects.postgresql import ENUM, JSONB
+from backend.models import AttackStyle
+from backend.scripts.bulk_load import BulkLoader
+
+metadata = MetaData()
+scratch = Table(
+    "bulk_load_test", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(64), nullable=False, unique=True),
+    Column("style", ENUM(AttackStyle, name="preferred_attack_style_enum", create_type=False)),
+    Column("flag", Boolean, nullable=False),
+    Column("localized", JSONB),
+)
+
+@pytest.fixture(scope="module")
+def engine(scratch_engine):
+    metadata.create_all(scratch_engine)
+    yield scratch_engine
+    metadata.drop_all(scratch_engine)
+
+def rows_in(engine):
+    with engine.connect() as conn:
+        return [dict(r._mapping) for r in conn.execute(select(scratch).order_by(scratch.c.id))]
+
+@pytest.mark.parametrize("method", ["copy", "executemany"])
+def test_upsert_replace_and_update(engine, method):
+    loader = BulkLoader(engine, method=method)
+    awkward = {"zh": {"name": "毛毛\t\"\\N\"\n"}, "note": "back\\slash"}
+    loader.replace(scratch, [])
+    loader.upsert(scratch, [
+        {"name": "b", "style": AttackStyle.MAGIC, "flag": True, "localized": awkward},
+        {"name": "a", "style": None, "flag": False, "localized": None},
+        {"name": "b", "style": AttackStyle.BOTH, "flag": False, "localized": {}},
+    ], conflict=["name"])
+    first = rows_in(engine)
+    # Staging order is insert order; a repeated key keeps its first slot and its last values
+    assert [(r["name"], r["style"], r["flag"], r["localized"]) for r in first] == [
+        ("b", AttackStyle.BOTH, False, {}),
+        ("a", None, False, None),
+    ]
+
+    loader.upsert(scratch, [
+        {"name": "a", "style": AttackStyle.PHYSICAL, "flag": True, "localized": awkward},
+        {"name": "c", "style": None, "flag": True, "localized": {"empty": ""}},
+    ], conflict=["name"], update=["localized"])
+    loader.update(scratch, [{"name": "b", "flag": True}], key=["name"])
+    by_name = {r["name"]: r for r in rows_in(engine)}
+    assert by_name["a"]["id"] == first[1]["id"]
+    assert (by_name["a"]["style"], by_name["a"]["flag"], by_name["a"]["localized"]) == (None, False, awkward)
+    assert by_name["b"]["flag"] is True
+    assert by_name["c"]["localized"] == {"empty": ""}
+
+    loader.delete(scratch, [{"name": "c", "flag": False}, {"name": "missing"}], key=["name"])
+    assert [r["name"] for r in rows_in(engine)] == ["b", "a"]
+
+    assert [s.action for s in loader.stats] == ["replace", "upsert", "upsert", "update", "delete"]
+    assert {s.method for s in loader.stats} == {method}
+    assert "total" in loader.report()
+
+def test_unknown_method(engine):
+    with pytest.raises(ValueError):
+        BulkLoader(engine, method="bogus")
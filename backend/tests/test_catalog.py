@@ -0,0 +1,116 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from backend.catalog import GameCatalog
+from backend.models import Type
+from backend.config import DATABASE_URL
+
+@pytest.fixture(scope="module")
+def db_session():
+    engine = create_engine(DATABASE_URL)
+    with Session(engine) as session:
+        yield session
+
+@pytest.fixture(scope="module")
+def catalog(db_session):
+    return GameCatalog.load(db_session)
+
+def test_catalog_row_counts(db_session, catalog):
+    for table, loaded in [
+        ("types", catalog.types),
+        ("traits", catalog.traits),
+        ("personalities", catalog.personalities),
+        ("monster_species", catalog.species),
+        ("moves", catalog.moves),
+        ("monsters", catalog.monsters),
+        ("magic_items", catalog.magic_items),
+        ("game_terms", catalog.game_terms),
+        ("legacy_moves", catalog.legacy_moves),
+    ]:
+        expected = db_session.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar_one()
+        assert len(loaded) == expected, f"{table}: expected {expected}, catalog has {len(loaded)}"
+
+    pool_rows = db_session.execute(text("SELECT COUNT(*) FROM monster_moves")).scalar_one()
+    assert sum(len(m.move_pool) for m in catalog.monsters.values()) == pool_rows
+
+def test_catalog_type_relations_match_orm(db_session, catalog):
+    for typ in db_session.query(Type).all():
+        entry = catalog.types[typ.id]
+        assert entry.effective_against_ids == {t.id for t in typ.effective_against}
+        assert entry.weak_against_ids == {t.id for t in typ.weak_against}
+        assert entry.vulnerable_to_ids == {t.id for t in typ.vulnerable_to}
+        assert entry.resistant_to_ids == {t.id for t in typ.resistant_to}
+
+def test_catalog_monster_search(catalog):
+    fuzzlet = [m for m in catalog.search_monsters(name="fuzz")]
+    assert fuzzlet and all("fuzz" in m.name.lower() for m in fuzzlet)
+
+    # Localized zh names are searchable too
+    assert any(m.name == "Fuzzlet" for m in catalog.search_monsters(name="毛毛"))
+
+    leaders = catalog.search_monsters(is_leader_form=True)
+    assert leaders and all(m.is_leader_form for m in leaders)
+
+def test_catalog_is_read_only(catalog):
+    monster = next(iter(catalog.monsters.values()))
+    with pytest.raises(AttributeError):
+        monster.name = "changed"
+    with pytest.raises(TypeError):
+        catalog.monsters[monster.id] = monster
+
+def test_json_catalog_matches_database(catalog):
+    # Offline builds (benchmarks) must see the same data the importers put in the database
+    from_json = GameCatalog.from_json()
+    for attr in ("types", "traits", "personalities", "species", "moves", "monsters", "magic_items"):
+        assert dict(getattr(from_json, attr)) == dict(getattr(catalog, attr)), attr
+    assert from_json.game_terms == catalog.game_terms
+    assert dict(from_json.legacy_moves) == dict(catalog.legacy_moves)
+
+def test_catalog_version_is_content_hash(catalog):
+    assert catalog.version == GameCatalog.from_json().version
+    assert len(catalog.version) == 64
+
+def test_catalog_endpoints_revalidate_with_etag():
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    with TestClient(app) as client:
+        first = client.get("/types/")
+        etag = first.headers["etag"]
+        assert etag == f'"{app.state.catalog.version}"'
+        assert "max-age" in first.headers["cache-control"]
+
+        for path in ["/types/", "/moves/?has_counter=true", "/monsters/1"]:
+            cached = client.get(path, headers={"If-None-Match": etag})
+            assert cached.status_code == 304
+            assert cached.content == b""
+            assert cached.headers["etag"] == etag
+
+        assert client.get("/types/", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+        stale = client.get("/types/", headers={"If-None-Match": '"other"'})
+        assert stale.status_code == 200
+        assert stale.json() == first.json()
+
+def test_rendered_lists_match_schema_serialization(catalog):
+    import json
+    from pydantic import TypeAdapter
+    from backend import schemas
+    from backend.catalog_responses import RenderedCatalog
+    from backend.models import MoveCategory
+
+    def serialize(schema, entries):
+        adapter = TypeAdapter(list[schema])
+        return adapter.dump_python(adapter.validate_python(list(entries), from_attributes=True), mode="json")
+
+    rendered = RenderedCatalog(catalog)
+    assert json.loads(rendered.types) == serialize(schemas.TypeOut, catalog.types.values())
+    for filters in [{}, {"move_type_id": 3}, {"move_category": MoveCategory.STATUS}, {"has_counter": True},
+                    {"is_move_stone": False}, {"move_type_id": 3, "has_counter": True}, {"name": "fire"},
+                    {"limit": 5, "offset": 10}, {"move_type_id": 3, "limit": 2}]:
+        limit, offset = filters.pop("limit", None), filters.pop("offset", 0)
+        expected = catalog.search_moves(**filters)[offset:None if limit is None else offset + limit]
+        assert json.loads(rendered.moves(**filters, limit=limit, offset=offset)) == \
+            serialize(schemas.MoveLiteOut, expected)
+    for filters in [{}, {"type_id": 2}, {"type_id": 2, "is_leader_form": True}, {"trait_id": 1}]:
+        expected = catalog.search_monsters(**filters)
+        assert json.loads(rendered.monsters(**filters)) == serialize(schemas.MonsterLiteOut, expected)
@@ -0,0 +1,63 @@
+import threading
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import exc, text
+from backend.database import create_db_engine
+from backend.db_metrics import REGISTRY
+from backend.timing import Histogram
+from backend.main import app
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram(buckets=(1, 10))
+    for ms in (0.5, 1, 5, 50):
+        h.observe(ms)
+    snap = h.snapshot()
+    assert snap["buckets"] == {"1": 2, "10": 3, "+Inf": 4}
+    assert (snap["count"], snap["sum_ms"], snap["max_ms"]) == (4, 56.5, 50)
+
+def test_engine_settings_and_pool_metrics():
+    engine = create_db_engine("metrics-test", pool_size=1, max_overflow=0, pool_timeout=0.2,
+                              statement_timeout_ms=1500, search_path="public")
+    try:
+        with engine.connect() as conn:
+            settings = conn.execute(text(
+                "SELECT current_setting('application_name'), current_setting('statement_timeout')"
+            )).one()
+            assert settings[0].endswith(":metrics-test")
+            assert settings[1] == "1500ms"
+            conn.execute(text("SELECT 1")).all()
+
+            # The only connection is checked out, so a second checkout waits and times out
+            errors = []
+            def second_checkout():
+                try:
+                    engine.connect().close()
+                except exc.TimeoutError as e:
+                    errors.append(e)
+            t = threading.Thread(target=second_checkout)
+            t.start()
+            t.join()
+            assert errors
+
+        snap = REGISTRY["metrics-test"].snapshot()
+        assert snap["pool"]["checked_out"] == 0 and snap["pool"]["size"] == 1
+        assert snap["pool"]["checkout_timeouts"] == 1
+        assert snap["checkout_wait_ms"]["count"] == 2
+        assert snap["checkout_wait_ms"]["max_ms"] >= 200
+        assert snap["query_ms"]["select"]["count"] >= 2
+    finally:
+        engine.dispose()
+
+def test_metrics_endpoint_reports_api_engines(client):
+    client.get("/teams/summary")
+    body = client.get("/metrics/db").json()["engines"]
+    assert {"api", "api-async"} <= set(body)
+    api = body["api"]
+    assert set(api["pool"]) >= {"checked_out", "overflow", "checkout_timeouts"}
+    assert api["query_ms"]["select"]["count"] >= 1
+    assert api["checkout_wait_ms"]["buckets"]["+Inf"] == api["checkout_wait_ms"]["count"]
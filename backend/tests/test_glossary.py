@@ -0,0 +1,49 @@
+import pytest
+from backend.catalog import GameCatalog, GameTermEntry
+from backend.glossary import GlossaryIndex
+from backend.trait_synergy import TraitSynergyRequest
+
+class Dummy:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+def term(i, key, description):
+    return GameTermEntry(id=i, key=key, description=description, localized={})
+
+TERMS = [
+    term(1, "Marks", "Team-wide effects."),
+    term(2, "Poison Mark", "Take damage each turn; turns into Poison when removed."),
+    term(3, "Poison", "Lose HP each turn."),
+    term(4, "Buffs", "Stat increases."),
+    term(5, "Combo", "Hits several times."),
+]
+
+@pytest.fixture(scope="module")
+def catalog():
+    return GameCatalog.from_json()
+
+def test_mentions_match_whole_words_and_pull_in_referenced_terms():
+    moves = [
+        Dummy(id=10, description="Applies 2 stacks of Poison Mark."),
+        Dummy(id=11, description="Gains buffs; 2 combos."),
+        Dummy(id=12, description="Poisonous-looking but combative."),
+    ]
+    index = GlossaryIndex(TERMS, moves, [Dummy(id=7, description="Buffed allies heal.")])
+    assert index.term_keys(7, [10]) == ["Marks", "Poison Mark", "Poison", "Buffs"]
+    assert index.term_keys(7, [11, 12]) == ["Buffs", "Combo"]
+    assert index.term_keys(99, [12]) == []
+    assert index.render(7, []) == "- Buffs: Stat increases."
+
+def test_prompts_only_carry_relevant_terms(catalog):
+    full = "\n".join(f"- {t.key}: {t.description}" for t in catalog.game_terms)
+    monster = next(m for m in catalog.monsters.values() if len(m.move_pool) >= 4)
+    trait, moves = catalog.traits[monster.trait_id], list(monster.move_pool[:4])
+    glossary = catalog.glossary.render(trait.id, [m.id for m in moves])
+    assert len(glossary) < len(full)
+    for line in filter(None, glossary.split("\n")):
+        assert line in full
+
+    prompt = TraitSynergyRequest(monster, trait, moves, "Physical", glossary).prompt()
+    for t in catalog.game_terms:
+        mentioned = t.key in catalog.glossary.term_keys(trait.id, [m.id for m in moves])
+        assert (f"- {t.key}: {t.description}" in prompt) == mentioned
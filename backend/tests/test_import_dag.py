@@ -0,0 +1,49 @@
+import time
+import pytest
+from backend.scripts.bulk_load import BulkLoader, LoadStats
+from backend.scripts.import_dag import Step, check_steps, run_steps
+from backend.scripts.reset_and_reimport import IMPORT_STEPS
+
+def sleeper(name, seconds, log, rows=1):
+    def run(loader):
+        log.append(("start", name))
+        time.sleep(seconds)
+        loader.stats.append(LoadStats(name, "upsert", rows, seconds, loader.method))
+        log.append(("end", name))
+    return run
+
+def test_independent_steps_overlap_and_dependencies_wait():
+    log = []
+    steps = [
+        Step("a", sleeper("a", 0.2, log)),
+        Step("b", sleeper("b", 0.2, log, rows=3)),
+        Step("c", sleeper("c", 0.05, log), deps=["a", "b"]),
+    ]
+    loader = BulkLoader(None)
+    start = time.perf_counter()
+    reports = {r.name: r for r in run_steps(steps, loader, workers=4)}
+    wall = time.perf_counter() - start
+
+    assert wall < 0.4  # a and b ran side by side
+    assert log.index(("start", "c")) > max(log.index(("end", "a")), log.index(("end", "b")))
+    assert reports["b"].rows == 3
+    assert reports["c"].started >= reports["a"].started + reports["a"].seconds
+    assert sorted(s.table for s in loader.stats) == ["a", "b", "c"]
+
+def test_failed_step_stops_dependents():
+    log = []
+    def fail(loader):
+        raise RuntimeError("boom")
+    steps = [Step("bad", fail), Step("slow", sleeper("slow", 0.05, log)), Step("after", sleeper("after", 0, log), deps=["bad"])]
+    with pytest.raises(RuntimeError, match="boom"):
+        run_steps(steps, BulkLoader(None), workers=2)
+    assert ("start", "after") not in log
+    assert ("end", "slow") in log
+
+def test_check_steps_rejects_bad_graphs():
+    noop = lambda loader: None
+    with pytest.raises(ValueError, match="unknown"):
+        check_steps([Step("a", noop, deps=["missing"])])
+    with pytest.raises(ValueError, match="cycle"):
+        check_steps([Step("a", noop, deps=["b"]), Step("b", noop, deps=["a"])])
+    check_steps(IMPORT_STEPS)
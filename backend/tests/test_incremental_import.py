@@ -0,0 +1,78 @@
+import json
+import shutil
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from backend.catalog import GameCatalog
+from backend.game_data import DATA_DIR
+from backend.scripts import incremental_import
+from backend.scripts.bulk_load import BulkLoader
+
+@pytest.fixture(scope="module")
+def engine(scratch_catalog_engine):
+    return scratch_catalog_engine
+
+def catalog_version(engine):
+    with Session(engine) as session:
+        return GameCatalog.load(session).version
+
+def edit(data_dir, filename, change):
+    path = data_dir / filename
+    data = json.loads(path.read_text(encoding="utf-8"))
+    change(data)
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+def test_source_diff_classifies_records():
+    diff = incremental_import.SourceDiff("moves.json", [], "h", {"a": "1", "b": "2", "c": "3"},
+                                         {"a": "1", "b": "x", "d": "4"}, unchanged_file=False)
+    assert (diff.added, diff.updated, diff.removed) == (["c"], ["b"], ["d"])
+    assert incremental_import.ENTITY_BY_SOURCE["monsters.json"].record_key({"name": "Dino"}) == '["Dino", "default"]'
+
+def test_incremental_import_applies_only_changes(engine, tmp_path):
+    # Bring the database and manifest in line with backend/data first
+    incremental_import.run(BulkLoader(engine))
+    baseline = catalog_version(engine)
+    assert baseline == GameCatalog.from_json().version
+
+    data_dir = tmp_path / "data"
+    shutil.copytree(DATA_DIR, data_dir)
+    edit(data_dir, "moves.json", lambda moves: (
+        moves[0].update(description="Patched description."),
+        moves.append({**moves[0], "name": "Incremental Test Move", "localized": {}}),
+    ))
+    edit(data_dir, "monster_moves.json", lambda sets: (
+        sets["Flutterfly"]["learnable_moves"].append("Incremental Test Move"),
+        sets["Flutterfly"]["legacy_moves"].__setitem__(0, "Focus"),
+    ))
+    edit(data_dir, "types.json", lambda types: types[1]["effective_against"].pop())
+
+    try:
+        loader = BulkLoader(engine)
+        diffs = incremental_import.run(loader, str(data_dir))
+        assert (len(diffs["moves.json"].added), len(diffs["moves.json"].updated)) == (1, 1)
+        assert not diffs["monsters.json"].changed and not diffs["traits.json"].changed
+        rows = {(s.table, s.action): s.rows for s in loader.stats}
+        assert rows[("moves", "upsert")] == 2
+        assert rows[("type_effective_against", "delete")] == 1
+        assert ("monsters", "upsert") not in rows
+
+        with Session(engine) as session:
+            catalog = GameCatalog.load(session)
+        moves = {mv.name: mv for mv in catalog.moves.values()}
+        flutterfly = next(m for m in catalog.monsters.values() if m.name == "Flutterfly")
+        assert moves["Focus"].description == "Patched description."
+        assert moves["Incremental Test Move"] in flutterfly.move_pool
+        assert catalog.legacy_moves[(flutterfly.id, catalog.types_by_name["Normal"].id)].move_id == moves["Focus"].id
+        assert catalog.version != baseline
+        assert incremental_import.run(BulkLoader(engine), str(data_dir))["moves.json"].changed is False
+    finally:
+        loader = BulkLoader(engine)
+        diffs = incremental_import.run(loader)
+
+    # Reverting deletes the added move after its monster_moves row
+    assert diffs["moves.json"].removed == ['["Incremental Test Move"]']
+    actions = [(s.table, s.action) for s in loader.stats]
+    assert actions.index(("monster_moves", "delete")) < actions.index(("moves", "delete"))
+    assert catalog_version(engine) == baseline
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM moves WHERE name = 'Incremental Test Move'")).scalar_one() == 0
@@ -0,0 +1,130 @@
+import asyncio
+import gc
+import pytest
+from backend.llm import LLMDispatcher
+
+class FakeLLM:
+    def __init__(self, delay=0.01, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.cancelled = 0
+
+    async def __call__(self, prompt):
+        self.calls.append(prompt)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+        if self.fail:
+            raise RuntimeError("boom")
+        return {"prompt": prompt}
+
+def test_global_limit_caps_concurrent_calls():
+    dispatcher, llm = LLMDispatcher(max_concurrency=3), FakeLLM()
+
+    async def scenario():
+        tasks = [asyncio.ensure_future(dispatcher.run(f"p{i}", llm)) for i in range(10)]
+        await asyncio.sleep(0.001)
+        depth = dispatcher.queued
+        return depth, await asyncio.gather(*tasks)
+
+    depth, results = asyncio.run(scenario())
+    assert depth == 7
+    assert llm.max_active == 3
+    assert [r["prompt"] for r in results] == [f"p{i}" for i in range(10)]
+    assert (dispatcher.calls, dispatcher.queued, dispatcher.active) == (10, 0, 0)
+    assert dispatcher.queue_wait.snapshot()["count"] == 10
+
+def test_identical_prompts_share_one_call():
+    dispatcher, llm = LLMDispatcher(max_concurrency=4), FakeLLM()
+
+    async def scenario():
+        results = await asyncio.gather(*(dispatcher.run("same", llm) for _ in range(5)), dispatcher.run("other", llm))
+        # Finished calls are not reused: a later identical prompt calls again
+        return results, await dispatcher.run("same", llm)
+
+    results, again = asyncio.run(scenario())
+    assert results[:5] == [{"prompt": "same"}] * 5
+    assert llm.calls == ["same", "other", "same"]
+    assert dispatcher.coalesced == 4
+    assert again == {"prompt": "same"}
+
+def test_coalescing_is_per_call_function():
+    dispatcher, first, second = LLMDispatcher(), FakeLLM(), FakeLLM()
+
+    async def scenario():
+        return await asyncio.gather(dispatcher.run("same", first), dispatcher.run("same", second))
+
+    asyncio.run(scenario())
+    assert (first.calls, second.calls, dispatcher.coalesced) == (["same"], ["same"], 0)
+
+def test_errors_reach_every_waiter():
+    dispatcher, llm = LLMDispatcher(), FakeLLM(fail=True)
+
+    async def scenario():
+        return await asyncio.gather(*(dispatcher.run("bad", llm) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert (len(llm.calls), dispatcher.errors) == (1, 1)
+
+def test_shared_call_survives_until_last_waiter_leaves():
+    dispatcher, llm = LLMDispatcher(), FakeLLM(delay=0.05)
+
+    async def scenario():
+        first = asyncio.ensure_future(dispatcher.run("p", llm))
+        second = asyncio.ensure_future(dispatcher.run("p", llm))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == {"prompt": "p"}
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        lonely = asyncio.ensure_future(dispatcher.run("q", llm))
+        await asyncio.sleep(0.01)
+        lonely.cancel()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    assert llm.calls == ["p", "q"]
+    assert llm.cancelled == 1
+    assert dispatcher.active == 0
+
+def test_failure_after_every_waiter_left_is_not_reported_unretrieved():
+    dispatcher = LLMDispatcher()
+
+    async def call(prompt):
+        # Like an HTTP client that turns cancellation into its own error
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            raise RuntimeError("client closed")
+
+    async def scenario():
+        reports = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: reports.append(context["message"]))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(dispatcher.run("p", call), 0.01)
+        await asyncio.sleep(0.01)
+        gc.collect()
+        return reports
+
+    assert asyncio.run(scenario()) == []
+
+def test_dispatcher_works_across_event_loops():
+    dispatcher, llm = LLMDispatcher(max_concurrency=1), FakeLLM(delay=0)
+
+    async def scenario():
+        await asyncio.wait_for(asyncio.gather(dispatcher.run("a", llm), dispatcher.run("b", llm)), 1)
+
+    for _ in range(2):
+        asyncio.run(scenario())
+    assert len(llm.calls) == 4
@@ -0,0 +1,73 @@
+import itertools
+import random
+from backend import models
+from backend.analysis import compute_energy_profile, compute_counter_coverage, compute_defense_status_move
+from backend.moveset_optimizer import MovesetOptimizer, move_features
+
+class Dummy:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+def random_pool(type_chart, rng, n):
+    type_ids = type_chart.type_ids.tolist()
+    return [
+        Dummy(
+            id=mid,
+            name=f"Move {mid}",
+            move_type_id=rng.choice(type_ids[:6]),  # few types so equal feature vectors occur
+            move_category=rng.choice(list(models.MoveCategory)),
+            has_counter=rng.random() < 0.3,
+            energy_cost=rng.randint(0, 5),
+            description=rng.choice(["Deals damage.", "Gain 2 energy.", ""]),
+        )
+        for mid in range(1, n + 1)
+    ]
+
+def reference_score(type_chart, moves, goals):
+    # Scored from the analysis helpers themselves
+    attack = {models.MoveCategory.PHY_ATTACK, models.MoveCategory.MAG_ATTACK}
+    offense = type_chart.offensive_vector(m.move_type_id for m in moves if m.move_category in attack) & type_chart.coverable
+    counters = compute_counter_coverage(moves)
+    flags = counters.has_attack_counter_status + counters.has_defense_counter_attack + counters.has_status_counter_defense
+    avg = sum(m.energy_cost for m in moves) / len(moves)
+    assert round(avg, 2) == compute_energy_profile(moves).avg_energy_cost
+    ds = compute_defense_status_move(moves).defense_status_move_count
+    return (goals["coverage"] * int(offense.sum()) - goals["energy"] * avg
+            + goals["counters"] * flags + goals["defense_status"] * ds), ds, avg
+
+def test_optimizer_matches_brute_force(type_chart):
+    rng = random.Random(11)
+    for _ in range(15):
+        pool = random_pool(type_chart, rng, rng.randint(6, 16))
+        goals = {
+            "coverage": rng.choice([0.0, 1.0, 2.0]),
+            "energy": rng.choice([0.0, 0.5, 3.0]),
+            "counters": rng.choice([0.0, 1.0]),
+            "defense_status": rng.choice([-1.0, 0.0, 1.5]),
+        }
+        min_ds, max_ds = sorted(rng.sample(range(5), 2))
+        max_avg = rng.choice([None, 2.0, 3.5])
+        limit = rng.choice([1, 5, 25])
+
+        # Sets that only swap interchangeable moves count once (the rest are alternatives)
+        expected = {}
+        for combo in itertools.combinations(pool, 4):
+            score, ds, avg = reference_score(type_chart, combo, goals)
+            if min_ds <= ds <= max_ds and (max_avg is None or avg <= max_avg):
+                expected[tuple(sorted(move_features(m, type_chart) for m in combo))] = round(score, 4)
+        expected = sorted(expected.values(), reverse=True)[:limit]
+
+        results = MovesetOptimizer(pool, type_chart, min_defense_status=min_ds, max_defense_status=max_ds,
+                                   max_avg_energy=max_avg, limit=limit, **goals).run()
+        for r in results:
+            assert r.score == round(reference_score(type_chart, r.moves, goals)[0], 4)
+        assert [r.score for r in results] == expected
+
+def test_interchangeable_moves_become_alternatives(type_chart):
+    base = dict(move_type_id=2, move_category=models.MoveCategory.PHY_ATTACK, has_counter=False,
+                energy_cost=1, description="")
+    pool = [Dummy(id=i, name=f"Move {i}", **base) for i in range(1, 7)]
+    results = MovesetOptimizer(pool, type_chart, limit=10).run()
+    assert len(results) == 1  # every 4-move choice is equivalent
+    assert [m.id for m in results[0].moves] == [1, 2, 3, 4]
+    assert results[0].alternatives == [[5, 6]] * 4
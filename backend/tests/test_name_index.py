@@ -0,0 +1,55 @@
+import pytest
+from fastapi.testclient import TestClient
+from backend.catalog import GameCatalog, _monster_search_fields, _move_search_fields
+from backend.main import app
+from backend.name_index import NameIndex, EXACT, PREFIX, WORD_PREFIX, SUBSTRING, FUZZY
+
+@pytest.fixture(scope="module")
+def catalog():
+    return GameCatalog.from_json()
+
+def test_contains_matches_substring_scan(catalog):
+    for term in ["a", "De", "fir", "ault", "lea", "毛", "聚能", "z z", "", "nothing-like-this"]:
+        folded = term.casefold()
+        expected = {m.id for m in catalog.monsters.values()
+                    if any(folded in f.casefold() for f in _monster_search_fields(m))}
+        assert catalog.monster_names.contains(term) == expected
+        expected = {mv.id for mv in catalog.moves.values()
+                    if any(folded in f.casefold() for f in _move_search_fields(mv))}
+        assert catalog.move_names.contains(term) == expected
+
+def test_search_ranks_matches():
+    index = NameIndex({
+        1: ["Fire Claw", "火爪"],
+        2: ["Blow Fire"],
+        3: ["Fire"],
+        4: ["Bonfire"],
+        5: ["Water Gun"],
+    })
+    ranked = [(m.entry_id, m.rank) for m in index.search("fire")]
+    assert ranked == [(3, EXACT), (1, PREFIX), (2, WORD_PREFIX), (4, SUBSTRING)]
+    assert [m.field for m in index.search("爪")] == ["火爪"]
+    assert index.search("fire", limit=2)[1].entry_id == 1
+
+def test_search_tolerates_typos():
+    index = NameIndex({1: ["Electric Arc"], 2: ["Water Gun"]})
+    matches = index.search("eletric")
+    assert [(m.entry_id, m.rank) for m in matches] == [(1, FUZZY)]
+    assert 0.5 <= matches[0].similarity < 1
+    assert index.search("eletric", fuzzy=False) == []
+    assert index.search("elx") == []
+
+def test_move_search_matches_zh_names(catalog):
+    move = next(mv for mv in catalog.moves.values() if mv.localized.get("zh", {}).get("name"))
+    assert move in catalog.search_moves(name=move.localized["zh"]["name"])
+
+def test_autocomplete_endpoint():
+    with TestClient(app) as client:
+        results = client.get("/search/autocomplete", params={"q": "fuzz"}).json()
+        assert results[0] == {
+            "kind": "monster", "id": results[0]["id"], "name": "Fuzzlet", "form": results[0]["form"],
+            "localized": results[0]["localized"], "matched": "Fuzzlet", "fuzzy": False,
+        }
+        moves = client.get("/search/autocomplete", params={"q": "fire", "kind": "move", "limit": 3}).json()
+        assert len(moves) == 3 and all(r["kind"] == "move" for r in moves)
+        assert client.get("/search/autocomplete", params={"q": ""}).status_code == 422
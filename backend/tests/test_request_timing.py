@@ -0,0 +1,43 @@
+import pytest
+from backend.timing import STAGE_HISTOGRAMS, server_timing
+
+def server_timing_stages(header):
+    return {part.split(";")[0]: float(part.split("dur=")[1]) for part in header.split(", ")}
+
+def test_server_timing_header_format():
+    assert server_timing({"llm": 0.01234, "total": 0.5}) == "llm;dur=12.3, total;dur=500.0"
+
+@pytest.mark.usefixtures("fake_llm")
+def test_analysis_reports_stages_in_header_and_histograms(client, make_team):
+    team = make_team("Stream")
+    resp = client.post("/team/analyze/", json={"team": team})
+    assert resp.status_code == 200
+    assert resp.json()["team"]["name"] == "Stream"
+
+    stages = server_timing_stages(resp.headers["server-timing"])
+    assert {"per_monster", "type_coverage", "llm", "recommendations", "serialization", "total"} <= set(stages)
+    assert stages["total"] >= stages["llm"]
+
+    endpoint = "POST /team/analyze/"
+    assert STAGE_HISTOGRAMS[(endpoint, "llm")].snapshot()["count"] >= 1
+    saved = client.post("/teams/", json=team).json()
+    try:
+        resp = client.post("/team/analyze_by_id/", json={"team_id": saved["id"]})
+        assert "db_load" in server_timing_stages(resp.headers["server-timing"])
+    finally:
+        client.delete(f"/teams/{saved['id']}")
+
+def test_metrics_endpoint_is_prometheus_text(client):
+    client.get("/types/")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert "# TYPE roco_request_stage_seconds histogram" in body
+    assert 'roco_request_stage_seconds_count{endpoint="GET /types/",stage="total"}' in body
+    assert 'roco_request_stage_seconds_bucket{endpoint="GET /types/",stage="total",le="+Inf"}' in body
+    assert 'roco_db_query_seconds_bucket{engine="api",verb="select",le="0.001"}' in body
+    assert "roco_db_pool_checked_out{engine=\"api\"}" in body
+    assert "# TYPE roco_db_pool_checkout_timeouts_total counter" in body
+    assert "# TYPE roco_llm_queue_depth gauge" in body
+    assert "roco_llm_coalesced_total " in body
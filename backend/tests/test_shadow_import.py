@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from backend.catalog import GameCatalog
+from backend.scripts import shadow_import
+from backend.scripts.shadow_import import SHADOW_SCHEMA
+
+@pytest.fixture(scope="module")
+def engine(scratch_catalog_engine):
+    # The swap renames live tables, so it only ever runs against the scratch database
+    return scratch_catalog_engine
+
+def catalog_version(engine):
+    with Session(engine) as session:
+        return GameCatalog.load(session).version
+
+def monsters_oid(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT 'public.monsters'::regclass::oid")).scalar()
+
+def fk_target(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT confrelid FROM pg_constraint WHERE conname = :n"), {"n": name}).scalar()
+
+@pytest.fixture
+def user_monster_fk(engine):
+    # Saved teams reference the catalog through a real foreign key (create_all made it)
+    with engine.connect() as conn:
+        name = conn.execute(text(
+            "SELECT conname FROM pg_constraint WHERE conrelid = 'public.user_monsters'::regclass "
+            "AND confrelid = 'public.monsters'::regclass"
+        )).scalar_one()
+    return name
+
+def test_validate_reports_broken_shadow(engine):
+    assert shadow_import.run(swap=False, engine=engine) == []
+    shadow_engine = shadow_import.schema_engine(SHADOW_SCHEMA, engine.url)
+    try:
+        with shadow_engine.begin() as conn:
+            conn.execute(text("DELETE FROM legacy_moves WHERE type_id = (SELECT id FROM types WHERE name = 'Fire')"))
+            conn.execute(text("DELETE FROM type_weak_against WHERE type_id = (SELECT id FROM types WHERE name = 'Fire')"))
+        problems = shadow_import.validate(shadow_engine)
+    finally:
+        shadow_engine.dispose()
+        with engine.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA IF EXISTS "{SHADOW_SCHEMA}" CASCADE'))
+    assert any(p.startswith("legacy_moves:") for p in problems)
+    assert any(p.startswith("type_weak_against:") for p in problems)
+
+def test_swap_keeps_ids_and_repoints_foreign_keys(engine, user_monster_fk):
+    version, live_oid = catalog_version(engine), monsters_oid(engine)
+    assert shadow_import.run(engine=engine) == []
+
+    # Same ids and content, new tables; the user FK follows the new monsters table
+    assert catalog_version(engine) == version
+    assert monsters_oid(engine) != live_oid
+    assert fk_target(engine, user_monster_fk) == monsters_oid(engine)
+
+    shadow_import.rollback(engine)
+    assert monsters_oid(engine) == live_oid
+    assert fk_target(engine, user_monster_fk) == live_oid
+    assert catalog_version(engine) == version
+
+def test_swap_requires_complete_schema(engine):
+    with pytest.raises(ValueError):
+        shadow_import.swap_in(engine, SHADOW_SCHEMA, shadow_import.PREVIOUS_SCHEMA)
@@ -1,5 +1,9 @@
 import pytest
+import random
 from backend.main import compute_effective_stats
+from backend.stat_engine import (
+    STAT_FIELDS, BASE_STAT_ATTRS, PERSONALITY_ATTRS, TALENT_ATTRS, StatTables, compute_effective_stats_batch, talent_matrix,
+)
 
 class Dummy:
     def __init__(self, **kwargs):
@@ -140,4 +144,38 @@ def test_effective_stats_starlion_modest_random_boosts():
     assert stats.mag_atk == 296
     assert stats.phy_def == 166
     assert stats.mag_def == 188
-    assert stats.spd == 268
\ No newline at end of file
+    assert stats.spd == 268
+
+# === Batch engine must match the scalar computation bit-for-bit ===
+BATCH_CASES = [
+    # (base stats, talent, personality modifiers, expected) in STAT_FIELDS order
+    ((55, 54, 55, 71, 75, 140), (10, 10, 0, 0, 0, 10), (0, 0, -0.1, 0, 0, 0.2), (340, 185, 114, 138, 143, 326)),
+    ((55, 54, 55, 71, 75, 140), (0, 8, 0, 7, 0, 9), (0, 0, -0.1, 0, 0, 0.2), (264, 172, 114, 184, 143, 318)),
+    ((67, 117, 117, 96, 116, 135), (10, 0, 10, 0, 0, 10), (0, -0.1, 0, 0, 0, 0.2), (360, 175, 255, 166, 188, 320)),
+    ((67, 117, 117, 96, 116, 135), (0, 8, 10, 0, 0, 9), (0, -0.1, 0.2, 0, 0, 0), (284, 223, 296, 166, 188, 268)),
+]
+
+def test_effective_stats_batch_known_cases():
+    stats = compute_effective_stats_batch(
+        [case[0] for case in BATCH_CASES],
+        [case[2] for case in BATCH_CASES],
+        [case[1] for case in BATCH_CASES],
+    )
+    assert [tuple(row) for row in stats.tolist()] == [case[3] for case in BATCH_CASES]
+
+def test_effective_stats_batch_matches_scalar():
+    rng = random.Random(42)
+    mods = (-0.1, 0, 0.1, 0.2)
+    monsters, personalities, talents = [], [], []
+    for i in range(2000):
+        monsters.append(Dummy(id=i, **{a: rng.randint(20, 160) for a in BASE_STAT_ATTRS}))
+        personalities.append(Dummy(id=i, **{a: rng.choice(mods) for a in PERSONALITY_ATTRS}))
+        talents.append(Dummy(**{a: rng.choice((0, 7, 8, 9, 10)) for a in TALENT_ATTRS}))
+
+    tables = StatTables(monsters, personalities)
+    ids = [m.id for m in monsters]
+    stats = tables.compute(ids, ids, talent_matrix(talents))
+
+    for row, monster, personality, talent in zip(stats.tolist(), monsters, personalities, talents):
+        expected = compute_effective_stats(monster, personality, talent)
+        assert dict(zip(STAT_FIELDS, row)) == expected.model_dump()
@@ -0,0 +1,88 @@
+import itertools
+import random
+from backend import models
+from backend.team_search import TeamSearch
+
+class Dummy:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+def random_monsters(type_chart, rng, n):
+    type_ids = type_chart.type_ids.tolist()
+    categories = list(models.MoveCategory)
+    monsters = []
+    for mid in range(1, n + 1):
+        main_id = rng.choice(type_ids)
+        moves = [Dummy(move_type_id=rng.choice(type_ids), move_category=rng.choice(categories)) for _ in range(4)]
+        monsters.append(Dummy(
+            id=mid,
+            main_type_id=main_id,
+            sub_type_id=rng.choice([None] + [tid for tid in type_ids if tid != main_id]),
+            move_pool=moves,
+            is_leader_form=rng.random() < 0.2,
+            preferred_attack_style=rng.choice(list(models.AttackStyle)),
+        ))
+    return monsters
+
+def reference_score(type_chart, team):
+    # Score straight from TypeChart.team_coverage, the function /team/analyze uses
+    attack_types = {m.move_type_id for t in team for m in t.move_pool
+                    if m.move_category in (models.MoveCategory.PHY_ATTACK, models.MoveCategory.MAG_ATTACK)}
+    report = type_chart.team_coverage([(t.main_type_id, t.sub_type_id) for t in team], attack_types)
+    weak_counts = sum(type_chart.defensive_profile(t.main_type_id, t.sub_type_id)[0].astype(int) for t in team)
+    coverage = int(type_chart.coverable.sum()) - len(report["weak_against_types"])
+    return len(report["team_weak_to"]), -coverage, int((weak_counts >= 2).sum())
+
+def allowed(team, must_include, leader_forms, min_physical, min_magic):
+    physical = sum(t.preferred_attack_style in (models.AttackStyle.PHYSICAL, models.AttackStyle.BOTH) for t in team)
+    magic = sum(t.preferred_attack_style in (models.AttackStyle.MAGIC, models.AttackStyle.BOTH) for t in team)
+    return (
+        all(m in team for m in must_include)
+        and (leader_forms is None or sum(t.is_leader_form for t in team) == leader_forms)
+        and physical >= min_physical and magic >= min_magic
+    )
+
+def test_search_matches_brute_force(type_chart):
+    rng = random.Random(7)
+    for _ in range(12):
+        monsters = random_monsters(type_chart, rng, 13)
+        # Duplicate a couple of profiles so equivalence classes get exercised
+        monsters.append(Dummy(**{**monsters[0].__dict__, "id": 100}))
+        monsters.append(Dummy(**{**monsters[0].__dict__, "id": 101}))
+        must_include = rng.sample(monsters, rng.randint(0, 2))
+        leader_forms = rng.choice([None, 0, 1, 2])
+        min_physical, min_magic = rng.randint(0, 3), rng.randint(0, 3)
+        limit = rng.choice([1, 3, 10])
+
+        # Lineups that only swap one twin for another count once (the twin is an alternative)
+        canonical = {100: monsters[0].id, 101: monsters[0].id}
+        lineups = {
+            tuple(sorted(canonical.get(t.id, t.id) for t in team)): reference_score(type_chart, team)
+            for team in itertools.combinations(monsters, 6)
+            if allowed(team, must_include, leader_forms, min_physical, min_magic)
+        }
+        expected = sorted(lineups.values())[:limit]
+
+        by_id = {m.id: m for m in monsters}
+        results = TeamSearch(type_chart, monsters, must_include=must_include, leader_forms=leader_forms,
+                             min_physical=min_physical, min_magic=min_magic, limit=limit).run()
+        teams = [[by_id[mid] for mid in r.monster_ids] for r in results]
+        assert [reference_score(type_chart, team) for team in teams] == expected
+        assert len({tuple(sorted(canonical.get(mid, mid) for mid in r.monster_ids)) for r in results}) == len(results)
+        for r, team in zip(results, teams):
+            assert len(set(r.monster_ids)) == 6
+            assert allowed(team, must_include, leader_forms, min_physical, min_magic)
+            assert len(r.team_weak_to) == reference_score(type_chart, team)[0]
+
+def test_equivalent_monsters_are_listed_as_alternatives(type_chart):
+    rng = random.Random(3)
+    monsters = random_monsters(type_chart, rng, 10)
+    twins = [Dummy(**{**monsters[4].__dict__, "id": 90 + k}) for k in range(3)]
+    results = TeamSearch(type_chart, monsters + twins, must_include=[monsters[0]], limit=20).run()
+    for r in results:
+        assert r.alternatives[0] == []  # must-include slots are fixed
+        for mid, alts in zip(r.monster_ids, r.alternatives):
+            if mid in (monsters[4].id, 90, 91, 92):
+                assert set(alts) == {monsters[4].id, 90, 91, 92} - set(r.monster_ids)
+            else:
+                assert alts == []
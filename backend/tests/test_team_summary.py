@@ -0,0 +1,52 @@
+def fetch_all(client, limit):
+    items, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit} | ({"cursor": cursor} if cursor else {})
+        resp = client.get("/teams/summary", params=params)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert len(body["items"]) <= limit
+        items += body["items"]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+def test_summary_pages_cover_teams_newest_first(client, make_team):
+    saved = [client.post("/teams/", json=make_team(f"Summary {n}")).json() for n in range(5)]
+    try:
+        items, pages = fetch_all(client, limit=2)
+        assert pages == -(-len(items) // 2)
+        keys = [(i["updated_at"], i["id"]) for i in items]
+        assert keys == sorted(keys, reverse=True)
+        assert len({i["id"] for i in items}) == len(items)
+
+        # Same ids and content as the full listing
+        full = client.get("/teams/").json()
+        assert {i["id"] for i in items} == {t["id"] for t in full}
+        by_id = {i["id"]: i for i in items}
+        for team in saved:
+            summary = by_id[team["id"]]
+            assert summary["name"] == team["name"]
+            assert [m["id"] for m in summary["monsters"]] == [um["monster"]["id"] for um in team["user_monsters"]]
+            assert summary["magic_item"]["id"] == team["magic_item"]["id"]
+            assert set(summary["monsters"][0]) == {"id", "name", "form", "localized"}
+
+        # An update moves the team to the front
+        client.put(f"/teams/{saved[0]['id']}", json={"name": "Summary renamed", "user_monsters": [
+            {"id": um["id"], "monster_id": um["monster"]["id"], "personality_id": um["personality"]["id"],
+             "legacy_type_id": um["legacy_type"]["id"], "move1_id": um["move1"]["id"], "move2_id": um["move2"]["id"],
+             "move3_id": um["move3"]["id"], "move4_id": um["move4"]["id"],
+             "talent": {k: um["talent"][k] for k in ("hp_boost", "phy_atk_boost", "mag_atk_boost",
+                                                     "phy_def_boost", "mag_def_boost", "spd_boost")}}
+            for um in saved[0]["user_monsters"]
+        ]})
+        first = client.get("/teams/summary", params={"limit": 1}).json()["items"][0]
+        assert (first["id"], first["name"]) == (saved[0]["id"], "Summary renamed")
+    finally:
+        for team in saved:
+            client.delete(f"/teams/{team['id']}")
+
+def test_summary_rejects_bad_cursor(client):
+    assert client.get("/teams/summary", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/teams/summary", params={"limit": 0}).status_code == 422
@@ -0,0 +1,310 @@
+import asyncio
+import time
+import pytest
+from sqlalchemy import delete, exc
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from backend import trait_synergy
+from backend.models import TraitSynergyCacheEntry
+from backend.database import async_database_url
+from backend.trait_synergy import (
+    TraitSynergyCache, TraitSynergyRequest, trait_synergy_cache_key, run_trait_synergy, TRAIT_SYNERGY_TEMPLATE_HASH,
+)
+
+class Dummy:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_request(monster_id=1, move_ids=(11, 12, 13, 14), style="Physical"):
+    monster = Dummy(id=monster_id, name=f"Monster {monster_id}")
+    trait = Dummy(id=7, name="Trait", description="Does things.")
+    moves = [Dummy(id=mid, name=f"Move {mid}", description="Hits.") for mid in move_ids]
+    return TraitSynergyRequest(monster, trait, moves, style)
+
+@pytest.fixture(scope="module")
+def cache_db_url(scratch_engine):
+    # The scratch database has every table, trait_synergy_cache included
+    return async_database_url(scratch_engine.url)
+
+def test_cache_key_ignores_move_order_but_not_style_template_glossary_or_mode():
+    key = trait_synergy_cache_key(1, 7, [14, 11, 13, 12], "Physical")
+    assert key == trait_synergy_cache_key(1, 7, [11, 12, 13, 14], "Physical")
+    assert key != trait_synergy_cache_key(1, 7, [11, 12, 13, 14], "Magic")
+    assert key != trait_synergy_cache_key(1, 7, [11, 12, 13, 14], "Physical", template_hash="other")
+    assert key != trait_synergy_cache_key(1, 7, [11, 12, 13, 14], "Physical", glossary="- Burn: Lose HP.")
+    assert key == trait_synergy_cache_key(1, 7, [11, 12, 13, 14], "Physical", template_hash=TRAIT_SYNERGY_TEMPLATE_HASH)
+    assert key != trait_synergy_cache_key(1, 7, [11, 12, 13, 14], "Physical", mode="team")
+
+def test_memory_tier_expires_after_ttl():
+    timer = FakeTimer()
+    cache = TraitSynergyCache(maxsize=8, ttl=60, timer=timer)
+    request = make_request()
+    asyncio.run(cache.put(None, request, {"synergy_moves": [], "recommendation": ["ok"]}))
+    assert request.cache_key in asyncio.run(cache.get_many(None, [request.cache_key]))
+    timer.now = 61
+    assert asyncio.run(cache.get_many(None, [request.cache_key])) == {}
+
+def test_db_tier_backs_memory_tier(cache_db_url):
+    request = make_request(monster_id=424242)
+    result = {"synergy_moves": ["Move 11"], "recommendation": ["db"]}
+
+    async def scenario():
+        engine = create_async_engine(cache_db_url)
+        async with AsyncSession(engine) as db:
+            await TraitSynergyCache().put(db, request, result)
+            await db.commit()
+
+            # A fresh process-local cache misses in memory but finds the row
+            cache = TraitSynergyCache()
+            assert await cache.get_many(db, [request.cache_key]) == {request.cache_key: result}
+            assert request.cache_key in cache.memory
+
+            await db.execute(delete(TraitSynergyCacheEntry).where(TraitSynergyCacheEntry.cache_key == request.cache_key))
+            await db.commit()
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+def test_concurrent_writers_of_one_key_both_commit(cache_db_url):
+    request = make_request(monster_id=434343)
+
+    async def scenario():
+        engine = create_async_engine(cache_db_url)
+        async with AsyncSession(engine) as first, AsyncSession(engine) as second:
+            # Both missed the key; the second insert waits on the first one's row
+            await TraitSynergyCache().put(first, request, {"synergy_moves": [], "recommendation": ["first"]})
+
+            async def second_writer():
+                await TraitSynergyCache().put(second, request, {"synergy_moves": [], "recommendation": ["second"]})
+                await second.commit()
+
+            writer = asyncio.ensure_future(second_writer())
+            await asyncio.sleep(0.2)
+            await first.commit()
+            await writer
+
+            found = await TraitSynergyCache().get_many(first, [request.cache_key])
+            assert found[request.cache_key]["recommendation"] == ["second"]
+            await first.execute(delete(TraitSynergyCacheEntry).where(TraitSynergyCacheEntry.cache_key == request.cache_key))
+            await first.commit()
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+class BrokenSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    async def execute(self, statement):
+        raise exc.OperationalError("INSERT", {}, Exception("connection lost"))
+
+    async def commit(self):
+        raise exc.OperationalError("COMMIT", {}, Exception("connection lost"))
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+def test_failed_cache_write_is_rolled_back_not_raised():
+    cache = TraitSynergyCache()
+    db = BrokenSession()
+    request = make_request()
+    result = {"synergy_moves": [], "recommendation": ["ok"]}
+    asyncio.run(cache.put(db, request, result))
+    asyncio.run(cache.commit(db))
+    assert db.rollbacks == 2
+    # The memory tier still has the result
+    assert asyncio.run(cache.get_many(None, [request.cache_key])) == {request.cache_key: result}
+
+def test_run_trait_synergy_only_calls_llm_for_misses(monkeypatch):
+    calls = []
+
+    async def fake_generate_json(prompt):
+        calls.append(prompt)
+        return {"synergy_moves": [], "recommendation": [f"call {len(calls)}"]}
+
+    monkeypatch.setattr(trait_synergy, "generate_json", fake_generate_json)
+    cache = TraitSynergyCache()
+    team = [make_request(monster_id=1), make_request(monster_id=1, move_ids=(14, 13, 12, 11)), make_request(monster_id=2)]
+
+    first = asyncio.run(run_trait_synergy(team, cache=cache))
+    assert len(calls) == 2  # the two monster-1 entries share one key
+    assert first[0] == first[1]
+
+    second = asyncio.run(run_trait_synergy(team, cache=cache))
+    assert len(calls) == 2
+    assert second == first
+
+def test_llm_errors_are_not_cached(monkeypatch):
+    async def failing_generate_json(prompt):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(trait_synergy, "generate_json", failing_generate_json)
+    cache = TraitSynergyCache()
+    request = make_request()
+    results = asyncio.run(run_trait_synergy([request], cache=cache))
+    assert results[0]["recommendation"] == ["Error generating analysis."]
+    assert asyncio.run(cache.get_many(None, [request.cache_key])) == {}
+
+def test_iter_trait_synergy_yields_hits_then_completion_order(monkeypatch):
+    delays = {2: 0.05, 3: 0.0}
+
+    async def slow_generate_json(prompt):
+        monster_id = 2 if "Monster 2" in prompt else 3
+        await asyncio.sleep(delays[monster_id])
+        return {"synergy_moves": [], "recommendation": [f"monster {monster_id}"]}
+
+    monkeypatch.setattr(trait_synergy, "generate_json", slow_generate_json)
+    cache = TraitSynergyCache()
+    team = [make_request(monster_id=1), make_request(monster_id=2), make_request(monster_id=3), make_request(monster_id=3)]
+    asyncio.run(cache.put(None, team[0], {"synergy_moves": [], "recommendation": ["cached"]}))
+
+    async def collect():
+        return [(i, result["recommendation"][0]) async for i, result in trait_synergy.iter_trait_synergy(team, cache=cache)]
+
+    assert asyncio.run(collect()) == [(0, "cached"), (2, "monster 3"), (3, "monster 3"), (1, "monster 2")]
+
+def test_max_concurrency_bounds_calls_in_flight(monkeypatch):
+    in_flight = []
+    peak = []
+
+    async def tracked_generate_json(prompt):
+        in_flight.append(prompt)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(prompt)
+        return {"synergy_moves": [], "recommendation": ["ok"]}
+
+    monkeypatch.setattr(trait_synergy, "generate_json", tracked_generate_json)
+    team = [make_request(monster_id=i) for i in range(10)]
+    results = asyncio.run(run_trait_synergy(team, cache=TraitSynergyCache(), max_concurrency=3))
+    assert len(results) == 10
+    assert max(peak) == 3
+
+def test_deadline_drops_late_replies(monkeypatch):
+    async def generate_json(prompt):
+        await asyncio.sleep(5 if "Monster 2" in prompt else 0)
+        return {"synergy_moves": [], "recommendation": ["ok"]}
+
+    monkeypatch.setattr(trait_synergy, "generate_json", generate_json)
+    cache = TraitSynergyCache()
+    team = [make_request(monster_id=1), make_request(monster_id=2)]
+    results = asyncio.run(run_trait_synergy(team, cache=cache, deadline=trait_synergy.request_deadline(50)))
+    assert results[0]["recommendation"] == ["ok"]
+    assert results[1] == {"synergy_moves": [], "recommendation": [], "status": "timeout"}
+    assert set(asyncio.run(cache.get_many(None, [r.cache_key for r in team]))) == {team[0].cache_key}
+
+    # An exhausted budget skips the LLM entirely
+    results = asyncio.run(run_trait_synergy([make_request(monster_id=3)], cache=cache,
+                                            deadline=trait_synergy.request_deadline(1) - 1))
+    assert results[0]["status"] == "timeout"
+
+def test_team_mode_sends_one_prompt_and_keeps_its_own_cache_entries(monkeypatch):
+    prompts = []
+
+    async def generate_json(prompt):
+        prompts.append(prompt)
+        if "Slot 0:" in prompt:
+            return [{"slot": slot, "synergy_moves": ["Move 11"], "recommendation": [f"slot {slot}"]} for slot in (0, 1, 3)]
+        return {"synergy_moves": [], "recommendation": ["single"]}
+
+    monkeypatch.setattr(trait_synergy, "generate_json", generate_json)
+    cache = TraitSynergyCache()
+    team = [make_request(monster_id=1), make_request(monster_id=2), make_request(monster_id=2), make_request(monster_id=3)]
+    team_results = asyncio.run(run_trait_synergy(team, cache=cache, mode="team"))
+    assert len(prompts) == 1 and "Slot 3:" in prompts[0] and "Slot 2:" not in prompts[0]
+    assert [r["recommendation"] for r in team_results] == [["slot 0"], ["slot 1"], ["slot 1"], ["slot 3"]]
+
+    # Per-monster mode does not reuse the team answers...
+    prompts.clear()
+    results = asyncio.run(run_trait_synergy(team, cache=cache))
+    assert [r["recommendation"] for r in results] == [["single"]] * 4
+    assert len(prompts) == 3 and not any("Slot 0:" in p for p in prompts)
+
+    # ...nor team mode the per-monster ones, and each mode still hits its own entries
+    prompts.clear()
+    assert asyncio.run(run_trait_synergy(team, cache=cache, mode="team")) == team_results
+    assert asyncio.run(run_trait_synergy(team, cache=cache)) == results
+    assert prompts == []
+
+    cache.clear()
+    asyncio.run(cache.put(None, team[0], {"synergy_moves": [], "recommendation": ["single"]}))
+    asyncio.run(run_trait_synergy(team[:1], cache=cache, mode="team"))
+    assert len(prompts) == 1
+
+def test_team_mode_falls_back_per_monster_for_bad_slots(monkeypatch):
+    prompts = []
+
+    async def generate_json(prompt):
+        prompts.append(prompt)
+        if "Slot 0:" in prompt:
+            return [{"slot": 0, "recommendation": ["team"]}, {"slot": 1, "recommendation": "not a list"}]
+        return {"synergy_moves": [], "recommendation": ["single"]}
+
+    monkeypatch.setattr(trait_synergy, "generate_json", generate_json)
+    team = [make_request(monster_id=1), make_request(monster_id=2), make_request(monster_id=3)]
+    results = asyncio.run(run_trait_synergy(team, cache=TraitSynergyCache(), mode="team"))
+    assert [r["recommendation"] for r in results] == [["team"], ["single"], ["single"]]
+    assert len(prompts) == 3
+
+    # A reply that is not an array at all: every slot is retried on its own
+    async def unparsable(prompt):
+        prompts.append(prompt)
+        return {"synergy_moves": [], "recommendation": ["single"]}
+
+    monkeypatch.setattr(trait_synergy, "generate_json", unparsable)
+    prompts.clear()
+    results = asyncio.run(run_trait_synergy(team, cache=TraitSynergyCache(), mode="team"))
+    assert [r["recommendation"] for r in results] == [["single"]] * 3
+    assert len(prompts) == 4
+
+@pytest.mark.parametrize("reply", [
+    {"synergy_moves": "Move 11", "recommendation": ["ok"]},
+    {"synergy_moves": [], "recommendation": []},
+    {"synergy_moves": [], "recommendation": [{"text": "nested"}]},
+    ["not", "an", "object"],
+])
+def test_malformed_replies_fall_back_and_are_not_cached(monkeypatch, reply):
+    async def generate_json(prompt):
+        return reply
+
+    monkeypatch.setattr(trait_synergy, "generate_json", generate_json)
+    cache = TraitSynergyCache()
+    request = make_request()
+    results = asyncio.run(run_trait_synergy([request], cache=cache))
+    assert results[0] == trait_synergy.llm_fallback_result()
+    assert asyncio.run(cache.get_many(None, [request.cache_key])) == {}
+
+def test_deadline_bounds_the_cache_lookup(monkeypatch):
+    class SlowDB:
+        rolled_back = False
+
+        async def execute(self, query):
+            await asyncio.sleep(5)
+
+        async def rollback(self):
+            self.rolled_back = True
+
+        async def commit(self):
+            pass
+
+    async def generate_json(prompt):
+        return {"synergy_moves": [], "recommendation": ["llm"]}
+
+    monkeypatch.setattr(trait_synergy, "generate_json", generate_json)
+    cache, db = TraitSynergyCache(), SlowDB()
+    team = [make_request(monster_id=1), make_request(monster_id=2)]
+    asyncio.run(cache.put(None, team[0], {"synergy_moves": [], "recommendation": ["memory"]}))
+
+    start = time.monotonic()
+    results = asyncio.run(run_trait_synergy(team, db, cache=cache, deadline=trait_synergy.request_deadline(50)))
+    assert time.monotonic() - start < 1
+    assert db.rolled_back
+    # Memory hits survive; the budget is gone before the miss could be asked
+    assert results[0]["recommendation"] == ["memory"]
+    assert results[1]["status"] == "timeout"
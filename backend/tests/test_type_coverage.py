@@ -0,0 +1,66 @@
+import random
+from collections import Counter
+import pytest
+
+@pytest.fixture(scope="module")
+def type_map(json_catalog):
+    return json_catalog.types
+
+def reference_coverage(defender_types, move_type_ids, type_map):
+    # Straight port of the original per-type loop in compute_type_coverage
+    ignored_type_ids = {t.id for t in type_map.values() if t.name == "Leader"}
+    all_type_ids = set(type_map.keys()) - ignored_type_ids
+    effective_against_types = set()
+    for move_type_id in move_type_ids:
+        effective_against_types.update(type_map[move_type_id].effective_against_ids)
+    weak_against_types = list(all_type_ids - effective_against_types)
+
+    type_weak_count = Counter()
+    for main_id, sub_id in defender_types:
+        main_type = type_map[main_id]
+        sub_type = type_map[sub_id] if sub_id else None
+        for attacking_type in type_map.values():
+            weak_main = attacking_type.id in main_type.vulnerable_to_ids
+            weak_sub = sub_type and attacking_type.id in sub_type.vulnerable_to_ids
+            resist_main = attacking_type.id in main_type.resistant_to_ids
+            resist_sub = sub_type and attacking_type.id in sub_type.resistant_to_ids
+            is_weak = False
+            if weak_main and weak_sub:
+                is_weak = True
+            elif (weak_main and not resist_sub and not weak_sub) or (weak_sub and not resist_main and not weak_main):
+                is_weak = True
+            if is_weak:
+                type_weak_count[attacking_type.id] += 1
+    team_weak_to = [type_id for type_id, count in type_weak_count.items() if count >= 3]
+    return {
+        "effective_against_types": sorted(effective_against_types),
+        "weak_against_types": sorted(weak_against_types),
+        "team_weak_to": sorted(team_weak_to),
+    }
+
+def test_effectiveness_matrix_matches_relations(type_map, type_chart):
+    assert type_chart.effectiveness.shape == (19, 19)
+    for t in type_map.values():
+        row = type_chart.index[t.id]
+        assert set(type_chart.type_ids[type_chart.super_effective[row]].tolist()) == t.effective_against_ids
+        assert set(type_chart.type_ids[type_chart.resisted[row]].tolist()) == t.weak_against_ids
+        assert set(type_chart.type_ids[type_chart.super_effective[:, row]].tolist()) == t.vulnerable_to_ids
+
+def test_single_type_profile_is_vulnerable_to(type_map, type_chart):
+    for t in type_map.values():
+        weak, resist = type_chart.defensive_profile(t.id, None)
+        assert set(type_chart.type_ids[weak].tolist()) == t.vulnerable_to_ids
+        assert set(type_chart.type_ids[resist].tolist()) == t.resistant_to_ids
+
+def test_team_coverage_matches_reference(type_map, type_chart):
+    type_ids = sorted(type_map)
+    rng = random.Random(1234)
+    for _ in range(500):
+        defender_types = []
+        for _ in range(6):
+            main_id = rng.choice(type_ids)
+            sub_id = rng.choice([None] + [tid for tid in type_ids if tid != main_id])
+            defender_types.append((main_id, sub_id))
+        move_type_ids = set(rng.sample(type_ids, rng.randint(0, 10)))
+        assert type_chart.team_coverage(defender_types, move_type_ids) == \
+            reference_coverage(defender_types, move_type_ids, type_map)
@@ -0,0 +1,147 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# === Named stage timings ===
+# Code marks stages with `with span("name"):`; durations are only recorded while a
+# collector is active for the current context (a request, a benchmark run), so the
+# spans cost next to nothing otherwise.
+_collector: ContextVar[Optional[Dict[str, float]]] = ContextVar("timing_collector", default=None)
+
+@contextmanager
+def span(name: str):
+    collector = _collector.get()
+    if collector is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        collector[name] = collector.get(name, 0.0) + time.perf_counter() - start
+
+@contextmanager
+def collect_spans():
+    """Collect {span name: total seconds} for everything run in this context (and tasks started from it)."""
+    collector: Dict[str, float] = {}
+    token = _collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _collector.reset(token)
+
+# === Latency histograms ===
+# Upper bounds in milliseconds; the last bucket is +Inf
+LATENCY_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+REQUEST_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+class Histogram:
+    """Cumulative latency histogram (Prometheus-style `le` buckets)."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, ms: float) -> None:
+        i = next((i for i, bound in enumerate(self.buckets) if ms <= bound), len(self.buckets))
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += ms
+            self._max = max(self._max, ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts, total, peak = list(self._counts), self._sum, self._max
+        cumulative, buckets = 0, {}
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"count": cumulative, "sum_ms": round(total, 3), "max_ms": round(peak, 3), "buckets": buckets}
+
+def _label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(labels: Dict[str, str], **extra) -> str:
+    pairs = {**labels, **extra}
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_label_value(v)}"' for k, v in pairs.items()) + "}"
+
+def prometheus_histogram(name: str, help_text: str, series: Iterable[Tuple[Dict[str, str], Histogram]]) -> List[str]:
+    """Prometheus text lines for millisecond histograms, exported in seconds."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in series:
+        snap = histogram.snapshot()
+        for bound, count in snap["buckets"].items():
+            le = bound if bound == "+Inf" else repr(float(bound) / 1000)
+            lines.append(f"{name}_bucket{_labels(labels, le=le)} {count}")
+        lines.append(f"{name}_sum{_labels(labels)} {snap['sum_ms'] / 1000}")
+        lines.append(f"{name}_count{_labels(labels)} {snap['count']}")
+    return lines
+
+def prometheus_gauge(name: str, help_text: str, series: Iterable[Tuple[Dict[str, str], float]],
+                     metric_type: str = "gauge") -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    lines += [f"{name}{_labels(labels)} {value}" for labels, value in series]
+    return lines
+
+def prometheus_counter(name: str, help_text: str, series: Iterable[Tuple[Dict[str, str], float]]) -> List[str]:
+    return prometheus_gauge(name, help_text, series, metric_type="counter")
+
+# === Per-request stage timings ===
+# The middleware collects the spans of every HTTP request, reports them in a
+# `Server-Timing` header (spans finished before the response starts, plus `total`)
+# and feeds per-endpoint, per-stage histograms once the response body is done.
+
+# (endpoint, stage) -> histogram, endpoint as "METHOD /route/{template}"
+STAGE_HISTOGRAMS: Dict[Tuple[str, str], Histogram] = {}
+_stage_lock = threading.Lock()
+
+def record_stages(endpoint: str, spans: Dict[str, float]) -> None:
+    for stage, seconds in spans.items():
+        histogram = STAGE_HISTOGRAMS.get((endpoint, stage))
+        if histogram is None:
+            with _stage_lock:
+                histogram = STAGE_HISTOGRAMS.setdefault((endpoint, stage), Histogram(REQUEST_BUCKETS_MS))
+        histogram.observe(seconds * 1000)
+
+def server_timing(spans: Dict[str, float]) -> str:
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in spans.items())
+
+def _endpoint(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "unmatched"
+    return f"{scope['method']} {path}"
+
+class TimingMiddleware:
+    """ASGI middleware: Server-Timing header and stage histograms for every HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        with collect_spans() as spans:
+            async def timed_send(message):
+                if message["type"] == "http.response.start":
+                    header = server_timing({**spans, "total": time.perf_counter() - start})
+                    message = {**message, "headers": [*message.get("headers", []),
+                                                      (b"server-timing", header.encode("latin-1"))]}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, timed_send)
+            finally:
+                record_stages(_endpoint(scope), {**spans, "total": time.perf_counter() - start})
+
+def prometheus_stage_lines() -> List[str]:
+    series = [({"endpoint": endpoint, "stage": stage}, h) for (endpoint, stage), h in sorted(STAGE_HISTOGRAMS.items())]
+    return prometheus_histogram("roco_request_stage_seconds", "Time spent per request stage", series)
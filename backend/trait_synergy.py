@@ -0,0 +1,375 @@
+import asyncio
+import hashlib
+import logging
+import time
+from typing import List, Optional, Dict, Tuple
+from cachetools import TTLCache
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend import models
+from backend.schemas import SynergyMode
+from backend.config import LLM_DEADLINE_MS, TRAIT_SYNERGY_CACHE_SIZE, TRAIT_SYNERGY_CACHE_TTL_SECONDS
+from backend.llm import generate_json, llm_dispatcher, llm_fallback_result, llm_timeout_result
+from backend.timing import span
+
+logger = logging.getLogger(__name__)
+
+# === Trait Synergy LLM Analysis ===
+TRAIT_SYNERGY_PROMPT_TEMPLATE = """You are an expert game strategist.
+Monster: {monster_name}
+Trait: {trait_name} — {trait_description}
+Preferred attack style: {preferred_attack_style}
+Selected moves:
+{move_lines}
+
+Game Terms Glossary:
+{glossary}
+
+Instructions:
+1. Identify which moves are especially synergistic with the trait.
+2. For your recommendations:
+    - Give **exactly two recommendations** (3-4 sentences max) that **explain in detail how the user should use the selected moves together**, including possible combos, turn order, defensive or offensive applications, and how to leverage the trait with the current moveset.
+    - Give **one additional recommendation** (1-2 sentences) for how to improve move selection in general (such as favoring certain types, effects, or utility, but do NOT suggest specific move swaps).
+3. Output as JSON in the following format:
+{{
+"synergy_moves": [list of move names],
+"recommendation": [list of suggestions as strings]
+}}
+"""
+
+# Part of every cache key, so editing the template invalidates old results
+TRAIT_SYNERGY_TEMPLATE_HASH = hashlib.sha256(TRAIT_SYNERGY_PROMPT_TEMPLATE.encode("utf-8")).hexdigest()[:16]
+
+def glossary_section(glossary: str) -> str:
+    return glossary or "- (no special terms)"
+
+# `glossary` is the pre-rendered subset for this trait and these moves (GlossaryIndex.render)
+def build_trait_synergy_prompt(monster, trait, selected_moves, preferred_attack_style, glossary: str):
+    move_lines = "\n".join(
+        f"- {m.name}: {m.description}" for m in selected_moves
+    )
+    return TRAIT_SYNERGY_PROMPT_TEMPLATE.format(
+        monster_name=monster.name,
+        trait_name=trait.name,
+        trait_description=trait.description,
+        preferred_attack_style=preferred_attack_style,
+        move_lines=move_lines,
+        glossary=glossary_section(glossary),
+    )
+
+# Shape a reply must have before it is used or cached (the DB tier never expires)
+class SynergyReply(BaseModel):
+    synergy_moves: List[str] = Field(default_factory=list)
+    recommendation: List[str] = Field(..., min_length=1)
+
+def parse_synergy_reply(reply) -> dict:
+    """The validated result dict; raises ValueError (pydantic.ValidationError) otherwise."""
+    return SynergyReply.model_validate(reply).model_dump()
+
+
+# === Deadlines ===
+# An analysis request gets LLM_DEADLINE_MS from its start. The cache lookup and each
+# LLM call may use whatever is left of it; a lookup that runs out continues with the
+# in-memory hits, replies that arrive later are dropped and the monster's finding is
+# marked "timeout", so the deterministic sections are never held up.
+
+def request_deadline(budget_ms: Optional[int] = None) -> Optional[float]:
+    """Absolute time.monotonic() deadline for a request starting now (None = no limit)."""
+    budget_ms = LLM_DEADLINE_MS if budget_ms is None else budget_ms
+    return time.monotonic() + budget_ms / 1000 if budget_ms > 0 else None
+
+async def _until(deadline: Optional[float], call):
+    # Await call() for at most what is left of the deadline; asyncio.TimeoutError otherwise
+    if deadline is None:
+        return await call()
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise asyncio.TimeoutError
+    return await asyncio.wait_for(call(), remaining)
+
+# === Two-tier result cache (in-process TTL LRU, backed by the trait_synergy_cache table) ===
+def _style_value(preferred_attack_style) -> str:
+    return getattr(preferred_attack_style, "value", preferred_attack_style) or ""
+
+def trait_synergy_cache_key(monster_id: int, trait_id: int, move_ids, preferred_attack_style,
+                            template_hash: str = TRAIT_SYNERGY_TEMPLATE_HASH, glossary: str = "",
+                            mode: SynergyMode = "per_monster") -> str:
+    # The glossary section as sent, so a different selection or edited terms miss the cache;
+    # the mode (and its template hash) so per-monster and team answers never stand in for each other
+    parts = [
+        mode,
+        str(monster_id),
+        str(trait_id),
+        ",".join(str(mid) for mid in sorted(move_ids)),
+        _style_value(preferred_attack_style),
+        template_hash,
+        glossary_section(glossary),
+    ]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+class TraitSynergyRequest:
+    """Everything needed to look up or produce one monster's trait-synergy result."""
+
+    def __init__(self, monster, trait, selected_moves, preferred_attack_style, glossary: str = ""):
+        self.monster = monster
+        self.trait = trait
+        self.selected_moves = selected_moves
+        self.preferred_attack_style = preferred_attack_style
+        self.move_ids = sorted(m.id for m in selected_moves)
+        self.glossary = glossary
+        self.cache_key = trait_synergy_cache_key(monster.id, trait.id, self.move_ids, preferred_attack_style,
+                                                 glossary=glossary)
+        self.team_cache_key = trait_synergy_cache_key(monster.id, trait.id, self.move_ids, preferred_attack_style,
+                                                      TEAM_SYNERGY_TEMPLATE_HASH, glossary, mode="team")
+
+    def cache_key_for(self, mode: SynergyMode) -> str:
+        return self.team_cache_key if mode == "team" else self.cache_key
+
+    def prompt(self) -> str:
+        return build_trait_synergy_prompt(
+            self.monster, self.trait, self.selected_moves, self.preferred_attack_style, self.glossary
+        )
+
+class TraitSynergyCache:
+    def __init__(self, maxsize: int = TRAIT_SYNERGY_CACHE_SIZE, ttl: float = TRAIT_SYNERGY_CACHE_TTL_SECONDS, **kwargs):
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl, **kwargs)
+
+    async def get_many(self, db: Optional[AsyncSession], keys, deadline: Optional[float] = None) -> Dict[str, dict]:
+        """Memory first, then one DB query for the remaining keys (promoted into memory).
+
+        A DB query still running at `deadline` is cancelled and only the memory hits
+        are returned.
+        """
+        found = {}
+        missing = []
+        for key in keys:
+            result = self.memory.get(key)
+            if result is not None:
+                found[key] = result
+            else:
+                missing.append(key)
+        if missing and db is not None:
+            query = (select(models.TraitSynergyCacheEntry)
+                     .where(models.TraitSynergyCacheEntry.cache_key.in_(missing)))
+            try:
+                rows = (await _until(deadline, lambda: db.execute(query))).scalars()
+            except asyncio.TimeoutError:
+                logger.warning("Trait synergy cache lookup ran out of time, using %d memory hits", len(found))
+                # The cancelled statement leaves the transaction unusable
+                await db.rollback()
+                return found
+            for row in rows:
+                self.memory[row.cache_key] = row.result
+                found[row.cache_key] = row.result
+        return found
+
+    async def put(self, db: Optional[AsyncSession], request: TraitSynergyRequest, result: dict,
+                  mode: SynergyMode = "per_monster"):
+        key = request.cache_key_for(mode)
+        self.memory[key] = result
+        if db is None:
+            return
+        statement = insert(models.TraitSynergyCacheEntry).values(
+            cache_key=key,
+            monster_id=request.monster.id,
+            trait_id=request.trait.id,
+            move_ids=",".join(str(mid) for mid in request.move_ids),
+            preferred_attack_style=_style_value(request.preferred_attack_style),
+            template_hash=TEAM_SYNERGY_TEMPLATE_HASH if mode == "team" else TRAIT_SYNERGY_TEMPLATE_HASH,
+            result=result,
+        )
+        # Requests that missed the same key at the same time both write it; the last reply wins
+        statement = statement.on_conflict_do_update(index_elements=["cache_key"],
+                                                    set_={"result": statement.excluded.result})
+        try:
+            await db.execute(statement)
+        except SQLAlchemyError as e:
+            logger.warning("Trait synergy cache write failed: %s", e)
+            await db.rollback()
+
+    async def commit(self, db: Optional[AsyncSession]):
+        """Commit the rows put() wrote; a failure is logged and rolled back, never raised."""
+        if db is None:
+            return
+        try:
+            await db.commit()
+        except SQLAlchemyError as e:
+            logger.warning("Trait synergy cache commit failed: %s", e)
+            await db.rollback()
+
+    def clear(self):
+        self.memory.clear()
+
+trait_synergy_cache = TraitSynergyCache()
+
+# === Team mode: one prompt for the whole team ===
+# Instead of one prompt per monster, every uncached monster goes into a single prompt
+# (shared instructions and glossary once) that must answer with a JSON array of
+# {slot, synergy_moves, recommendation}. Entries that fail validation, and the whole
+# team if the reply is not such an array, fall back to per-monster calls.
+
+TEAM_SYNERGY_PROMPT_TEMPLATE = """You are an expert game strategist.
+Analyze each monster of this team on its own.
+
+{monster_blocks}
+
+Game Terms Glossary:
+{glossary}
+
+Instructions (for every slot):
+1. Identify which of that monster's selected moves are especially synergistic with its trait.
+2. For your recommendations:
+    - Give **exactly two recommendations** (3-4 sentences max) that **explain in detail how the user should use the selected moves together**, including possible combos, turn order, defensive or offensive applications, and how to leverage the trait with the current moveset.
+    - Give **one additional recommendation** (1-2 sentences) for how to improve move selection in general (such as favoring certain types, effects, or utility, but do NOT suggest specific move swaps).
+3. Output a JSON array with exactly one object per slot, in the following format:
+[
+{{"slot": <slot number>, "synergy_moves": [list of move names], "recommendation": [list of suggestions as strings]}}
+]
+"""
+
+TEAM_SYNERGY_SLOT_TEMPLATE = """Slot {slot}:
+Monster: {monster_name}
+Trait: {trait_name} — {trait_description}
+Preferred attack style: {preferred_attack_style}
+Selected moves:
+{move_lines}"""
+
+# Part of every team-mode cache key, like TRAIT_SYNERGY_TEMPLATE_HASH
+TEAM_SYNERGY_TEMPLATE_HASH = hashlib.sha256(
+    (TEAM_SYNERGY_PROMPT_TEMPLATE + TEAM_SYNERGY_SLOT_TEMPLATE).encode("utf-8")).hexdigest()[:16]
+
+def build_team_synergy_prompt(slots: Dict[int, TraitSynergyRequest]) -> str:
+    blocks = [
+        TEAM_SYNERGY_SLOT_TEMPLATE.format(
+            slot=slot,
+            monster_name=r.monster.name,
+            trait_name=r.trait.name,
+            trait_description=r.trait.description,
+            preferred_attack_style=r.preferred_attack_style,
+            move_lines="\n".join(f"- {m.name}: {m.description}" for m in r.selected_moves),
+        )
+        for slot, r in slots.items()
+    ]
+    # Each glossary entry once, however many monsters mention it
+    lines = dict.fromkeys(line for r in slots.values() for line in r.glossary.split("\n") if line)
+    return TEAM_SYNERGY_PROMPT_TEMPLATE.format(
+        monster_blocks="\n\n".join(blocks),
+        glossary=glossary_section("\n".join(lines)),
+    )
+
+class SlotSynergyReply(SynergyReply):
+    slot: int
+
+def parse_team_synergy_reply(reply, slots) -> Dict[int, dict]:
+    """Per-slot results from a team reply; raises ValueError unless it is a JSON array."""
+    if not isinstance(reply, list):
+        raise ValueError(f"expected a JSON array, got {type(reply).__name__}")
+    results = {}
+    for item in reply:
+        try:
+            entry = SlotSynergyReply.model_validate(item)
+        except ValidationError:
+            continue
+        if entry.slot in slots and entry.slot not in results:
+            results[entry.slot] = entry.model_dump(exclude={"slot"})
+    return results
+
+async def iter_trait_synergy(requests: List[TraitSynergyRequest], db: Optional[AsyncSession] = None,
+                             cache: TraitSynergyCache = trait_synergy_cache, max_concurrency: Optional[int] = None,
+                             deadline: Optional[float] = None, mode: SynergyMode = "per_monster"):
+    """Yield (index, raw LLM result) as each one becomes available.
+
+    Cache hits come first, then LLM replies in completion order. Cached results
+    are reused; only misses call the LLM (at most max_concurrency at a time for
+    this call, on top of the dispatcher's global limit), and only successful
+    replies are written back, so errors are retried on the next analysis. Calls
+    still running at `deadline` give llm_timeout_result(), failed ones
+    llm_fallback_result(). In "team" mode the misses first go out as one team
+    prompt; only the slots it does not answer are sent one by one. Each mode reads
+    and writes its own cache entries: team answers are stored under team keys and
+    the per-monster fallback replies under per-monster keys.
+    """
+    keys = [r.cache_key_for(mode) for r in requests]
+    cached = await cache.get_many(db, set(keys), deadline)
+    for i, key in enumerate(keys):
+        if key in cached:
+            yield i, cached[key]
+
+    # Identical (monster, moves) entries share a single call
+    pending: Dict[str, Tuple[TraitSynergyRequest, List[int]]] = {}
+    for i, (r, key) in enumerate(zip(requests, keys)):
+        if key not in cached:
+            pending.setdefault(key, (r, []))[1].append(i)
+    if not pending:
+        return
+
+    if mode == "team" and len(pending) > 1:
+        # Slot = first index of each distinct request
+        slots = {indices[0]: key for key, (_, indices) in pending.items()}
+        prompt = build_team_synergy_prompt({slot: pending[key][0] for slot, key in slots.items()})
+        try:
+            reply = await _until(deadline, lambda: llm_dispatcher.run(prompt, generate_json))
+            answered = parse_team_synergy_reply(reply, slots)
+        except asyncio.TimeoutError:
+            # No time left to fall back
+            answered = {slot: llm_timeout_result() for slot in slots}
+        except Exception as e:
+            logger.warning("Team synergy call failed, falling back to per-monster calls: %s", e)
+            answered = {}
+        for slot, result in answered.items():
+            r, indices = pending.pop(slots[slot])
+            if result.get("status") is None:
+                await cache.put(db, r, result, mode)
+            for i in indices:
+                yield i, result
+        if not pending:
+            await cache.commit(db)
+            return
+
+    limit = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def call(r: TraitSynergyRequest):
+        # The dispatcher applies the global limit and shares identical in-flight prompts
+        if limit is None:
+            return await llm_dispatcher.run(r.prompt(), generate_json)
+        async with limit:
+            return await llm_dispatcher.run(r.prompt(), generate_json)
+
+    async def resolve(key: str, r: TraitSynergyRequest):
+        try:
+            reply = parse_synergy_reply(await _until(deadline, lambda: call(r)))
+            return key, r, reply, True
+        except asyncio.TimeoutError:
+            return key, r, llm_timeout_result(), False
+        except Exception as e:
+            logger.warning("Trait synergy call failed: %s", e)
+            return key, r, llm_fallback_result(), False
+
+    tasks = [asyncio.ensure_future(resolve(key, r)) for key, (r, _) in pending.items()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            key, r, reply, ok = await next_done
+            if ok:
+                # A per-monster prompt's reply, whichever mode asked for it
+                await cache.put(db, r, reply)
+            for i in pending[key][1]:
+                yield i, reply
+        await cache.commit(db)
+    finally:
+        # Client went away mid-stream: don't leave orphaned LLM calls running
+        for task in tasks:
+            task.cancel()
+
+async def run_trait_synergy(requests: List[TraitSynergyRequest], db: Optional[AsyncSession] = None,
+                            cache: TraitSynergyCache = trait_synergy_cache,
+                            max_concurrency: Optional[int] = None, deadline: Optional[float] = None,
+                            mode: SynergyMode = "per_monster") -> List[dict]:
+    """Raw LLM results ({"synergy_moves": [...names], "recommendation": [...]}) in request order."""
+    results: List[Optional[dict]] = [None] * len(requests)
+    with span("llm"):
+        async for i, result in iter_trait_synergy(requests, db, cache, max_concurrency, deadline, mode):
+            results[i] = result
+    return results
@@ -0,0 +1,92 @@
+import numpy as np
+from typing import Iterable, Optional, Sequence, Tuple
+
+# Types that never count as something the team needs to hit (e.g. the Leader pseudo-type)
+IGNORED_TYPE_NAMES = {"Leader"}
+
+def _bits(flags) -> int:
+    return sum(1 << i for i, flag in enumerate(flags) if flag)
+
+# === Dense type-effectiveness chart ===
+# Matrices are indexed [attacker, defender] in type-id order. A defender's
+# vulnerable_to/resistant_to sets are simply the columns of these matrices.
+class TypeChart:
+    def __init__(self, types: Iterable, ignored_type_names=IGNORED_TYPE_NAMES):
+        types = sorted(types, key=lambda t: t.id)
+        n = len(types)
+        self.type_ids = np.array([t.id for t in types], dtype=np.int64)
+        self.index = {t.id: i for i, t in enumerate(types)}
+        self.no_type_index = n  # stands in for a missing sub type
+
+        super_effective = np.zeros((n, n), dtype=bool)
+        resisted = np.zeros((n, n), dtype=bool)
+        for t in types:
+            attacker = self.index[t.id]
+            for target_id in t.effective_against_ids:
+                super_effective[attacker, self.index[target_id]] = True
+            for target_id in t.weak_against_ids:
+                resisted[attacker, self.index[target_id]] = True
+        self.super_effective = super_effective
+        self.resisted = resisted
+        # +1 super effective, -1 resisted, 0 neutral
+        self.effectiveness = super_effective.astype(np.int8) - resisted.astype(np.int8)
+
+        # Attacking types that count toward offensive coverage
+        self.coverable = np.array([t.name not in ignored_type_names for t in types], dtype=bool)
+
+        # Defensive profiles for every (main, sub) pair, shape (main, sub + "none", attacker).
+        # Per-monster weakness logic: weak if both types are weak, or one is weak and
+        # the other is neither weak nor resistant. Resistance mirrors it.
+        no_type = np.zeros((1, n), dtype=bool)
+        weak_rows = np.vstack([super_effective.T, no_type])
+        resist_rows = np.vstack([resisted.T, no_type])
+        wm, ws = weak_rows[:n, None, :], weak_rows[None, :, :]
+        rm, rs = resist_rows[:n, None, :], resist_rows[None, :, :]
+        self.weak_profiles = (wm & ws) | (wm & ~rs & ~ws) | (ws & ~rm & ~wm)
+        self.resist_profiles = (rm & rs) | (rm & ~ws & ~rs) | (rs & ~wm & ~rm)
+
+        for arr in (self.type_ids, self.super_effective, self.resisted, self.effectiveness,
+                    self.coverable, self.weak_profiles, self.resist_profiles):
+            arr.flags.writeable = False
+
+    def _pair_index(self, main_type_id: int, sub_type_id: Optional[int]) -> Tuple[int, int]:
+        sub = self.index[sub_type_id] if sub_type_id else self.no_type_index
+        return self.index[main_type_id], sub
+
+    def defensive_profile(self, main_type_id: int, sub_type_id: Optional[int]):
+        """Boolean (weak, resist) vectors over attacking types for a monster's typing."""
+        main, sub = self._pair_index(main_type_id, sub_type_id)
+        return self.weak_profiles[main, sub], self.resist_profiles[main, sub]
+
+    def offensive_vector(self, move_type_ids: Iterable[int]):
+        """Boolean vector of defending types hit super-effectively by any of the given move types."""
+        rows = [self.index[tid] for tid in set(move_type_ids) if tid]
+        if not rows:
+            return np.zeros(len(self.type_ids), dtype=bool)
+        return self.super_effective[rows].any(axis=0)
+
+    # Bitset forms (bit i = row i of the chart) for the search/optimizer inner loops
+    def weak_mask(self, main_type_id: int, sub_type_id: Optional[int]) -> int:
+        weak, _ = self.defensive_profile(main_type_id, sub_type_id)
+        return _bits(weak)
+
+    def offensive_mask(self, move_type_ids: Iterable[int]) -> int:
+        """Coverable defending types hit super-effectively by any of the given move types."""
+        return _bits(self.offensive_vector(move_type_ids) & self.coverable)
+
+    def team_coverage(self, defender_types: Sequence[Tuple[int, Optional[int]]], move_type_ids: Iterable[int]):
+        """Team offense/defense report from (main_type_id, sub_type_id) pairs and move types.
+
+        Team weaknesses are attacking types that 3 or more monsters are weak to.
+        """
+        offense = self.offensive_vector(move_type_ids)
+        if defender_types:
+            mains, subs = zip(*(self._pair_index(main, sub) for main, sub in defender_types))
+            weak_counts = self.weak_profiles[list(mains), list(subs)].sum(axis=0)
+        else:
+            weak_counts = np.zeros(len(self.type_ids), dtype=np.int64)
+        return {
+            "effective_against_types": self.type_ids[offense].tolist(),
+            "weak_against_types": self.type_ids[self.coverable & ~offense].tolist(),
+            "team_weak_to": self.type_ids[weak_counts >= 3].tolist(),
+        }
@@ -187,6 +187,7 @@ export interface TraitSynergyFinding {
   trait: TraitOut;
   synergy_moves: ID[];
   recommendation: string[];
+  status?: "ok" | "error" | "timeout";
 }
 
 export interface MonsterAnalysisOut {
@@ -241,6 +242,7 @@ export interface TeamAnalysisOut {
   magic_item_eval: MagicItemEvaluation;
   recommendations: string[];
   recommendations_structured: RecItem[];
+  incomplete_synergies?: number[];
 }
 
 /* ---------- (optional) legacy shape kept for back-compat ---------- */